@@ -1,13 +1,24 @@
+import logging
+import time
 from logging.config import fileConfig
 
-from sqlalchemy import create_engine, pool
+from sqlalchemy import create_engine, pool, text
+from sqlalchemy.exc import DBAPIError
 from alembic import context
 
 from app.core.config import settings
+from app.infrastructure.db.online_migrations import is_lock_timeout
 from app.infrastructure.db.session import Base
 
 # مدل‌هایی که می‌خوای Alembic بشناسه
 from app.domain.models.product import Product  # مهم: Product با t
+from app.domain.models.ai_content import AIContent  # noqa: F401
+from app.domain.models.ai_content_stat import AIContentStat  # noqa: F401
+from app.domain.models.ai_content_stat_total import AIContentStatTotal  # noqa: F401
+from app.domain.models.ai_generation_metric import AIGenerationMetric  # noqa: F401
+from app.domain.models.ai_payload import AIPayload  # noqa: F401
+from app.domain.models.outbox_event import OutboxEvent  # noqa: F401
+from app.domain.models.product_embedding import ProductEmbedding  # noqa: F401
 
 # تنظیمات Alembic
 config = context.config
@@ -19,6 +30,20 @@ if config.config_file_name is not None:
 # این‌جا به Alembic می‌گیم متادیتای مدل‌ها رو از Base بگیر
 target_metadata = Base.metadata
 
+logger = logging.getLogger("alembic.env")
+
+
+def is_online_mode() -> bool:
+    """
+    Lock-safe runner for live databases: `alembic -x online=true upgrade head`.
+
+    Each migration runs in its own transaction with a short lock_timeout; a
+    migration that cannot get its locks is rolled back and retried, so DDL
+    never sits in the lock queue blocking application queries.
+    """
+    value = context.get_x_argument(as_dictionary=True).get("online", "")
+    return value.lower() in ("1", "true", "yes")
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
@@ -45,14 +70,39 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
     )
 
+    online = is_online_mode()
+
     with connectable.connect() as connection:
+        if online and connection.dialect.name == "postgresql":
+            connection.execute(text(f"SET lock_timeout = '{int(settings.MIGRATION_LOCK_TIMEOUT_MS)}ms'"))
+            connection.commit()
+
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            transaction_per_migration=online,
         )
 
-        with context.begin_transaction():
-            context.run_migrations()
+        if not online:
+            with context.begin_transaction():
+                context.run_migrations()
+            return
+
+        # Already applied migrations are committed; a retry resumes at the failed one
+        attempts = settings.MIGRATION_LOCK_RETRIES
+        for attempt in range(1, attempts + 1):
+            try:
+                with context.begin_transaction():
+                    context.run_migrations()
+                return
+            except DBAPIError as exc:
+                if not is_lock_timeout(exc) or attempt == attempts:
+                    raise
+                connection.rollback()
+                delay = min(settings.MIGRATION_LOCK_RETRY_DELAY_SECONDS * (2 ** (attempt - 1)), 60.0)
+                logger.warning("Migration could not get its locks (attempt %d/%d), retrying in %.1fs",
+                               attempt, attempts, delay)
+                time.sleep(delay)
 
 
 if context.is_offline_mode():
@@ -0,0 +1,50 @@
+"""add ai_content_stat_totals
+
+Revision ID: 0b8e6f4c2d19
+Revises: f7c3d9a1e4b2
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b8e6f4c2d19'
+down_revision: Union[str, Sequence[str], None] = 'f7c3d9a1e4b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: create and backfill the catalog-wide ai_content_stat_totals rollup."""
+    op.create_table(
+        "ai_content_stat_totals",
+        sa.Column("channel", sa.String(length=50), nullable=False),
+        sa.Column("content_type", sa.String(length=50), nullable=False),
+        sa.Column("last_model_used", sa.String(length=100), server_default="", nullable=False),
+        sa.Column("generated_count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("approved_count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("channel", "content_type", "last_model_used"),
+    )
+
+    # Block counter writers until the backfill commits, so none is missed or counted twice
+    op.execute("LOCK TABLE ai_content_stats IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        """
+        INSERT INTO ai_content_stat_totals (
+            channel, content_type, last_model_used, generated_count, approved_count
+        )
+        SELECT channel, content_type, last_model_used, sum(generated_count), sum(approved_count)
+        FROM ai_content_stats
+        GROUP BY channel, content_type, last_model_used
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop ai_content_stat_totals."""
+    op.drop_table("ai_content_stat_totals")
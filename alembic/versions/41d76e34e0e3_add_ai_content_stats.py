@@ -0,0 +1,56 @@
+"""add ai_content_stats
+
+Revision ID: 41d76e34e0e3
+Revises: a69f872d4481
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '41d76e34e0e3'
+down_revision: Union[str, Sequence[str], None] = 'a69f872d4481'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: create and backfill ai_content_stats counters."""
+    op.create_table(
+        "ai_content_stats",
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("channel", sa.String(length=50), nullable=False),
+        sa.Column("content_type", sa.String(length=50), nullable=False),
+        sa.Column("last_model_used", sa.String(length=100), server_default="", nullable=False),
+        sa.Column("generated_count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("approved_count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("product_id", "channel", "content_type", "last_model_used"),
+    )
+
+    op.execute(
+        """
+        INSERT INTO ai_content_stats (
+            product_id, channel, content_type, last_model_used,
+            generated_count, approved_count
+        )
+        SELECT
+            product_id, channel, content_type, COALESCE(last_model_used, ''),
+            count(*), count(*) FILTER (WHERE approved)
+        FROM (
+            SELECT product_id, channel, content_type, last_model_used, approved FROM ai_contents
+            UNION ALL
+            SELECT product_id, channel, content_type, last_model_used, approved FROM ai_contents_archive
+        ) AS all_contents
+        GROUP BY product_id, channel, content_type, COALESCE(last_model_used, '')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop ai_content_stats."""
+    op.drop_table("ai_content_stats")
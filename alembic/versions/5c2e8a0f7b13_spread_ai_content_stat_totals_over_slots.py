@@ -0,0 +1,60 @@
+"""spread ai_content_stat_totals over slots
+
+Revision ID: 5c2e8a0f7b13
+Revises: 9d4b7e2a6c51
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.infrastructure.db.online_migrations import run_with_lock_retries
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e8a0f7b13'
+down_revision: Union[str, Sequence[str], None] = '9d4b7e2a6c51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _add_slot() -> None:
+    # Existing rows become slot 0; the sums over slots are unchanged
+    op.add_column("ai_content_stat_totals", sa.Column("slot", sa.SmallInteger(), server_default="0", nullable=False))
+    op.drop_constraint("ai_content_stat_totals_pkey", "ai_content_stat_totals", type_="primary")
+    op.create_primary_key(
+        "ai_content_stat_totals_pkey",
+        "ai_content_stat_totals",
+        ["channel", "content_type", "last_model_used", "slot"],
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema: add ai_content_stat_totals.slot to the primary key."""
+    run_with_lock_retries(_add_slot)
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop ai_content_stat_totals.slot and rebuild one row per key."""
+    # Block counter writers until the rollup is rebuilt, so none is missed or counted twice
+    op.execute("LOCK TABLE ai_content_stats, ai_content_stat_totals IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("DELETE FROM ai_content_stat_totals")
+    op.drop_constraint("ai_content_stat_totals_pkey", "ai_content_stat_totals", type_="primary")
+    op.drop_column("ai_content_stat_totals", "slot")
+    op.create_primary_key(
+        "ai_content_stat_totals_pkey",
+        "ai_content_stat_totals",
+        ["channel", "content_type", "last_model_used"],
+    )
+    op.execute(
+        """
+        INSERT INTO ai_content_stat_totals (
+            channel, content_type, last_model_used, generated_count, approved_count
+        )
+        SELECT channel, content_type, last_model_used, sum(generated_count), sum(approved_count)
+        FROM ai_content_stats
+        GROUP BY channel, content_type, last_model_used
+        """
+    )
@@ -0,0 +1,34 @@
+"""add product versions
+
+Revision ID: 5deb3e24cf41
+Revises: 64ff93ca5bd8
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5deb3e24cf41'
+down_revision: Union[str, Sequence[str], None] = '64ff93ca5bd8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: add row version and AI content history version to products."""
+    # Constant defaults: metadata-only change, no table rewrite
+    op.add_column("products", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+    op.add_column(
+        "products",
+        sa.Column("ai_contents_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop product version columns."""
+    op.drop_column("products", "ai_contents_version")
+    op.drop_column("products", "version")
@@ -0,0 +1,178 @@
+"""partition ai_contents by month
+
+Revision ID: 8a8efb5b19c4
+Revises: 649ce434e5bf
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a8efb5b19c4'
+down_revision: Union[str, Sequence[str], None] = '649ce434e5bf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Creates the monthly partition for every month in [start_month, end_month).
+# Rows that already landed in the DEFAULT partition for that month are moved
+# into the new partition before it is attached, so creation never fails.
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_ai_contents_partitions(start_month date, end_month date)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start date := date_trunc('month', start_month)::date;
+    month_end date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    WHILE month_start < end_month LOOP
+        month_end := (month_start + interval '1 month')::date;
+        partition_name := format('ai_contents_%s', to_char(month_start, 'YYYY_MM'));
+
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE ai_contents INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                partition_name
+            );
+            -- Keep writers out of the default partition until ATTACH: a row for
+            -- this month landing there meanwhile would fail ATTACH's check
+            LOCK TABLE ai_contents_default IN SHARE ROW EXCLUSIVE MODE;
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM ai_contents_default '
+                'WHERE created_at >= %L AND created_at < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                month_start, month_end, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE ai_contents ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month_start, month_end
+            );
+            created := created + 1;
+        END IF;
+
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+"""
+
+AI_CONTENT_COLUMNS = (
+    "id, product_id, channel, content_type, payload, approved, last_model_used, created_at"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema: convert ai_contents to a table range-partitioned by created_at."""
+    op.execute("ALTER TABLE ai_contents RENAME TO ai_contents_legacy")
+    op.execute("ALTER TABLE ai_contents_legacy RENAME CONSTRAINT ai_contents_pkey TO ai_contents_legacy_pkey")
+    op.execute("ALTER INDEX IF EXISTS ix_ai_contents_product_channel_type RENAME TO ix_ai_contents_legacy_product_channel_type")
+    op.execute("ALTER INDEX IF EXISTS ix_ai_contents_id RENAME TO ix_ai_contents_legacy_id")
+
+    op.execute(
+        """
+        CREATE TABLE ai_contents (
+            id INTEGER NOT NULL DEFAULT nextval('ai_contents_id_seq'),
+            product_id INTEGER NOT NULL REFERENCES products (id) ON DELETE CASCADE,
+            channel VARCHAR(50) NOT NULL,
+            content_type VARCHAR(50) NOT NULL,
+            payload JSONB NOT NULL,
+            approved BOOLEAN NOT NULL DEFAULT FALSE,
+            last_model_used VARCHAR(100),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT ai_contents_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE ai_contents_id_seq OWNED BY ai_contents.id")
+    op.create_index("ix_ai_contents_id", "ai_contents", ["id"])
+    op.create_index(
+        "ix_ai_contents_product_channel_type",
+        "ai_contents",
+        ["product_id", "channel", "content_type", "created_at"],
+    )
+
+    # Safety net for rows outside any monthly partition
+    op.execute("CREATE TABLE ai_contents_default PARTITION OF ai_contents DEFAULT")
+
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+    op.execute(
+        """
+        SELECT ensure_ai_contents_partitions(
+            COALESCE((SELECT min(created_at) FROM ai_contents_legacy), now())::date,
+            (date_trunc('month', now()) + interval '4 months')::date
+        )
+        """
+    )
+
+    op.execute(
+        f"INSERT INTO ai_contents ({AI_CONTENT_COLUMNS}) "
+        f"SELECT {AI_CONTENT_COLUMNS} FROM ai_contents_legacy"
+    )
+    op.execute("DROP TABLE ai_contents_legacy")
+
+    # Cold storage for generations removed by the retention job
+    op.create_table(
+        "ai_contents_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("channel", sa.String(length=50), nullable=False),
+        sa.Column("content_type", sa.String(length=50), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("approved", sa.Boolean(), nullable=False),
+        sa.Column("last_model_used", sa.String(length=100), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+    )
+    op.create_index("ix_ai_contents_archive_product_id", "ai_contents_archive", ["product_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema: back to a plain ai_contents table."""
+    op.drop_index("ix_ai_contents_archive_product_id", table_name="ai_contents_archive")
+    op.drop_table("ai_contents_archive")
+
+    op.execute("ALTER TABLE ai_contents RENAME TO ai_contents_partitioned")
+    op.execute("ALTER TABLE ai_contents_partitioned RENAME CONSTRAINT ai_contents_pkey TO ai_contents_partitioned_pkey")
+    op.execute("ALTER INDEX ix_ai_contents_product_channel_type RENAME TO ix_ai_contents_partitioned_product_channel_type")
+    op.execute("ALTER INDEX ix_ai_contents_id RENAME TO ix_ai_contents_partitioned_id")
+    op.execute("ALTER SEQUENCE ai_contents_id_seq OWNED BY NONE")
+
+    op.execute(
+        """
+        CREATE TABLE ai_contents (
+            id INTEGER NOT NULL DEFAULT nextval('ai_contents_id_seq'),
+            product_id INTEGER NOT NULL REFERENCES products (id) ON DELETE CASCADE,
+            channel VARCHAR(50) NOT NULL,
+            content_type VARCHAR(50) NOT NULL,
+            payload JSONB NOT NULL,
+            approved BOOLEAN NOT NULL DEFAULT FALSE,
+            last_model_used VARCHAR(100),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT ai_contents_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        f"INSERT INTO ai_contents ({AI_CONTENT_COLUMNS}) "
+        f"SELECT {AI_CONTENT_COLUMNS} FROM ai_contents_partitioned"
+    )
+    op.execute("ALTER SEQUENCE ai_contents_id_seq OWNED BY ai_contents.id")
+    op.execute("DROP TABLE ai_contents_partitioned CASCADE")
+    op.execute("DROP FUNCTION IF EXISTS ensure_ai_contents_partitions(date, date)")
+
+    op.create_index("ix_ai_contents_id", "ai_contents", ["id"])
+    op.create_index(
+        "ix_ai_contents_product_channel_type",
+        "ai_contents",
+        ["product_id", "channel", "content_type"],
+    )
@@ -0,0 +1,45 @@
+"""outbox per-sink delivery and dead letters
+
+Revision ID: 9d4b7e2a6c51
+Revises: 0b8e6f4c2d19
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.db.online_migrations import run_with_lock_retries
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b7e2a6c51'
+down_revision: Union[str, Sequence[str], None] = '0b8e6f4c2d19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: track delivery per sink and dead-lettered events in outbox_events."""
+    run_with_lock_retries(
+        lambda: op.add_column(
+            "outbox_events",
+            sa.Column(
+                "delivered_sinks",
+                postgresql.JSONB(astext_type=sa.Text()),
+                server_default=sa.text("'[]'"),
+                nullable=False,
+            ),
+        )
+    )
+    run_with_lock_retries(
+        lambda: op.add_column("outbox_events", sa.Column("dead_lettered_at", sa.DateTime(timezone=True), nullable=True))
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop per-sink delivery tracking and dead letters."""
+    run_with_lock_retries(lambda: op.drop_column("outbox_events", "dead_lettered_at"))
+    run_with_lock_retries(lambda: op.drop_column("outbox_events", "delivered_sinks"))
@@ -0,0 +1,38 @@
+"""add ai_contents review queue index
+
+Revision ID: a69f872d4481
+Revises: e730be2ee8b5
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.infrastructure.db.online_migrations import (
+    create_partitioned_index_concurrently,
+    run_with_lock_retries,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a69f872d4481'
+down_revision: Union[str, Sequence[str], None] = 'e730be2ee8b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: partial index over unapproved ai_contents (review queue)."""
+    # Built per partition CONCURRENTLY, then attached: no write lock on ai_contents
+    create_partitioned_index_concurrently(
+        "ix_ai_contents_review_queue",
+        "ai_contents",
+        ["created_at", "channel", "content_type"],
+        where="approved = false",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop the review queue index."""
+    run_with_lock_retries(lambda: op.drop_index("ix_ai_contents_review_queue", table_name="ai_contents"))
@@ -0,0 +1,39 @@
+"""add product_embeddings
+
+Revision ID: b3e8c51d7a92
+Revises: d2f9bf9d6c16
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8c51d7a92'
+down_revision: Union[str, Sequence[str], None] = 'd2f9bf9d6c16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: create product_embeddings (backfilled by app.jobs.build_product_embeddings)."""
+    op.create_table(
+        "product_embeddings",
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("dims", sa.Integer(), nullable=False),
+        sa.Column("vector", sa.LargeBinary(), nullable=False),
+        sa.Column("text_hash", sa.String(length=64), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("product_id"),
+    )
+    op.create_index(op.f("ix_product_embeddings_updated_at"), "product_embeddings", ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop product_embeddings."""
+    op.drop_index(op.f("ix_product_embeddings_updated_at"), table_name="product_embeddings")
+    op.drop_table("product_embeddings")
@@ -0,0 +1,47 @@
+"""add ai_generation_metrics
+
+Revision ID: c41f0d2e8b67
+Revises: b3e8c51d7a92
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f0d2e8b67'
+down_revision: Union[str, Sequence[str], None] = 'b3e8c51d7a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: create ai_generation_metrics (per-generation tokens / latency)."""
+    op.create_table(
+        "ai_generation_metrics",
+        sa.Column("ai_content_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("channel", sa.String(length=50), nullable=False),
+        sa.Column("content_type", sa.String(length=50), nullable=False),
+        sa.Column("model", sa.String(length=100), server_default="", nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("completion_tokens", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("wall_time_ms", sa.Float(), nullable=True),
+        sa.Column("provider_latency_ms", sa.Float(), nullable=True),
+        sa.Column("retries", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("cached", sa.Boolean(), server_default="false", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("ai_content_id"),
+    )
+    op.create_index(op.f("ix_ai_generation_metrics_product_id"), "ai_generation_metrics", ["product_id"], unique=False)
+    op.create_index(op.f("ix_ai_generation_metrics_created_at"), "ai_generation_metrics", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop ai_generation_metrics."""
+    op.drop_index(op.f("ix_ai_generation_metrics_created_at"), table_name="ai_generation_metrics")
+    op.drop_index(op.f("ix_ai_generation_metrics_product_id"), table_name="ai_generation_metrics")
+    op.drop_table("ai_generation_metrics")
@@ -0,0 +1,46 @@
+"""soft delete products
+
+Revision ID: d2f9bf9d6c16
+Revises: 5deb3e24cf41
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.infrastructure.db.online_migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+    run_with_lock_retries,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f9bf9d6c16'
+down_revision: Union[str, Sequence[str], None] = '5deb3e24cf41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: add products.deleted_at and partial indexes on live products."""
+    run_with_lock_retries(
+        lambda: op.add_column("products", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+    )
+
+    # SKU uniqueness only among live products (new index first, then drop the constraint)
+    create_index_concurrently("uq_products_sku_live", "products", ["sku"], unique=True, where="deleted_at IS NULL")
+    run_with_lock_retries(lambda: op.drop_constraint("products_sku_key", "products", type_="unique"))
+
+    create_index_concurrently("ix_products_live_created_at", "products", ["created_at"], where="deleted_at IS NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop soft-deleted products, then the column and indexes."""
+    op.execute("DELETE FROM products WHERE deleted_at IS NOT NULL")
+    drop_index_concurrently("ix_products_live_created_at", "products")
+    run_with_lock_retries(lambda: op.create_unique_constraint("products_sku_key", "products", ["sku"]))
+    drop_index_concurrently("uq_products_sku_live", "products")
+    run_with_lock_retries(lambda: op.drop_column("products", "deleted_at"))
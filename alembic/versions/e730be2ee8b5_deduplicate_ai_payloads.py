@@ -0,0 +1,128 @@
+"""deduplicate ai payloads
+
+Revision ID: e730be2ee8b5
+Revises: 8a8efb5b19c4
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+import hashlib
+import json
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.db.online_migrations import process_in_batches
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e730be2ee8b5'
+down_revision: Union[str, Sequence[str], None] = '8a8efb5b19c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def _payload_hash(payload: dict) -> str:
+    # Must match ai_payload_repository.payload_hash (frozen copy for this migration)
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _move_payloads(conn, table: str, rows) -> None:
+    """Store the payloads of `rows` in ai_payloads and point the rows at them (idempotent)."""
+    hashed = [(row.id, row.created_at, _payload_hash(row.payload), row.payload) for row in rows]
+    payloads = {h: p for _, _, h, p in hashed}
+    conn.execute(
+        sa.text(
+            "INSERT INTO ai_payloads (hash, payload) VALUES (:hash, CAST(:payload AS JSONB)) "
+            "ON CONFLICT (hash) DO NOTHING"
+        ),
+        [{"hash": h, "payload": json.dumps(p)} for h, p in payloads.items()],
+    )
+    conn.execute(
+        sa.text(
+            f"UPDATE {table} SET payload_hash = :hash "
+            "WHERE id = :id AND created_at = :created_at"
+        ),
+        [{"hash": h, "id": i, "created_at": c} for i, c, h, _ in hashed],
+    )
+
+
+def _select_pending(table: str) -> sa.TextClause:
+    return sa.text(
+        f"SELECT id, created_at, payload FROM {table} "
+        "WHERE id > :last_id AND payload_hash IS NULL ORDER BY id LIMIT :batch_size"
+    )
+
+
+def _backfill(table: str) -> None:
+    """
+    Move `payload` of every row in `table` into ai_payloads.
+
+    Throttled, resumable batches (keyset on id) run outside the migration
+    transaction; rows written meanwhile are moved afterwards with writers blocked.
+    """
+    def process(conn, last_id: int, batch_size: int) -> List[int]:
+        rows = conn.execute(_select_pending(table), {"last_id": last_id, "batch_size": batch_size}).all()
+        if rows:
+            _move_payloads(conn, table, rows)
+        return [row.id for row in rows]
+
+    process_in_batches(f"{revision}_{table}", table, process, batch_size=BATCH_SIZE)
+
+    # Rows written while the batches ran: block writers (until the column is
+    # NOT NULL) and move the rest in the migration transaction
+    op.execute(f"LOCK TABLE {table} IN SHARE MODE")
+    conn = op.get_bind()
+    while True:
+        rows = conn.execute(_select_pending(table), {"last_id": 0, "batch_size": BATCH_SIZE}).all()
+        if not rows:
+            return
+        _move_payloads(conn, table, rows)
+
+
+def upgrade() -> None:
+    """Upgrade schema: store payloads once in ai_payloads, referenced by hash."""
+    op.create_table(
+        "ai_payloads",
+        sa.Column("hash", sa.String(length=64), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("hash"),
+    )
+
+    for table in ("ai_contents", "ai_contents_archive"):
+        op.add_column(table, sa.Column("payload_hash", sa.String(length=64), nullable=True))
+        _backfill(table)
+        op.alter_column(table, "payload_hash", nullable=False)
+        op.create_foreign_key(
+            f"fk_{table}_payload_hash",
+            table,
+            "ai_payloads",
+            ["payload_hash"],
+            ["hash"],
+        )
+        op.create_index(f"ix_{table}_payload_hash", table, ["payload_hash"])
+        op.drop_column(table, "payload")
+
+
+def downgrade() -> None:
+    """Downgrade schema: inline payloads back into ai_contents."""
+    for table in ("ai_contents", "ai_contents_archive"):
+        op.add_column(
+            table,
+            sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        )
+        op.execute(
+            f"UPDATE {table} AS t SET payload = p.payload "
+            "FROM ai_payloads AS p WHERE p.hash = t.payload_hash"
+        )
+        op.alter_column(table, "payload", nullable=False)
+        op.drop_index(f"ix_{table}_payload_hash", table_name=table)
+        op.drop_constraint(f"fk_{table}_payload_hash", table, type_="foreignkey")
+        op.drop_column(table, "payload_hash")
+
+    op.drop_table("ai_payloads")
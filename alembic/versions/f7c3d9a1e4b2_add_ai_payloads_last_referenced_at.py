@@ -0,0 +1,43 @@
+"""add ai_payloads.last_referenced_at
+
+Revision ID: f7c3d9a1e4b2
+Revises: c41f0d2e8b67
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.infrastructure.db.online_migrations import run_with_lock_retries
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c3d9a1e4b2'
+down_revision: Union[str, Sequence[str], None] = 'c41f0d2e8b67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: add ai_payloads.last_referenced_at (payload purge grace period)."""
+    # now() is stable, so existing rows get it without a table rewrite; every
+    # payload starts a fresh grace period
+    run_with_lock_retries(
+        lambda: op.add_column(
+            "ai_payloads",
+            sa.Column(
+                "last_referenced_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+    )
+    run_with_lock_retries(lambda: op.alter_column("ai_payloads", "last_referenced_at", server_default=None))
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop ai_payloads.last_referenced_at."""
+    run_with_lock_retries(lambda: op.drop_column("ai_payloads", "last_referenced_at"))
@@ -0,0 +1,80 @@
+"""
+HTTP caching helpers (ETags and conditional GETs).
+
+Responsibilities:
+- Build strong ETags from row versions.
+- Evaluate If-None-Match and produce 304 responses.
+- Turn If-Match into the product version a write expects (optimistic locking).
+- Attach ETag / Cache-Control headers to full responses.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+
+def product_etag(product_id: int, version: int) -> str:
+    """Strong ETag of a product representation."""
+    return f'"p{product_id}-v{version}"'
+
+
+def ai_contents_etag(
+    product_id: int,
+    ai_contents_version: int,
+    channel: Optional[str] = None,
+    content_type: Optional[str] = None,
+) -> str:
+    """Strong ETag of a product's AI content list (filters are part of the representation)."""
+    filters = hashlib.sha1(f"{channel or ''}|{content_type or ''}".encode("utf-8")).hexdigest()[:8]
+    return f'"pa{product_id}-v{ai_contents_version}-{filters}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    True if the request's If-None-Match matches `etag`.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def if_match_version(request: Request, product_id: int) -> Optional[int]:
+    """
+    Product version required by the request's If-Match, or None without a precondition.
+
+    Uses strong comparison (RFC 9110): weak or foreign ETags match no version,
+    so they yield 0 (versions start at 1) and the write fails with 412.
+    """
+    header = request.headers.get("if-match")
+    if not header or header.strip() == "*":
+        return None
+
+    prefix = f'"p{product_id}-v'
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith(prefix) and tag.endswith('"') and tag[len(prefix):-1].isdigit():
+            return int(tag[len(prefix):-1])
+    return 0
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    """Attach ETag and Cache-Control to a response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = settings.HTTP_CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the validators."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag)
+    return response
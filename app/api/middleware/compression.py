@@ -0,0 +1,163 @@
+"""
+Response compression middleware (pure ASGI).
+
+Responsibilities:
+- Negotiate gzip / brotli / zstd from Accept-Encoding.
+- Leave small, streaming, already-encoded and non-text responses untouched.
+- Compress large bodies in a worker thread so the event loop keeps serving.
+- Cache compressed bodies of responses carrying a strong ETag: the same
+  ETag means the same bytes, so hot immutable resources are compressed once.
+"""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import compression
+from app.core.config import settings
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/problem+json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+CacheKey = Tuple[str, str, str]
+
+
+class CompressedBodyCache:
+    """LRU cache of compressed bodies, bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        body = self._items.get(key)
+        if body is not None:
+            self._items.move_to_end(key)
+        return body
+
+    def put(self, key: CacheKey, body: bytes) -> None:
+        if len(body) > self.max_bytes or key in self._items:
+            return
+        self._items[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.size -= len(evicted)
+
+
+def _is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+class CompressionMiddleware:
+    """Compress HTTP responses with the best encoding the client accepts."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        offload_minimum_size: Optional[int] = None,
+        cache_max_bytes: Optional[int] = None,
+    ):
+        self.app = app
+        self.encodings = compression.available_encodings()
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.offload_minimum_size = (
+            settings.COMPRESSION_OFFLOAD_MIN_SIZE if offload_minimum_size is None else offload_minimum_size
+        )
+        self.cache = CompressedBodyCache(
+            settings.COMPRESSION_CACHE_MAX_BYTES if cache_max_bytes is None else cache_max_bytes
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = compression.negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        responder = _CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+    async def compress(self, path: str, etag: Optional[str], body: bytes, encoding: str) -> bytes:
+        """Compress `body`, reusing the cached result for strong ETags."""
+        key = None
+        if etag and not etag.startswith("W/"):
+            key = (path, etag, encoding)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if len(body) >= self.offload_minimum_size:
+            compressed = await anyio.to_thread.run_sync(compression.compress, body, encoding)
+        else:
+            compressed = compression.compress(body, encoding)
+
+        if key is not None:
+            self.cache.put(key, compressed)
+        return compressed
+
+
+class _CompressionResponder:
+    """Per-request `send` wrapper: buffers a single-part body, then compresses it."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: Optional[str]):
+        self.middleware = middleware
+        self.path = scope["path"]
+        self.downstream = send
+        self.encoding = encoding
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.chunks = []
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            status = message["status"]
+            headers = Headers(raw=message["headers"])
+            if status < 200 or status in (204, 304) or not _is_compressible(headers):
+                self.passthrough = True
+                await self.downstream(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.downstream(message)
+            return
+
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+
+        if message.get("more_body", False) and not self.chunks:
+            # Streaming response: forward as-is rather than buffering it whole.
+            self.passthrough = True
+            await self.downstream(self.start_message)
+            await self.downstream(message)
+            return
+
+        self.chunks.append(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+
+        body = b"".join(self.chunks)
+        if self.encoding is not None and len(body) >= self.middleware.minimum_size:
+            etag = headers.get("etag")
+            body = await self.middleware.compress(self.path, etag, body, self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(body))
+            if etag and not etag.startswith("W/"):
+                # The encoded bytes differ from the identity representation.
+                headers["ETag"] = f"W/{etag}"
+
+        await self.downstream(self.start_message)
+        await self.downstream({"type": "http.response.body", "body": body, "more_body": False})
@@ -0,0 +1,128 @@
+"""
+AI Contents API Router.
+
+Responsibilities:
+- Define HTTP endpoints for AI content review workflows across products.
+- Call AIContentService for all business logic.
+- Return clean Pydantic schemas to API clients.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.session import get_db
+from app.domain.schemas.ai_content import (
+    AIContentApprovalRequest,
+    AIContentApprovalResult,
+    AIContentRead,
+    AIContentStatsRead,
+    GenerationMetricsSummaryRead,
+)
+from app.domain.services.ai_content_service import AIContentService
+
+
+router = APIRouter(
+    prefix="/ai-contents",
+    tags=["ai-contents"],
+)
+
+
+@router.post(
+    "/approval",
+    response_model=AIContentApprovalResult,
+    summary="Approve or reject many AI contents at once",
+)
+def set_ai_contents_approval(
+    payload: AIContentApprovalRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Approve (or reject with `approved: false`) AI contents selected by:
+    - ids: explicit list of AI content IDs, or
+    - filters: product_id / channel / content_type / last_model_used.
+
+    Only rows whose flag actually changes are returned.
+    """
+    return AIContentService.set_approval(db=db, data=payload)
+
+
+@router.get(
+    "/review-queue",
+    response_model=List[AIContentRead],
+    summary="List unapproved AI contents, newest first",
+)
+def get_review_queue(
+    channel: Optional[str] = None,
+    content_type: Optional[str] = None,
+    before: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """
+    Return the review queue.
+
+    Paginate by passing the `created_at` and `id` of the last item as
+    `before` and `before_id`.
+    """
+    return AIContentService.get_review_queue(
+        db=db,
+        channel=channel,
+        content_type=content_type,
+        before=before,
+        before_id=before_id,
+        limit=limit,
+    )
+
+
+@router.get(
+    "/stats",
+    response_model=List[AIContentStatsRead],
+    summary="Generation and approval counts per channel, content type and model",
+)
+def get_ai_content_stats(
+    channel: Optional[str] = None,
+    content_type: Optional[str] = None,
+    last_model_used: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Return counters across all products (read from the ai_content_stats summary table).
+    """
+    return AIContentService.get_stats(
+        db=db,
+        channel=channel,
+        content_type=content_type,
+        last_model_used=last_model_used,
+    )
+
+
+@router.get(
+    "/generation-metrics",
+    response_model=List[GenerationMetricsSummaryRead],
+    summary="AI generation cost and p50 / p95 latency per model and channel",
+)
+def get_generation_metrics(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    product_id: Optional[int] = None,
+    model: Optional[str] = None,
+    channel: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Summarize generations created in [since, until) (default: the last 24 hours).
+
+    Cost uses AI_MODEL_PRICES; `cached` counts contents served without a model call.
+    """
+    return AIContentService.get_generation_metrics(
+        db=db,
+        since=since,
+        until=until,
+        product_id=product_id,
+        model=model,
+        channel=channel,
+    )
@@ -10,13 +10,14 @@ Responsibilities now (with Service Layer):
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 
+from app.api import http_cache
 from app.infrastructure.db.session import get_db
 from app.domain.schemas.product import ProductRead, ProductCreate, ProductUpdate
 
-from app.domain.schemas.ai_content import AIContentRead
+from app.domain.schemas.ai_content import AIContentRead, AIContentStatsRead, AIGenerationRequest
 from app.domain.services.product_service import ProductService
 
 
@@ -39,16 +40,32 @@ def list_products(
     return ProductService.list_products(db=db, skip=skip, limit=limit)
 
 
-@router.get("/{product_id}", response_model=ProductRead)
+@router.get(
+    "/{product_id}",
+    response_model=ProductRead,
+    responses={304: {"description": "Not modified (If-None-Match matched the ETag)."}},
+)
 def get_product_by_id(
     product_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     """
     Return a single product by ID.
     Raises 404 if product does not exist.
+
+    Sends a strong ETag; a matching If-None-Match returns 304 without loading the product.
     """
-    return ProductService.get_product(db=db, product_id=product_id)
+    versions = ProductService.get_product_versions(db=db, product_id=product_id)
+    etag = http_cache.product_etag(product_id, versions.version)
+    if http_cache.etag_matches(request, etag):
+        return http_cache.not_modified(etag)
+
+    product = ProductService.get_product(db=db, product_id=product_id)
+    # Tag the body with the version actually loaded
+    http_cache.set_cache_headers(response, http_cache.product_etag(product.id, product.version))
+    return product
 
 
 @router.post("/", response_model=ProductRead, status_code=status.HTTP_201_CREATED)
@@ -66,29 +83,41 @@ def create_product_endpoint(
 def update_product_endpoint(
     product_id: int,
     payload: ProductUpdate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     """
     Update an existing product.
-    Raises 404 if product does not exist.
+    Raises 404 if product does not exist, 412 if If-Match does not match its
+    current ETag and 409 if a concurrent write won the race.
     """
-    return ProductService.update_product(
+    product = ProductService.update_product(
         db=db,
         product_id=product_id,
         data=payload,
+        expected_version=http_cache.if_match_version(request, product_id),
     )
+    response.headers["ETag"] = http_cache.product_etag(product.id, product.version)
+    return product
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_product_endpoint(
     product_id: int,
+    request: Request,
     db: Session = Depends(get_db),
 ):
     """
     Delete an existing product.
     Raises 404 if product does not exist.s          
+    Raises 412 / 409 like the update endpoint.
     """
-    ProductService.delete_product(db=db, product_id=product_id)
+    ProductService.delete_product(
+        db=db,
+        product_id=product_id,
+        expected_version=http_cache.if_match_version(request, product_id),
+    )
     return None
 
 
@@ -98,9 +127,12 @@ def delete_product_endpoint(
     "/{product_id}/ai-contents",
     response_model=List[AIContentRead],
     summary="List AI-generated contents for a product",
+    responses={304: {"description": "Not modified (If-None-Match matched the ETag)."}},
 )
 def list_ai_contents_for_product(
     product_id: int,
+    request: Request,
+    response: Response,
     channel: Optional[str] = None,
     content_type: Optional[str] = None,
     db: Session = Depends(get_db),
@@ -111,13 +143,38 @@ def list_ai_contents_for_product(
     Optional filters:
     - channel: 'ebay', 'shopify', 'instagram', ...
     - content_type: 'title', 'description', 'full_listing', 'caption', ...
+
+    Sends a strong ETag; a matching If-None-Match returns 304 without loading the history.
     """
+    # Versions are read before the rows: a concurrent write can only make the
+    # ETag older than the body (one extra 200 later), never newer.
+    versions = ProductService.get_product_versions(db=db, product_id=product_id)
+    etag = http_cache.ai_contents_etag(product_id, versions.ai_contents_version, channel, content_type)
+    if http_cache.etag_matches(request, etag):
+        return http_cache.not_modified(etag)
+
+    http_cache.set_cache_headers(response, etag)
     return ProductService.list_ai_contents_for_product(
         db=db,
         product_id=product_id,
         channel=channel,
         content_type=content_type,
     )
+@router.get(
+    "/{product_id}/ai-contents/stats",
+    response_model=List[AIContentStatsRead],
+    summary="Generation and approval counts for a product",
+)
+def get_ai_content_stats_for_product(
+    product_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Return AI content counters for the product, per channel, content type and model.
+    """
+    return ProductService.get_ai_content_stats_for_product(db=db, product_id=product_id)
+
+
 @router.post(
     "/{product_id}/generate/ebay",
     response_model=AIContentRead,
@@ -125,6 +182,7 @@ def list_ai_contents_for_product(
 )
 def generate_ebay_listing_for_product(
     product_id: int,
+    reuse_similar: bool = False,
     db: Session = Depends(get_db),
 ):
     """
@@ -132,7 +190,35 @@ def generate_ebay_listing_for_product(
 
     This will:
     - Call ProductService.generate_ebay_listing
+      (with reuse_similar=true, an approved listing of a similar product is adapted instead when available)
     - Store the result in `ai_contents`
     - Return the created AIContent row
     """
-    return ProductService.generate_ebay_listing(db=db, product_id=product_id)
+    return ProductService.generate_ebay_listing(db=db, product_id=product_id, reuse_similar=reuse_similar)
+
+
+@router.post(
+    "/{product_id}/generate",
+    response_model=List[AIContentRead],
+    status_code=status.HTTP_201_CREATED,
+    summary="Generate AI content for several channels of a product",
+)
+def generate_contents_for_product(
+    product_id: int,
+    payload: AIGenerationRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Generate AI content for a list of (channel, content_type) targets.
+
+    Provider calls run concurrently and all results are stored in one transaction.
+    With `reuse_similar`, targets a similar product already has approved content
+    for are served from that content without a provider call.
+    """
+    return ProductService.generate_contents(
+        db=db,
+        product_id=product_id,
+        targets=payload.targets,
+        model_name=payload.model_name,
+        reuse_similar=payload.reuse_similar,
+    )
@@ -0,0 +1,81 @@
+"""
+Content-coding helpers (gzip / brotli / zstd).
+
+Responsibilities:
+- Detect which codecs are installed (brotli and zstandard are optional).
+- Negotiate an encoding from an Accept-Encoding header.
+- Compress bytes.
+"""
+
+import gzip
+from typing import Dict, List, Optional
+
+try:  # optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+try:  # optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+from app.core.config import settings
+
+
+def available_encodings() -> List[str]:
+    """Configured encodings (COMPRESSION_ENCODINGS order) whose codec is installed."""
+    installed = {"gzip"}
+    if brotli is not None:
+        installed.add("br")
+    if zstandard is not None:
+        installed.add("zstd")
+
+    configured = [e.strip() for e in settings.COMPRESSION_ENCODINGS.split(",") if e.strip()]
+    return [encoding for encoding in configured if encoding in installed]
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """
+    Pick the best available encoding the client accepts.
+
+    Highest q wins; ties go to the server preference order of `available`.
+    """
+    accepted = parse_accept_encoding(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress `data` with the configured level for `encoding`."""
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+    if encoding == "br":
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Unsupported encoding: {encoding!r}")
+
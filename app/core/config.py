@@ -1,9 +1,106 @@
+from typing import Dict, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
     OPENAI_API_KEY: str
 
+    # AI provider ("openai" or "fake" for local tests / load tests)
+    AI_PROVIDER: str = "openai"
+    AI_DEFAULT_MODEL: str = "gpt-5.1"
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+
+    # Shared HTTP connection pool for AI providers
+    AI_HTTP_MAX_CONNECTIONS: int = 100
+    AI_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    AI_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+
+    # Per-call timeouts and retry policy
+    AI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    AI_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    AI_MAX_RETRIES: int = 3
+    AI_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    AI_RETRY_MAX_DELAY_SECONDS: float = 8.0
+
+    # Fake provider knobs (latency / error injection)
+    FAKE_AI_LATENCY_MS: float = 0.0
+    FAKE_AI_JITTER_MS: float = 0.0
+    FAKE_AI_ERROR_RATE: float = 0.0
+    FAKE_AI_TIMEOUT_RATE: float = 0.0
+    FAKE_AI_SEED: int = 0
+
+    # Batch-mode generation ("openai" or "local" stand-in)
+    AI_BATCH_PROVIDER: str = "openai"
+    AI_BATCH_MAX_REQUESTS: int = 50000
+    AI_BATCH_POLL_INTERVAL_SECONDS: float = 60.0
+    AI_BATCH_LOCAL_CONCURRENCY: int = 16
+
+    # Local product embeddings and similar-product content reuse
+    EMBEDDING_DIMS: int = 512
+    EMBEDDING_INDEX_REFRESH_SECONDS: float = 5.0
+    EMBEDDING_INDEX_SYNC_BATCH_SIZE: int = 10000
+    AI_REUSE_MIN_SIMILARITY: float = 0.6
+    AI_REUSE_CANDIDATES: int = 5
+
+    # AI generation metrics (cost / latency accounting)
+    # USD per 1M tokens, e.g. {"gpt-5.1": {"prompt": 1.25, "completion": 10.0}}
+    AI_MODEL_PRICES: Dict[str, Dict[str, float]] = {}
+    AI_METRICS_MAX_WINDOW_DAYS: int = 31
+    AI_METRICS_RETENTION_DAYS: int = 365
+
+    # Catalog-wide AI content counters (rollup rows per key, spread by product_id)
+    AI_CONTENT_STAT_TOTAL_SLOTS: int = 16
+
+    # ai_contents partitioning / retention
+    AI_CONTENT_PARTITION_MONTHS_AHEAD: int = 3
+    AI_CONTENT_RETENTION_DAYS: int = 90
+    AI_CONTENT_RETENTION_BATCH_SIZE: int = 5000
+
+    # Soft-deleted product purge
+    PRODUCT_PURGE_GRACE_HOURS: int = 24
+    PRODUCT_PURGE_BATCH_SIZE: int = 5000
+    PRODUCT_PURGE_PRODUCTS_PER_BATCH: int = 100
+
+    # Sharding by product_id (JSON shard map; unset = single database)
+    SHARD_MAP_PATH: Optional[str] = None
+    SHARD_ID_BLOCK_SIZE: int = 1000
+
+    # Online migrations (alembic -x online=true, app/infrastructure/db/online_migrations.py)
+    MIGRATION_LOCK_TIMEOUT_MS: int = 3000
+    MIGRATION_LOCK_RETRIES: int = 10
+    MIGRATION_LOCK_RETRY_DELAY_SECONDS: float = 2.0
+    MIGRATION_BACKFILL_BATCH_SIZE: int = 5000
+    MIGRATION_BACKFILL_PAUSE_SECONDS: float = 0.1
+
+    # Analytics snapshots (app.jobs.analytics_snapshot; unset URL = DATABASE_URL)
+    ANALYTICS_SNAPSHOT_DIR: str = "analytics_snapshots"
+    ANALYTICS_DATABASE_URL: Optional[str] = None
+    ANALYTICS_EXPORT_BATCH_SIZE: int = 10000
+    ANALYTICS_EXPORT_ROWS_PER_PART: int = 500000
+    ANALYTICS_EXPORT_LAG_SECONDS: int = 300
+
+    # Transactional outbox dispatcher
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_WEBHOOK_URL: Optional[str] = None
+    OUTBOX_WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    OUTBOX_RETENTION_HOURS: int = 168
+    OUTBOX_MAX_ATTEMPTS: int = 20
+
+    # HTTP caching (ETag responses)
+    HTTP_CACHE_CONTROL: str = "private, no-cache"
+
+    # Response compression (server preference order; br / zstd need optional packages)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: str = "zstd,br,gzip"
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_OFFLOAD_MIN_SIZE: int = 256 * 1024
+    COMPRESSION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
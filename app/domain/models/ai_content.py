@@ -1,17 +1,20 @@
 from datetime import datetime
+from typing import Any, Dict
 
 from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    Sequence,
     String,
-    Text,
 )
-from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import text
 
+from app.domain.models.ai_payload import AIPayload  # noqa: F401  (relationship target)
 from app.infrastructure.db.session import Base
 
 
@@ -25,11 +28,35 @@ class AIContent(Base):
     - content_type (title, description, full_listing, caption, ...)
 
     Payload is stored as JSONB so it is flexible for different use cases.
+    Payloads are deduplicated in ai_payloads (content-addressed by hash);
+    `payload` reads through to the shared row.
+
+    The table is range-partitioned by created_at (one partition per month),
+    so the primary key is (id, created_at); id alone is still unique.
     """
 
     __tablename__ = "ai_contents"
+    __table_args__ = (
+        Index(
+            "ix_ai_contents_product_channel_type",
+            "product_id",
+            "channel",
+            "content_type",
+            "created_at",
+        ),
+        # Review queue: only unapproved rows are indexed, so it stays small
+        Index(
+            "ix_ai_contents_review_queue",
+            "created_at",
+            "channel",
+            "content_type",
+            postgresql_where=text("approved = false"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    # Sequence created by the partitioning migration; SQLite shards (tests) ignore it
+    id = Column(Integer, Sequence("ai_contents_id_seq"), primary_key=True, index=True)
     product_id = Column(
         Integer,
         ForeignKey("products.id", ondelete="CASCADE"),
@@ -42,10 +69,12 @@ class AIContent(Base):
         String(50), nullable=False
     )  # e.g. 'title', 'description', 'full_listing', 'caption'
 
-    payload = Column(
-        JSONB(astext_type=Text),
+    payload_hash = Column(
+        String(64),
+        ForeignKey("ai_payloads.hash"),
         nullable=False,
-        doc="Raw AI output as JSON (title/body/hashtags/...)",
+        index=True,
+        doc="Hash of the deduplicated payload stored in ai_payloads.",
     )
 
     approved = Column(
@@ -63,6 +92,7 @@ class AIContent(Base):
 
     created_at = Column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         default=datetime.utcnow,
         doc="Timestamp when the AI content was created.",
@@ -73,3 +103,15 @@ class AIContent(Base):
         "Product",
         back_populates="ai_contents",
     )
+
+    # Always loaded together with the row (one JOIN, no N+1)
+    payload_ref = relationship(
+        "AIPayload",
+        lazy="joined",
+        innerjoin=True,
+    )
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        """Raw AI output as JSON (title/body/hashtags/...)."""
+        return self.payload_ref.payload
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+
+from app.infrastructure.db.session import Base
+
+
+class AIContentStat(Base):
+    """
+    Incrementally maintained generation / approval counters.
+
+    One row per (product, channel, content_type, model). Counters are updated
+    in the same transaction as the AIContent writes they describe, so
+    dashboards never have to run COUNT(*) over ai_contents.
+
+    `generated_count` counts every generation ever stored (archived rows
+    included); `approved_count` counts currently approved rows.
+    A missing model is stored as '' so it can be part of the primary key.
+    """
+
+    __tablename__ = "ai_content_stats"
+
+    product_id = Column(Integer, primary_key=True)
+    channel = Column(String(50), primary_key=True)
+    content_type = Column(String(50), primary_key=True)
+    last_model_used = Column(String(100), primary_key=True, default="", server_default="")
+
+    generated_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+    approved_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        doc="Timestamp of the last counter change.",
+    )
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, SmallInteger, String
+
+from app.infrastructure.db.session import Base
+
+
+class AIContentStatTotal(Base):
+    """
+    Catalog-wide rollup of ai_content_stats.
+
+    AI_CONTENT_STAT_TOTAL_SLOTS rows per (channel, content_type, model): the
+    per-product counters summed over the products of each slot
+    (product_id % slots). Updated in the same upsert transaction as
+    ai_content_stats; concurrent writers for one model lock different slot
+    rows instead of queueing on a single hot row. Readers sum the slots, so
+    unfiltered dashboards still read a handful of rows.
+    """
+
+    __tablename__ = "ai_content_stat_totals"
+
+    channel = Column(String(50), primary_key=True)
+    content_type = Column(String(50), primary_key=True)
+    last_model_used = Column(String(100), primary_key=True, default="", server_default="")
+    slot = Column(SmallInteger, primary_key=True, default=0, server_default="0")
+
+    generated_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+    approved_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        doc="Timestamp of the last counter change.",
+    )
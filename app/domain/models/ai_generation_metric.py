@@ -0,0 +1,47 @@
+from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String
+
+from app.infrastructure.db.session import Base
+
+
+class AIGenerationMetric(Base):
+    """
+    How one AIContent row was produced: tokens, timings, retries and whether
+    the model was called at all.
+
+    Written in the same transaction as the AIContent row (same id and
+    created_at). It is a cost / latency log, so it has no foreign key: rows
+    outlive retention of the content they describe.
+
+    Latencies are NULL when unknown (batch-mode results).
+    """
+
+    __tablename__ = "ai_generation_metrics"
+
+    ai_content_id = Column(Integer, primary_key=True)
+    product_id = Column(Integer, nullable=False, index=True)
+    channel = Column(String(50), nullable=False)
+    content_type = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False, default="", server_default="")
+
+    prompt_tokens = Column(Integer, nullable=False, default=0, server_default="0")
+    completion_tokens = Column(Integer, nullable=False, default=0, server_default="0")
+    wall_time_ms = Column(
+        Float,
+        nullable=True,
+        doc="Time spent producing the content, retries and backoff included.",
+    )
+    provider_latency_ms = Column(
+        Float,
+        nullable=True,
+        doc="Latency of the successful provider call.",
+    )
+    retries = Column(Integer, nullable=False, default=0, server_default="0")
+    cached = Column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default="false",
+        doc="True when no model call was made (e.g. reused from a similar product).",
+    )
+
+    created_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import JSON
+
+from app.infrastructure.db.session import Base
+
+
+class AIPayload(Base):
+    """
+    Content-addressed storage for AI payloads.
+
+    Each distinct payload is stored once, keyed by the SHA-256 of its
+    canonical JSON (sorted keys, compact separators). AIContent rows
+    reference it through `payload_hash`, so regenerations that produce the
+    same output share one row.
+
+    Every store refreshes (and row-locks) `last_referenced_at`, so the purge
+    job cannot delete a payload a concurrent transaction is about to reference.
+    """
+
+    __tablename__ = "ai_payloads"
+
+    hash = Column(
+        String(64),
+        primary_key=True,
+        doc="SHA-256 hex digest of the canonical JSON payload.",
+    )
+    payload = Column(
+        # Plain JSON on SQLite (local shard / test databases)
+        JSONB(astext_type=Text).with_variant(JSON(), "sqlite"),
+        nullable=False,
+        doc="Raw AI output as JSON (title/body/hashtags/...)",
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        doc="Timestamp when the payload was first stored.",
+    )
+    last_referenced_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        doc="Last time a new AI content was written with this payload (purge grace period).",
+    )
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import JSON
+from sqlalchemy.sql import text
+
+from app.infrastructure.db.session import Base
+
+
+class OutboxEvent(Base):
+    """
+    Transactional outbox entry describing a change to a Product or AIContent.
+
+    Rows are written in the same transaction as the change itself and later
+    delivered to downstream sinks by the outbox dispatcher (at-least-once;
+    consumers de-duplicate on `id`).
+
+    Delivery is tracked per sink (`delivered_sinks`), so a failing sink does
+    not cause redelivery to the others. After OUTBOX_MAX_ATTEMPTS failed
+    attempts an event is dead-lettered and no longer claimed.
+    """
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # Only undelivered events are indexed, so draining stays cheap
+        Index(
+            "ix_outbox_events_pending",
+            "id",
+            postgresql_where=text("dispatched_at IS NULL"),
+        ),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    aggregate_type = Column(String(50), nullable=False)  # e.g. 'product', 'ai_content'
+    aggregate_id = Column(Integer, nullable=False)
+    event_type = Column(String(100), nullable=False)  # e.g. 'product.updated'
+    payload = Column(
+        # Plain JSON on SQLite (local shard / test databases)
+        JSONB(astext_type=Text).with_variant(JSON(), "sqlite"),
+        nullable=False,
+        doc="Event body delivered to sinks.",
+    )
+
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        doc="Timestamp when the event was recorded.",
+    )
+    dispatched_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="Timestamp of successful delivery; NULL while pending.",
+    )
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="Earliest time of the next delivery attempt after a failure.",
+    )
+    last_error = Column(Text, nullable=True)
+    delivered_sinks = Column(
+        JSONB(astext_type=Text).with_variant(JSON(), "sqlite"),
+        nullable=False,
+        server_default=text("'[]'"),
+        doc="Keys of the sinks that already accepted this event.",
+    )
+    dead_lettered_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="Set when the event exhausted its delivery attempts; it is no longer claimed.",
+    )
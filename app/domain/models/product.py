@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Numeric, Boolean
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Index, Integer, String, Numeric, Boolean
+from sqlalchemy.sql import func, text
 from sqlalchemy.types import DateTime
 from sqlalchemy.orm import relationship
 
@@ -8,16 +8,43 @@ from app.infrastructure.db.session import Base
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # SKUs only need to be unique among live products (a deleted SKU can be reused)
+        Index(
+            "uq_products_sku_live",
+            "sku",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Listing order of live products
+        Index(
+            "ix_products_live_created_at",
+            "created_at",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
-    sku = Column(String(100), nullable=True, unique=True)
+    sku = Column(String(100), nullable=True)
     price = Column(Numeric(10, 2), nullable=True)
-    is_active = Column(Boolean, nullable=False, server_default="true")
+    is_active = Column(Boolean, nullable=False, server_default=text("true"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Soft delete marker; rows are removed later by the purge job
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Row version, bumped by the ORM on every UPDATE (used for ETags / optimistic locking)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Bumped whenever the product's AI contents change (ETag of the AI content history)
+    ai_contents_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __mapper_args__ = {"version_id_col": version}
+
   # New relationship to AIContent
     ai_contents = relationship(
         "AIContent",
         back_populates="product",
         cascade="all, delete-orphan",
-    )
\ No newline at end of file
+        # Rely on ON DELETE CASCADE instead of loading every child before a delete
+        passive_deletes=True,
+    )
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String
+
+from app.infrastructure.db.session import Base
+
+
+class ProductEmbedding(Base):
+    """
+    Local embedding of a product (hashing vectorizer over name / SKU / price,
+    see app/infrastructure/ai/embeddings.py).
+
+    One row per product, rewritten in the same transaction as the product
+    whenever the embedded fields change. `vector` holds `dims` little-endian
+    float32 values (L2-normalized). The in-memory index loads rows
+    incrementally by `updated_at`.
+    """
+
+    __tablename__ = "product_embeddings"
+
+    product_id = Column(
+        Integer,
+        ForeignKey("products.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    dims = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)
+    text_hash = Column(
+        String(64),
+        nullable=False,
+        doc="SHA-256 of the embedded product fields; unchanged fields are not re-embedded.",
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        index=True,
+        doc="Timestamp of the last (re-)embedding.",
+    )
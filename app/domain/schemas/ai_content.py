@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Type
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class AIContentBase(BaseModel):
@@ -24,11 +24,26 @@ class AIContentBase(BaseModel):
     )
 
 
+class GenerationMetrics(BaseModel):
+    """
+    How one AI content was produced (stored in ai_generation_metrics).
+    """
+    prompt_tokens: int = Field(0, ge=0)
+    completion_tokens: int = Field(0, ge=0)
+    wall_time_ms: Optional[float] = Field(None, description="Whole generation, retries and backoff included.")
+    provider_latency_ms: Optional[float] = Field(None, description="Latency of the successful provider call.")
+    retries: int = Field(0, ge=0)
+    cached: bool = Field(False, description="True when no model call was made (e.g. similar-product reuse).")
+
+
 class AIContentCreate(AIContentBase):
     """
     Schema used when creating a new AIContent entry.
     """
-    pass
+    metrics: Optional[GenerationMetrics] = Field(
+        None,
+        description="Generation metrics stored alongside the row (omitted for manual content).",
+    )
 
 
 class AIContentRead(AIContentBase):
@@ -36,7 +51,170 @@ class AIContentRead(AIContentBase):
     Schema used when returning AIContent to the client.
     """
     id: int
+    payload_hash: str = Field(..., description="Content hash of the payload (stable across duplicates).")
     created_at: datetime
 
     class Config:
         from_attributes = True  # for SQLAlchemy model compatibility
+
+
+class AIContentFilter(BaseModel):
+    """
+    Set-based selector for AI contents (all given fields must match).
+    """
+    product_id: Optional[int] = None
+    channel: Optional[str] = None
+    content_type: Optional[str] = None
+    last_model_used: Optional[str] = None
+
+
+class AIContentApprovalRequest(BaseModel):
+    """
+    Schema for approving / rejecting many AI contents at once.
+
+    Exactly one of `ids` or `filters` must be given.
+    """
+    approved: bool = Field(True, description="True to approve, False to reject (un-approve).")
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    filters: Optional[AIContentFilter] = None
+
+    @model_validator(mode="after")
+    def check_selector(self) -> "AIContentApprovalRequest":
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filters'.")
+        if self.filters is not None and not self.filters.model_dump(exclude_none=True):
+            raise ValueError("'filters' must contain at least one field.")
+        return self
+
+
+class AIContentApprovalResult(BaseModel):
+    """
+    Result of a bulk approval: the rows whose flag actually changed.
+    """
+    approved: bool
+    updated_count: int
+    ids: List[int]
+
+
+class AIContentStatsRead(BaseModel):
+    """
+    Generation / approval counters for one (channel, content_type, model) group.
+    """
+    channel: str
+    content_type: str
+    last_model_used: Optional[str] = None
+    generated_count: int
+    approved_count: int
+
+    @field_validator("last_model_used", mode="before")
+    @classmethod
+    def empty_model_as_none(cls, value: Optional[str]) -> Optional[str]:
+        # Counters store a missing model as ''
+        return value or None
+
+    class Config:
+        from_attributes = True
+
+
+class GenerationMetricsSummaryRead(BaseModel):
+    """
+    Cost and latency of AI generations for one (model, channel) over a time window.
+
+    Latency percentiles ignore rows without timings (batch-mode results).
+    Cost is None when AI_MODEL_PRICES has no entry for a model that used tokens.
+    """
+    model: str
+    channel: str
+    generations: int
+    cached: int = Field(..., description="Generations served without a model call.")
+    prompt_tokens: int
+    completion_tokens: int
+    retries: int
+    cost_usd: Optional[float] = None
+    cost_per_generation_usd: Optional[float] = None
+    wall_time_p50_ms: Optional[float] = None
+    wall_time_p95_ms: Optional[float] = None
+    provider_latency_p50_ms: Optional[float] = None
+    provider_latency_p95_ms: Optional[float] = None
+
+
+class ListingPayload(BaseModel):
+    """
+    Expected AI output for 'full_listing' content.
+    """
+    title: str = Field(..., min_length=1)
+    subtitle: Optional[str] = None
+    description_html: str = Field(..., min_length=1)
+    seo_keywords: List[str] = Field(default_factory=list)
+
+
+class TitlePayload(BaseModel):
+    """
+    Expected AI output for 'title' content.
+    """
+    title: str = Field(..., min_length=1)
+
+
+class DescriptionPayload(BaseModel):
+    """
+    Expected AI output for 'description' content.
+    """
+    description_html: str = Field(..., min_length=1)
+
+
+class CaptionPayload(BaseModel):
+    """
+    Expected AI output for 'caption' content (social channels).
+    """
+    caption: str = Field(..., min_length=1)
+    hashtags: List[str] = Field(default_factory=list)
+
+
+# content_type -> schema the AI payload must satisfy
+PAYLOAD_SCHEMAS: Dict[str, Type[BaseModel]] = {
+    "full_listing": ListingPayload,
+    "title": TitlePayload,
+    "description": DescriptionPayload,
+    "caption": CaptionPayload,
+}
+
+
+def validate_payload(content_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate an AI payload against the schema registered for its content_type.
+
+    Unknown content types are accepted as-is (payload stays flexible JSON).
+    Raises pydantic.ValidationError if the payload does not match.
+    """
+    schema = PAYLOAD_SCHEMAS.get(content_type)
+    if schema is None:
+        return payload
+    return schema.model_validate(payload).model_dump()
+
+
+class GenerationTarget(BaseModel):
+    """
+    One (channel, content_type) pair to generate content for.
+    """
+    # ':' separates the fields of batch custom_ids ("<product_id>:<channel>:<content_type>")
+    channel: str = Field(
+        ..., min_length=1, max_length=50, pattern=r"^[^:]+$", description="Target channel, e.g. 'ebay'."
+    )
+    content_type: str = Field(
+        ..., min_length=1, max_length=50, description="Content type, e.g. 'full_listing'."
+    )
+
+
+class AIGenerationRequest(BaseModel):
+    """
+    Schema for generating AI content for several channels in one request.
+    """
+    targets: List[GenerationTarget] = Field(..., min_length=1, max_length=20)
+    model_name: Optional[str] = Field(
+        None,
+        description="Model to use; defaults to the configured AI_DEFAULT_MODEL.",
+    )
+    reuse_similar: bool = Field(
+        False,
+        description="Adapt approved content of a sufficiently similar product instead of calling the model.",
+    )
@@ -38,6 +38,7 @@ class ProductRead(ProductBase):
     id: int
     is_active: bool
     created_at: datetime
+    version: int
 
     class Config:
         from_attributes = True  # allows reading from SQLAlchemy models
@@ -0,0 +1,177 @@
+"""
+AIContentService
+
+Service Layer for AIContent operations that are not scoped to one product.
+
+Responsibilities:
+- Bulk approval / rejection of AI contents (by IDs or by filters).
+- Review queue of unapproved AI contents.
+- Generation / approval statistics (read from precomputed counters).
+- Cost and latency summaries of AI generations (ai_generation_metrics).
+
+Architecture Notes (Project Standard):
+- Repository handles all DB operations (SQLAlchemy).
+- Service layer MUST NOT contain database queries directly.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.schemas.ai_content import (
+    AIContentApprovalRequest,
+    AIContentApprovalResult,
+    AIContentRead,
+    AIContentStatsRead,
+    GenerationMetricsSummaryRead,
+)
+from app.infrastructure.repositories import (
+    ai_content_repository,
+    ai_content_stats_repository,
+    ai_generation_metrics_repository,
+)
+
+
+class AIContentService:
+    """
+    Service layer for AIContent review workflows.
+    """
+
+    @staticmethod
+    def set_approval(
+        db: Session,
+        data: AIContentApprovalRequest,
+    ) -> AIContentApprovalResult:
+        """
+        Approve or reject many AI contents with set-based updates.
+        """
+        if data.ids is not None:
+            changed = ai_content_repository.set_approval_by_ids(
+                db=db,
+                ids=data.ids,
+                approved=data.approved,
+            )
+        else:
+            changed = ai_content_repository.set_approval_by_filter(
+                db=db,
+                filters=data.filters,
+                approved=data.approved,
+            )
+
+        return AIContentApprovalResult(
+            approved=data.approved,
+            updated_count=len(changed),
+            ids=[row.id for row in changed],
+        )
+
+    @staticmethod
+    def get_review_queue(
+        db: Session,
+        channel: Optional[str] = None,
+        content_type: Optional[str] = None,
+        before: Optional[datetime] = None,
+        before_id: Optional[int] = None,
+        limit: int = 50,
+    ) -> List[AIContentRead]:
+        """
+        Return unapproved AI contents, newest first.
+        """
+        return ai_content_repository.get_review_queue(
+            db=db,
+            channel=channel,
+            content_type=content_type,
+            before=before,
+            before_id=before_id,
+            limit=limit,
+        )
+
+    @staticmethod
+    def get_stats(
+        db: Session,
+        product_id: Optional[int] = None,
+        channel: Optional[str] = None,
+        content_type: Optional[str] = None,
+        last_model_used: Optional[str] = None,
+    ) -> List[AIContentStatsRead]:
+        """
+        Return generation / approval counts per channel, content_type and model.
+        """
+        return ai_content_stats_repository.get_stats(
+            db=db,
+            product_id=product_id,
+            channel=channel,
+            content_type=content_type,
+            last_model_used=last_model_used,
+        )
+
+    @staticmethod
+    def _cost_usd(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+        """
+        Token cost from AI_MODEL_PRICES (USD per 1M tokens); None for unpriced models.
+        """
+        if not prompt_tokens and not completion_tokens:
+            return 0.0
+        prices = settings.AI_MODEL_PRICES.get(model)
+        if prices is None:
+            return None
+        return (
+            prompt_tokens * prices.get("prompt", 0.0)
+            + completion_tokens * prices.get("completion", 0.0)
+        ) / 1_000_000
+
+    @staticmethod
+    def get_generation_metrics(
+        db: Session,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_id: Optional[int] = None,
+        model: Optional[str] = None,
+        channel: Optional[str] = None,
+    ) -> List[GenerationMetricsSummaryRead]:
+        """
+        Return cost and p50 / p95 latency per model and channel for
+        generations created in [since, until).
+
+        Defaults to the last 24 hours; naive datetimes are taken as UTC.
+        """
+        until = until or datetime.now(timezone.utc)
+        since = since or until - timedelta(days=1)
+        if until.tzinfo is None:
+            until = until.replace(tzinfo=timezone.utc)
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+        if since >= until:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'since' must be before 'until'.",
+            )
+        if until - since > timedelta(days=settings.AI_METRICS_MAX_WINDOW_DAYS):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Time window must not exceed {settings.AI_METRICS_MAX_WINDOW_DAYS} days.",
+            )
+
+        rows = ai_generation_metrics_repository.get_summary(
+            db=db,
+            since=since,
+            until=until,
+            product_id=product_id,
+            model=model,
+            channel=channel,
+        )
+
+        summary = []
+        for row in rows:
+            cost = AIContentService._cost_usd(row.model, row.prompt_tokens, row.completion_tokens)
+            summary.append(
+                GenerationMetricsSummaryRead(
+                    **row._asdict(),
+                    cost_usd=cost,
+                    cost_per_generation_usd=None if cost is None else cost / row.generations,
+                )
+            )
+        return summary
@@ -0,0 +1,233 @@
+"""
+AnalyticsSnapshotService
+
+Service Layer for exporting analytics snapshots off the primary database.
+
+Responsibilities:
+- Export products (full snapshot) and AI contents (incremental, by
+  (created_at, id) watermark) into compressed columnar files.
+- Flatten the common payload fields (title, subtitle, seo_keywords, caption,
+  hashtags, description length) into plain columns, so analysts never scan
+  JSONB on the primary.
+- Keep the manifest consistent: a part is listed, and the watermark moved,
+  only after its file is fully written.
+
+`approved` is recorded as of the export; later approvals are not rewritten
+into existing parts.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.infrastructure.analytics import snapshots
+from app.infrastructure.analytics.columnar import Columns, default_format, write_columns
+from app.infrastructure.repositories import ai_content_repository, product_repository
+
+logger = logging.getLogger(__name__)
+
+# Column name -> kind ('int', 'float', 'bool', 'datetime', 'str')
+PRODUCT_COLUMNS = {
+    "id": "int",
+    "name": "str",
+    "sku": "str",
+    "price": "float",
+    "is_active": "bool",
+    "created_at": "datetime",
+    "version": "int",
+    "ai_contents_version": "int",
+}
+
+AI_CONTENT_COLUMNS = {
+    "id": "int",
+    "product_id": "int",
+    "channel": "str",
+    "content_type": "str",
+    "payload_hash": "str",
+    "approved": "bool",
+    "last_model_used": "str",
+    "created_at": "datetime",
+    "title": "str",
+    "subtitle": "str",
+    "seo_keywords": "str",
+    "caption": "str",
+    "hashtags": "str",
+    "description_length": "int",
+}
+
+# Separator of flattened list fields (seo_keywords, hashtags)
+LIST_SEPARATOR = "|"
+
+
+@dataclass
+class SnapshotSummary:
+    """Outcome of one export run."""
+    products: int = 0
+    ai_contents: int = 0
+    parts: int = 0
+
+
+def _column(kind: str, values: List[Any]) -> np.ndarray:
+    if kind == "int":
+        return np.array([0 if v is None else v for v in values], dtype=np.int64)
+    if kind == "float":
+        return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+    if kind == "bool":
+        return np.array([bool(v) for v in values], dtype=bool)
+    if kind == "datetime":
+        return np.array([snapshots.utc_naive(v) for v in values], dtype="datetime64[us]")
+    return np.array(["" if v is None else str(v) for v in values], dtype=str)
+
+
+def to_columns(rows: List[Dict[str, Any]], spec: Dict[str, str]) -> Columns:
+    """Turn flattened rows into typed NumPy columns."""
+    return {name: _column(kind, [row.get(name) for row in rows]) for name, kind in spec.items()}
+
+
+def _joined(value: Any) -> str:
+    if isinstance(value, list):
+        return LIST_SEPARATOR.join(str(item) for item in value)
+    return "" if value is None else str(value)
+
+
+def flatten_ai_content(row: Any) -> Dict[str, Any]:
+    """One export row: the AI content columns plus common payload fields."""
+    payload = row.payload if isinstance(row.payload, dict) else {}
+    return {
+        "id": row.id,
+        "product_id": row.product_id,
+        "channel": row.channel,
+        "content_type": row.content_type,
+        "payload_hash": row.payload_hash,
+        "approved": row.approved,
+        "last_model_used": row.last_model_used,
+        "created_at": row.created_at,
+        "title": payload.get("title"),
+        "subtitle": payload.get("subtitle"),
+        "seo_keywords": _joined(payload.get("seo_keywords")),
+        "caption": payload.get("caption"),
+        "hashtags": _joined(payload.get("hashtags")),
+        "description_length": len(payload.get("description_html") or ""),
+    }
+
+
+def flatten_product(product: Any) -> Dict[str, Any]:
+    """One export row of a product."""
+    return {name: getattr(product, name) for name in PRODUCT_COLUMNS}
+
+
+class AnalyticsSnapshotService:
+    """
+    Service layer for analytics snapshot exports.
+    """
+
+    @staticmethod
+    def _new_manifest(fmt: str) -> Dict[str, Any]:
+        return {
+            "version": 1,
+            "format": fmt,
+            "tables": {
+                "products": None,
+                "ai_contents": {"watermark": None, "parts": []},
+            },
+        }
+
+    @staticmethod
+    def export_products(db: Session, snapshot_dir: str, fmt: str, batch_size: int) -> Dict[str, Any]:
+        """Rewrite the full products snapshot (products change in place)."""
+        rows: List[Dict[str, Any]] = []
+        for products in product_repository.iter_products(db=db, batch_size=batch_size, only_active=False):
+            rows.extend(flatten_product(product) for product in products)
+
+        path = write_columns(os.path.join(snapshot_dir, "products"), to_columns(rows, PRODUCT_COLUMNS), fmt)
+        return {
+            "file": os.path.relpath(path, snapshot_dir),
+            "rows": len(rows),
+            "exported_at": datetime.utcnow().isoformat(),
+        }
+
+    @staticmethod
+    def export(
+        db: Session,
+        snapshot_dir: str,
+        fmt: Optional[str] = None,
+        batch_size: int = 10000,
+        rows_per_part: int = 500000,
+        lag_seconds: int = 300,
+    ) -> SnapshotSummary:
+        """
+        Export products and new AI contents into `snapshot_dir`.
+
+        AI contents younger than `lag_seconds` are left for the next run, so a
+        transaction that commits late cannot slip behind the watermark. Safe
+        to re-run after a crash: unlisted part files are overwritten.
+        """
+        os.makedirs(os.path.join(snapshot_dir, "ai_contents"), exist_ok=True)
+        manifest = snapshots.load_manifest(snapshot_dir)
+        if manifest is None:
+            manifest = AnalyticsSnapshotService._new_manifest(fmt or default_format())
+        elif fmt is not None and fmt != manifest["format"]:
+            raise ValueError(f"Snapshot in {snapshot_dir!r} uses {manifest['format']!r}, not {fmt!r}.")
+        fmt = manifest["format"]
+
+        summary = SnapshotSummary()
+        tables = manifest["tables"]
+        tables["products"] = AnalyticsSnapshotService.export_products(db, snapshot_dir, fmt, batch_size)
+        snapshots.save_manifest(snapshot_dir, manifest)
+        summary.products = tables["products"]["rows"]
+
+        contents = tables["ai_contents"]
+        watermark = contents["watermark"]
+        after: Optional[Tuple[datetime, int]] = None
+        if watermark is not None:
+            after = (datetime.fromisoformat(watermark["created_at"]), watermark["id"])
+        created_before = datetime.utcnow() - timedelta(seconds=lag_seconds)
+
+        pending: List[Dict[str, Any]] = []
+
+        def write_part() -> None:
+            nonlocal pending
+            if not pending:
+                return
+            columns = to_columns(pending, AI_CONTENT_COLUMNS)
+            name = os.path.join(snapshot_dir, "ai_contents", f"part-{len(contents['parts']):05d}")
+            path = write_columns(name, columns, fmt)
+            contents["parts"].append(
+                {
+                    "file": os.path.relpath(path, snapshot_dir),
+                    "rows": len(pending),
+                    "min_created_at": str(columns["created_at"].min()),
+                    "max_created_at": str(columns["created_at"].max()),
+                    "exported_at": datetime.utcnow().isoformat(),
+                }
+            )
+            contents["watermark"] = {"created_at": after[0].isoformat(), "id": after[1]}
+            snapshots.save_manifest(snapshot_dir, manifest)
+            summary.ai_contents += len(pending)
+            summary.parts += 1
+            logger.info("Wrote %s (%d AI contents)", path, len(pending))
+            pending = []
+
+        while True:
+            rows = ai_content_repository.get_ai_contents_for_export(
+                db=db,
+                created_before=created_before,
+                after=after,
+                limit=batch_size,
+            )
+            if not rows:
+                break
+            pending.extend(flatten_ai_content(row) for row in rows)
+            after = (rows[-1].created_at, rows[-1].id)
+            if len(pending) >= rows_per_part:
+                write_part()
+            if len(rows) < batch_size:
+                break
+        write_part()
+
+        return summary
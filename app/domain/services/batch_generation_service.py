@@ -0,0 +1,319 @@
+"""
+BatchGenerationService
+
+Service Layer for offline, catalog-wide AI generation.
+
+Responsibilities:
+- Collect pending generation requests (products x targets) into batch files.
+- Submit every batch file through a BatchProvider, then wait for all of
+  them together.
+- Bulk-write validated results into ai_contents (with last_model_used) and
+  count the requests the provider reported as failed.
+- Optionally serve products from approved content of similar products
+  first, so only the rest goes to the model.
+
+Interactive endpoints use ProductService; this service trades latency for
+throughput and cost, and is driven by `app.jobs.batch_generate`.
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.domain.schemas.ai_content import AIContentCreate, GenerationMetrics, GenerationTarget
+from app.domain.services.content_reuse_service import ContentReuseService
+from app.domain.services.prompts import build_prompt
+from app.infrastructure.ai.base import GenerationRequest, GenerationResult
+from app.infrastructure.ai.batch import (
+    BatchProvider,
+    BatchStatus,
+    parse_custom_id,
+    read_batch_results,
+    write_batch_file,
+)
+from app.infrastructure.repositories import ai_content_repository, product_repository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchRunSummary:
+    """Outcome of a batch generation run."""
+    batch_ids: List[str] = field(default_factory=list)
+    requested: int = 0
+    inserted: int = 0
+    failed: int = 0
+    reused: int = 0
+
+
+class BatchGenerationService:
+    """
+    Service layer for batch-mode AI generation.
+    """
+
+    @staticmethod
+    def unique_targets(targets: List[GenerationTarget]) -> List[GenerationTarget]:
+        """
+        Drop repeated (channel, content_type) targets, keeping the first.
+
+        A repeated target would produce duplicate custom_ids, and the provider
+        rejects the whole batch file.
+        """
+        unique: Dict[Tuple[str, str], GenerationTarget] = {}
+        for target in targets:
+            unique.setdefault((target.channel, target.content_type), target)
+        return list(unique.values())
+
+    @staticmethod
+    def iter_pending_requests(
+        db: Session,
+        targets: List[GenerationTarget],
+        model_name: str,
+        only_missing: bool = True,
+        page_size: int = 1000,
+    ) -> Iterator[GenerationRequest]:
+        """
+        Yield one GenerationRequest per (active product, target).
+
+        With only_missing, products that already have content for a target are skipped.
+        """
+        targets = BatchGenerationService.unique_targets(targets)
+        for products in product_repository.iter_products(db=db, batch_size=page_size):
+            for target in targets:
+                existing = set()
+                if only_missing:
+                    existing = ai_content_repository.get_product_ids_with_content(
+                        db=db,
+                        product_ids=[p.id for p in products],
+                        channel=target.channel,
+                        content_type=target.content_type,
+                    )
+                for product in products:
+                    if product.id in existing:
+                        continue
+                    yield GenerationRequest(
+                        prompt=build_prompt(product, channel=target.channel, content_type=target.content_type),
+                        channel=target.channel,
+                        content_type=target.content_type,
+                        model=model_name,
+                        product_id=product.id,
+                    )
+
+    @staticmethod
+    def reuse_similar_contents(
+        db: Session,
+        targets: List[GenerationTarget],
+        page_size: int = 1000,
+        chunk_size: int = 1000,
+    ) -> int:
+        """
+        Store adapted copies of similar products' approved content for every
+        (active product, target) without content yet. Returns the number stored.
+
+        Run before writing batch files: with only_missing, the products served
+        here are no longer pending.
+        """
+        targets = BatchGenerationService.unique_targets(targets)
+        reused = 0
+        pending: List[AIContentCreate] = []
+
+        def flush() -> None:
+            nonlocal reused
+            if pending:
+                ai_content_repository.create_ai_contents(db=db, items=pending, reload=False)
+                reused += len(pending)
+                pending.clear()
+
+        for products in product_repository.iter_products(db=db, batch_size=page_size):
+            missing = {p.id: [] for p in products}
+            for target in targets:
+                existing = ai_content_repository.get_product_ids_with_content(
+                    db=db,
+                    product_ids=missing.keys(),
+                    channel=target.channel,
+                    content_type=target.content_type,
+                )
+                for product in products:
+                    if product.id not in existing:
+                        missing[product.id].append((target.channel, target.content_type))
+
+            found = ContentReuseService.reuse_contents_many(
+                db=db, requests=[(product, missing[product.id]) for product in products]
+            )
+            for contents in found.values():
+                pending.extend(contents.values())
+            if len(pending) >= chunk_size:
+                flush()
+
+        flush()
+        return reused
+
+    @staticmethod
+    def write_batch_files(
+        db: Session,
+        targets: List[GenerationTarget],
+        model_name: str,
+        work_dir: str,
+        max_requests_per_file: int,
+        only_missing: bool = True,
+    ) -> List[str]:
+        """
+        Write pending requests into JSONL files of at most max_requests_per_file lines.
+        """
+        os.makedirs(work_dir, exist_ok=True)
+        requests = BatchGenerationService.iter_pending_requests(
+            db=db, targets=targets, model_name=model_name, only_missing=only_missing
+        )
+
+        paths: List[str] = []
+        while True:
+            chunk: List[GenerationRequest] = []
+            for request in requests:
+                chunk.append(request)
+                if len(chunk) >= max_requests_per_file:
+                    break
+            if not chunk:
+                return paths
+
+            path = os.path.join(work_dir, f"batch_input_{len(paths):04d}.jsonl")
+            write_batch_file(path, chunk)
+            paths.append(path)
+            logger.info("Wrote %d requests to %s", len(chunk), path)
+
+    @staticmethod
+    def ingest_results(db: Session, output_path: str, chunk_size: int = 1000) -> BatchRunSummary:
+        """
+        Bulk-insert successful results from a batch output (or error) file
+        into ai_contents; failed lines are counted and logged.
+        """
+        summary = BatchRunSummary()
+        pending: List[AIContentCreate] = []
+
+        def flush() -> None:
+            if pending:
+                ai_content_repository.create_ai_contents(db=db, items=pending, reload=False)
+                summary.inserted += len(pending)
+                pending.clear()
+
+        for custom_id, outcome in read_batch_results(output_path):
+            summary.requested += 1
+            if not isinstance(outcome, GenerationResult):
+                summary.failed += 1
+                logger.warning("Batch item %s failed: %s", custom_id, outcome)
+                continue
+
+            product_id, channel, content_type = parse_custom_id(custom_id)
+            pending.append(
+                AIContentCreate(
+                    product_id=product_id,
+                    channel=channel,
+                    content_type=content_type,
+                    payload=outcome.payload,
+                    approved=False,
+                    last_model_used=outcome.model,
+                    # Batch results carry no per-request timings
+                    metrics=GenerationMetrics(
+                        prompt_tokens=outcome.prompt_tokens,
+                        completion_tokens=outcome.completion_tokens,
+                    ),
+                )
+            )
+            if len(pending) >= chunk_size:
+                flush()
+
+        flush()
+        return summary
+
+    @staticmethod
+    def _ingest_batch(
+        db: Session,
+        provider: BatchProvider,
+        status: BatchStatus,
+        input_path: str,
+    ) -> BatchRunSummary:
+        """
+        Download and ingest the output and error files of a finished batch.
+
+        A batch that failed before producing any file (e.g. input validation)
+        counts all of its requests as failed.
+        """
+        summary = BatchRunSummary()
+        if status.status != "completed":
+            logger.error("Batch %s finished with status %s", status.batch_id, status.status)
+
+        files = []
+        if status.output_location:
+            output_path = input_path.replace("batch_input_", "batch_output_")
+            files.append(provider.download_results(status, output_path))
+        error_path = provider.download_errors(status, input_path.replace("batch_input_", "batch_errors_"))
+        if error_path is not None:
+            files.append(error_path)
+
+        if not files:
+            with open(input_path, "r", encoding="utf-8") as fh:
+                summary.requested = summary.failed = sum(1 for line in fh if line.strip())
+            return summary
+
+        for path in files:
+            part = BatchGenerationService.ingest_results(db=db, output_path=path)
+            summary.requested += part.requested
+            summary.inserted += part.inserted
+            summary.failed += part.failed
+        return summary
+
+    @staticmethod
+    def run(
+        db: Session,
+        provider: BatchProvider,
+        targets: List[GenerationTarget],
+        model_name: str,
+        work_dir: str,
+        max_requests_per_file: int,
+        poll_interval: float,
+        only_missing: bool = True,
+        timeout: Optional[float] = None,
+        reuse_similar: bool = False,
+    ) -> BatchRunSummary:
+        """
+        Full pipeline: (reuse similar content,) write batch files, submit them
+        all, poll them together, then download and ingest each as it finishes.
+        """
+        total = BatchRunSummary()
+        if reuse_similar:
+            total.reused = BatchGenerationService.reuse_similar_contents(db=db, targets=targets)
+            logger.info("Reused approved content of similar products for %d targets", total.reused)
+
+        paths = BatchGenerationService.write_batch_files(
+            db=db,
+            targets=targets,
+            model_name=model_name,
+            work_dir=work_dir,
+            max_requests_per_file=max_requests_per_file,
+            only_missing=only_missing,
+        )
+
+        # Submit everything first: each batch may take up to the provider's
+        # completion window, so they must run concurrently, not one after another
+        input_paths: Dict[str, str] = {}
+        for input_path in paths:
+            status = provider.submit(input_path)
+            total.batch_ids.append(status.batch_id)
+            input_paths[status.batch_id] = input_path
+            logger.info("Submitted %s as batch %s", input_path, status.batch_id)
+
+        for status in provider.wait_all(total.batch_ids, poll_interval=poll_interval, timeout=timeout):
+            summary = BatchGenerationService._ingest_batch(
+                db=db, provider=provider, status=status, input_path=input_paths[status.batch_id]
+            )
+            total.requested += summary.requested
+            total.inserted += summary.inserted
+            total.failed += summary.failed
+            logger.info(
+                "Batch %s (%s): %d inserted, %d failed",
+                status.batch_id, status.status, summary.inserted, summary.failed,
+            )
+
+        return total
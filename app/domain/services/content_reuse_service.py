@@ -0,0 +1,200 @@
+"""
+ContentReuseService
+
+Service Layer for reusing approved AI content across similar products.
+
+Responsibilities:
+- Keep the process-wide product embedding index in sync with
+  product_embeddings (incremental, by updated_at watermark).
+- Find the most similar products that already have approved content for a
+  (channel, content_type) target.
+- Adapt that payload to the requested product instead of calling the model.
+
+Reused rows are stored unapproved like any generation, with
+last_model_used = 'reuse:<model of the source row>', so reviewers and the
+stats endpoints can tell them apart.
+
+Architecture Notes (Project Standard):
+- Repository handles all DB operations (SQLAlchemy).
+- Service layer MUST NOT contain database queries directly.
+"""
+
+import logging
+import time
+from datetime import timedelta
+from typing import Dict, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.models.product import Product
+from app.domain.schemas.ai_content import AIContentCreate, GenerationMetrics, validate_payload
+from app.domain.services.payload_adaptation import adapt_payload
+from app.infrastructure.ai import embeddings
+from app.infrastructure.ai.vector_index import VectorIndex, get_product_index
+from app.infrastructure.repositories import (
+    ai_content_repository,
+    product_embedding_repository,
+    product_repository,
+)
+
+logger = logging.getLogger(__name__)
+
+REUSED_MODEL_PREFIX = "reuse:"
+
+# Rows are re-read this far behind the watermark: a transaction that commits
+# late can carry an updated_at older than rows already loaded.
+_SYNC_OVERLAP = timedelta(seconds=60)
+
+Target = Tuple[str, str]
+
+
+class ContentReuseService:
+    """
+    Service layer for similar-product content reuse.
+    """
+
+    @staticmethod
+    def sync_index(db: Session, force: bool = False) -> VectorIndex:
+        """
+        Load embeddings changed since the last sync into the in-memory index.
+
+        The first call loads everything; later calls (at most one per
+        EMBEDDING_INDEX_REFRESH_SECONDS unless forced) only read new rows.
+        """
+        index = get_product_index()
+        if not force and time.monotonic() - index.synced_at < settings.EMBEDDING_INDEX_REFRESH_SECONDS:
+            return index
+
+        since = None if index.synced_until is None else index.synced_until - _SYNC_OVERLAP
+        after_product_id = 0
+        newest = index.synced_until
+        loaded = 0
+        while True:
+            rows = product_embedding_repository.get_embeddings_updated_since(
+                db=db,
+                since=since,
+                dims=index.dims,
+                after_product_id=after_product_id,
+                limit=settings.EMBEDDING_INDEX_SYNC_BATCH_SIZE,
+            )
+            if not rows:
+                break
+            index.upsert_many((row.product_id, embeddings.from_bytes(row.vector, row.dims)) for row in rows)
+            loaded += len(rows)
+            since, after_product_id = rows[-1].updated_at, rows[-1].product_id
+            newest = since if newest is None else max(newest, since)
+            if len(rows) < settings.EMBEDDING_INDEX_SYNC_BATCH_SIZE:
+                break
+
+        if loaded and index.synced_until is None:
+            logger.info("Loaded %d product embeddings into the similarity index", loaded)
+        index.synced_until = newest
+        index.synced_at = time.monotonic()
+        return index
+
+    @staticmethod
+    def forget_product(product_id: int) -> None:
+        """Drop a (deleted) product from this process's index."""
+        get_product_index().remove(product_id)
+
+    @staticmethod
+    def find_similar_products(db: Session, product: Product) -> List[Tuple[int, float]]:
+        """
+        Return (product_id, similarity) of the closest other products, most
+        similar first, above AI_REUSE_MIN_SIMILARITY.
+        """
+        return ContentReuseService._search(ContentReuseService.sync_index(db), product)
+
+    @staticmethod
+    def _search(index: VectorIndex, product: Product) -> List[Tuple[int, float]]:
+        return index.search(
+            embeddings.embed_product(product, index.dims),
+            k=settings.AI_REUSE_CANDIDATES,
+            min_score=settings.AI_REUSE_MIN_SIMILARITY,
+            exclude=[product.id],
+        )
+
+    @staticmethod
+    def reuse_contents(
+        db: Session,
+        product: Product,
+        targets: List[Target],
+    ) -> Dict[Target, AIContentCreate]:
+        """
+        Build AI contents for `product` from approved contents of similar products.
+
+        Returns one AIContentCreate per (channel, content_type) target that
+        could be served this way; the caller generates the rest. Nothing is
+        stored here.
+        """
+        return ContentReuseService.reuse_contents_many(db=db, requests=[(product, targets)]).get(product.id, {})
+
+    @staticmethod
+    def reuse_contents_many(
+        db: Session,
+        requests: List[Tuple[Product, List[Target]]],
+    ) -> Dict[int, Dict[Target, AIContentCreate]]:
+        """
+        reuse_contents for many products at once, keyed by product ID.
+
+        The similarity searches run in memory; the approved contents and the
+        source products of all matches are then fetched with one query each.
+        """
+        requests = [(product, targets) for product, targets in requests if targets]
+        if not requests:
+            return {}
+
+        started = time.perf_counter()
+        index = ContentReuseService.sync_index(db)
+        matches = {product.id: ContentReuseService._search(index, product) for product, _ in requests}
+        matched_ids = {source_id for found in matches.values() for source_id, _ in found}
+        if not matched_ids:
+            return {}
+
+        approved = ai_content_repository.get_latest_approved_contents(
+            db=db,
+            product_ids=matched_ids,
+            targets={target for _, targets in requests for target in targets},
+        )
+        if not approved:
+            return {}
+
+        sources = {
+            source.id: source
+            for source in product_repository.get_products_by_ids(
+                db=db, product_ids={key[0] for key in approved}
+            )
+        }
+        # Lookups are shared, so each product is charged an equal share of the time
+        wall_time_ms = (time.perf_counter() - started) * 1000 / len(requests)
+
+        reused: Dict[int, Dict[Target, AIContentCreate]] = {}
+        for product, targets in requests:
+            for channel, content_type in targets:
+                for source_id, score in matches[product.id]:
+                    row = approved.get((source_id, channel, content_type))
+                    source = sources.get(source_id)
+                    if row is None or source is None:
+                        continue
+                    try:
+                        payload = validate_payload(content_type, adapt_payload(row.payload, source, product))
+                    except ValidationError:
+                        continue
+
+                    reused.setdefault(product.id, {})[(channel, content_type)] = AIContentCreate(
+                        product_id=product.id,
+                        channel=channel,
+                        content_type=content_type,
+                        payload=payload,
+                        approved=False,
+                        last_model_used=f"{REUSED_MODEL_PREFIX}{row.last_model_used or ''}"[:100],
+                        metrics=GenerationMetrics(cached=True, wall_time_ms=wall_time_ms),
+                    )
+                    logger.info(
+                        "Reused AI content %s of product %s for product %s (%s/%s, similarity %.3f)",
+                        row.id, source_id, product.id, channel, content_type, score,
+                    )
+                    break
+        return reused
@@ -0,0 +1,85 @@
+"""
+Adapt an approved AI payload of one product to a similar product.
+
+Responsibilities:
+- Work out which strings differ between the source and target product
+  (full name, SKU, and name words that were swapped, e.g. 'Red' -> 'Blue').
+- Rewrite every string in the payload (nested lists / dicts included) in a
+  single pass, so a replacement is never replaced again.
+"""
+
+import copy
+import difflib
+import re
+from typing import Any, Dict, List, Tuple
+
+from app.domain.models.product import Product
+
+# Shorter swapped words ('M' -> 'L') are only replaced as part of the full name
+_MIN_WORD_LENGTH = 2
+
+
+def _match_case(matched: str, replacement: str) -> str:
+    """Give `replacement` the capitalization of the text it replaces."""
+    if len(matched) > 1 and matched.isupper():
+        return replacement.upper()
+    if matched[:1].isupper():
+        return replacement[:1].upper() + replacement[1:]
+    if matched.islower():
+        return replacement.lower()
+    return replacement
+
+
+def replacements(source: Product, target: Product) -> List[Tuple[str, str]]:
+    """
+    (old, new) string pairs turning text about `source` into text about `target`,
+    longest first.
+    """
+    pairs: Dict[str, str] = {}
+    if source.name and target.name and source.name.lower() != target.name.lower():
+        pairs[source.name.lower()] = target.name
+    if source.sku and target.sku and source.sku.lower() != target.sku.lower():
+        pairs[source.sku.lower()] = target.sku
+
+    source_words, target_words = (source.name or "").split(), (target.name or "").split()
+    matcher = difflib.SequenceMatcher(
+        a=[word.lower() for word in source_words],
+        b=[word.lower() for word in target_words],
+        autojunk=False,
+    )
+    for tag, a_start, a_end, b_start, b_end in matcher.get_opcodes():
+        # Only 1:1 word swaps are unambiguous
+        if tag != "replace" or a_end - a_start != b_end - b_start:
+            continue
+        for old, new in zip(source_words[a_start:a_end], target_words[b_start:b_end]):
+            if len(old) >= _MIN_WORD_LENGTH:
+                pairs.setdefault(old.lower(), new)
+
+    return sorted(pairs.items(), key=lambda pair: len(pair[0]), reverse=True)
+
+
+def _adapt(value: Any, pattern: "re.Pattern[str]", mapping: Dict[str, str]) -> Any:
+    if isinstance(value, str):
+        return pattern.sub(lambda m: _match_case(m.group(0), mapping[m.group(0).lower()]), value)
+    if isinstance(value, list):
+        return [_adapt(item, pattern, mapping) for item in value]
+    if isinstance(value, dict):
+        return {key: _adapt(item, pattern, mapping) for key, item in value.items()}
+    return value
+
+
+def adapt_payload(payload: Dict[str, Any], source: Product, target: Product) -> Dict[str, Any]:
+    """
+    Return a copy of `payload` (written for `source`) rewritten for `target`.
+
+    Identical products get an unchanged copy.
+    """
+    pairs = replacements(source, target)
+    if not pairs:
+        return copy.deepcopy(payload)
+
+    pattern = re.compile(
+        "|".join(rf"(?<!\w){re.escape(old)}(?!\w)" for old, _ in pairs),
+        re.IGNORECASE,
+    )
+    return _adapt(payload, pattern, dict(pairs))
@@ -1,6 +1,8 @@
 
 from typing import List, Optional
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from fastapi import HTTPException, status
 
 
@@ -9,8 +11,26 @@ from app.domain.schemas.product import ProductCreate, ProductUpdate, ProductRead
 from app.infrastructure.repositories import product_repository
 
 
-from app.domain.schemas.ai_content import AIContentRead, AIContentCreate
-from app.infrastructure.repositories import ai_content_repository
+from app.domain.schemas.ai_content import (
+    AIContentCreate,
+    AIContentRead,
+    AIContentStatsRead,
+    GenerationMetrics,
+    GenerationTarget,
+)
+from app.infrastructure.repositories import ai_content_repository, ai_content_stats_repository
+
+from app.core.config import settings
+from app.domain.services.content_reuse_service import ContentReuseService
+from app.domain.services.prompts import build_prompt
+from app.infrastructure.ai import runtime as ai_runtime
+from app.infrastructure.ai.base import (
+    AIProviderError,
+    AIProviderTimeoutError,
+    GenerationRequest,
+    GenerationResult,
+)
+from app.infrastructure.ai.factory import get_ai_provider
 """
 ProductService
 
@@ -60,6 +80,23 @@ class ProductService:
             )
         return product
 
+    @staticmethod
+    def get_product_versions(
+        db: Session,
+        product_id: int,
+    ) -> Row:
+        """
+        Return (version, ai_contents_version) for a product, used to build ETags
+        without loading the full row. Raises 404 if product does not exist.
+        """
+        versions = product_repository.get_product_versions(db=db, product_id=product_id)
+        if not versions:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found.",
+            )
+        return versions
+
     @staticmethod
     def create_product(
         db: Session,
@@ -68,11 +105,34 @@ class ProductService:
         product = product_repository.create_product(db=db, data=data)
         return product
 
+    @staticmethod
+    def _check_version(product, expected_version: Optional[int]) -> None:
+        """
+        Enforce an If-Match precondition (412 when the client's copy is stale).
+        """
+        if expected_version is not None and product.version != expected_version:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Product has changed since it was read (If-Match does not match).",
+            )
+
+    @staticmethod
+    def _concurrent_write_conflict(db: Session) -> HTTPException:
+        """
+        Map a lost optimistic-locking race (StaleDataError) to 409.
+        """
+        db.rollback()
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Product was modified concurrently; reload it and retry.",
+        )
+
     @staticmethod
     def update_product(
         db: Session,
         product_id: int,
         data: ProductUpdate,
+        expected_version: Optional[int] = None,
     ) -> ProductRead:
         product = product_repository.get_product(db=db, product_id=product_id)
         if not product:
@@ -80,14 +140,19 @@ class ProductService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Product not found.",
             )
+        ProductService._check_version(product, expected_version)
 
-        updated = product_repository.update_product(db=db, product=product, data=data)
+        try:
+            updated = product_repository.update_product(db=db, product=product, data=data)
+        except StaleDataError:
+            raise ProductService._concurrent_write_conflict(db)
         return updated
 
     @staticmethod
     def delete_product(
         db: Session,
         product_id: int,
+        expected_version: Optional[int] = None,
     ) -> None:
         product = product_repository.get_product(db=db, product_id=product_id)
         if not product:
@@ -95,8 +160,13 @@ class ProductService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Product not found.",
             )
+        ProductService._check_version(product, expected_version)
 
-        product_repository.delete_product(db=db, product=product)
+        try:
+            product_repository.delete_product(db=db, product=product)
+        except StaleDataError:
+            raise ProductService._concurrent_write_conflict(db)
+        ContentReuseService.forget_product(product_id)
         # برنمی‌گردونیم چیزی؛ Router می‌تونه status 204 بده
         return None
     @staticmethod
@@ -127,18 +197,75 @@ class ProductService:
         # FastAPI / Pydantic will handle conversion to AIContentRead via response_model
         return ai_contents
     @staticmethod
+    def get_ai_content_stats_for_product(
+        db: Session,
+        product_id: int,
+    ) -> List[AIContentStatsRead]:
+        """
+        Return generation / approval counts for one product, per channel, content_type and model.
+        """
+        product = product_repository.get_product(db=db, product_id=product_id)
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found.",
+            )
+
+        return ai_content_stats_repository.get_stats(db=db, product_id=product_id)
+
+    @staticmethod
+    def _call_ai_provider(request: GenerationRequest) -> GenerationResult:
+        """
+        Call the configured AI provider and map provider failures to HTTP errors.
+        """
+        return ProductService._call_ai_provider_many([request])[0]
+
+    @staticmethod
+    def _call_ai_provider_many(requests: List[GenerationRequest]) -> List[GenerationResult]:
+        """
+        Run several provider calls concurrently (results keep the input order).
+        """
+        provider = get_ai_provider()
+        try:
+            return ai_runtime.run_sync(ai_runtime.gather, provider.generate, requests)
+        except AIProviderTimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="AI provider timed out.",
+            )
+        except AIProviderError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"AI provider failed: {exc}",
+            )
+
+    @staticmethod
+    def _generation_metrics(result: GenerationResult) -> GenerationMetrics:
+        """
+        Metrics stored alongside the AI content of a provider result.
+        """
+        return GenerationMetrics(
+            prompt_tokens=result.prompt_tokens,
+            completion_tokens=result.completion_tokens,
+            wall_time_ms=result.wall_time_ms,
+            provider_latency_ms=result.latency_ms,
+            retries=result.retries,
+        )
+
+    @staticmethod
     def generate_ebay_listing(
         db: Session,
         product_id: int,
-        model_name: str = "gpt-5.1",
+        model_name: Optional[str] = None,
+        reuse_similar: bool = False,
     ) -> AIContentRead:
         """
         Generate an eBay listing for a given product using AI and store it in ai_contents.
 
         Steps:
         - Load product from DB.
-        - Build prompt from product fields.
-        - Call AI model (OpenAI).
+        - With reuse_similar, adapt an approved listing of a similar product if there is one.
+        - Otherwise build prompt from product fields and call the configured AI provider.
         - Store result in ai_contents.
         - Return created AIContent.
         """
@@ -149,28 +276,99 @@ class ProductService:
                 detail="Product not found.",
             )
 
-        # TODO: build prompt from product UPM data
-        # prompt = build_ebay_prompt(product)
+        if reuse_similar:
+            reused = ContentReuseService.reuse_contents(db=db, product=product, targets=[("ebay", "full_listing")])
+            if reused:
+                return ai_content_repository.create_ai_content(db=db, data=reused[("ebay", "full_listing")])
 
-        # TODO: call OpenAI and get structured payload
-        # ai_result_payload = call_openai_for_ebay(prompt, model_name=model_name)
-
-        # Temporary placeholder payload (until AI integration is wired)
-        ai_result_payload = {
-            "title": f"[DEMO] eBay title for product #{product.id}",
-            "subtitle": "Demo subtitle generated by AI.",
-            "description_html": "<p>This is a demo eBay listing description.</p>",
-            "seo_keywords": ["demo", "ebay", "ai"],
-        }
+        request = GenerationRequest(
+            prompt=build_prompt(product, channel="ebay", content_type="full_listing"),
+            channel="ebay",
+            content_type="full_listing",
+            model=model_name or settings.AI_DEFAULT_MODEL,
+            product_id=product.id,
+        )
+        result = ProductService._call_ai_provider(request)
 
         ai_content_create = AIContentCreate(
             product_id=product.id,
             channel="ebay",
             content_type="full_listing",
-            payload=ai_result_payload,
+            payload=result.payload,
             approved=False,
-            last_model_used=model_name,
+            last_model_used=result.model,
+            metrics=ProductService._generation_metrics(result),
         )
 
         ai_content = ai_content_repository.create_ai_content(db=db, data=ai_content_create)
         return ai_content
+
+    @staticmethod
+    def generate_contents(
+        db: Session,
+        product_id: int,
+        targets: List[GenerationTarget],
+        model_name: Optional[str] = None,
+        reuse_similar: bool = False,
+    ) -> List[AIContentRead]:
+        """
+        Generate AI content for several (channel, content_type) targets at once.
+
+        Steps:
+        - Load product from DB once.
+        - With reuse_similar, adapt approved contents of similar products where possible.
+        - Build one prompt per remaining target.
+        - Call the AI provider for those targets concurrently.
+        - Store every result in ai_contents in one transaction.
+        """
+        product = product_repository.get_product(db=db, product_id=product_id)
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found.",
+            )
+
+        # Drop duplicate targets but keep the requested order
+        unique_targets = list(
+            {(t.channel, t.content_type): t for t in targets}.values()
+        )
+
+        reused = {}
+        if reuse_similar:
+            reused = ContentReuseService.reuse_contents(
+                db=db,
+                product=product,
+                targets=[(t.channel, t.content_type) for t in unique_targets],
+            )
+
+        model = model_name or settings.AI_DEFAULT_MODEL
+        requests = [
+            GenerationRequest(
+                prompt=build_prompt(product, channel=t.channel, content_type=t.content_type),
+                channel=t.channel,
+                content_type=t.content_type,
+                model=model,
+                product_id=product.id,
+            )
+            for t in unique_targets
+            if (t.channel, t.content_type) not in reused
+        ]
+        results = ProductService._call_ai_provider_many(requests) if requests else []
+
+        generated = {
+            (request.channel, request.content_type): AIContentCreate(
+                product_id=product.id,
+                channel=request.channel,
+                content_type=request.content_type,
+                payload=result.payload,
+                approved=False,
+                last_model_used=result.model,
+                metrics=ProductService._generation_metrics(result),
+            )
+            for request, result in zip(requests, results)
+        }
+        items = [
+            reused.get((t.channel, t.content_type)) or generated[(t.channel, t.content_type)]
+            for t in unique_targets
+        ]
+        return ai_content_repository.create_ai_contents(db=db, items=items)
@@ -0,0 +1,37 @@
+"""
+Prompt builders for AI content generation.
+
+Responsibilities:
+- Turn a Product into a provider-agnostic text prompt for a given
+  channel / content_type.
+- Describe the JSON shape the model must return (matches PAYLOAD_SCHEMAS).
+"""
+
+from app.domain.models.product import Product
+
+# JSON shape instructions per content_type (see PAYLOAD_SCHEMAS)
+OUTPUT_FORMATS = {
+    "full_listing": (
+        '{"title": str, "subtitle": str, "description_html": str, "seo_keywords": [str]}'
+    ),
+    "title": '{"title": str}',
+    "description": '{"description_html": str}',
+    "caption": '{"caption": str, "hashtags": [str]}',
+}
+
+
+def build_prompt(product: Product, channel: str, content_type: str) -> str:
+    """
+    Build the generation prompt for a product on a channel.
+    """
+    output_format = OUTPUT_FORMATS.get(content_type, "a JSON object")
+    lines = [
+        f"Write {content_type.replace('_', ' ')} content for the '{channel}' sales channel.",
+        f"Product name: {product.name}",
+    ]
+    if product.sku:
+        lines.append(f"SKU: {product.sku}")
+    if product.price is not None:
+        lines.append(f"Price: {product.price}")
+    lines.append(f"Return JSON with this shape: {output_format}")
+    return "\n".join(lines)
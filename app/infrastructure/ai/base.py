@@ -0,0 +1,90 @@
+"""
+AI provider abstraction.
+
+Responsibilities:
+- Define the request/result shapes exchanged with AI providers.
+- Define the AIProvider interface every concrete provider implements.
+- Define provider errors so the service layer can map them to HTTP errors.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+class AIProviderError(Exception):
+    """Raised when an AI provider call fails."""
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class AIProviderTimeoutError(AIProviderError):
+    """Raised when an AI provider call exceeds its timeout."""
+
+    def __init__(self, message: str = "AI provider call timed out."):
+        super().__init__(message, retryable=True)
+
+
+class AIPayloadValidationError(AIProviderError):
+    """Raised when the provider returns a payload that does not match the expected schema."""
+
+    def __init__(self, message: str):
+        super().__init__(message, retryable=True)
+
+
+@dataclass
+class GenerationRequest:
+    """
+    A single generation call.
+
+    The prompt is built by the service layer; channel/content_type decide
+    which payload schema the result is validated against.
+    """
+    prompt: str
+    channel: str
+    content_type: str
+    model: str
+    product_id: Optional[int] = None
+    timeout_seconds: Optional[float] = None
+
+
+@dataclass
+class GenerationResult:
+    """
+    Validated AI output plus the bookkeeping of how it was produced.
+    """
+    payload: Dict[str, Any]
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+    retries: int = 0
+    # Whole generate() call: every attempt plus backoff (latency_ms is the last attempt)
+    wall_time_ms: float = 0.0
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+
+class AIProvider(ABC):
+    """
+    Interface for AI providers (OpenAI, local fake, ...).
+
+    Implementations perform exactly one attempt per `generate_once` call;
+    timeouts, retries and validation are handled by `generate`.
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    async def generate_once(self, request: GenerationRequest) -> GenerationResult:
+        """Perform a single provider call and return the raw (unvalidated) result."""
+
+    async def generate(self, request: GenerationRequest) -> GenerationResult:
+        """
+        Generate content with per-call timeout, bounded retries and payload validation.
+        """
+        # Imported here to avoid a circular import (retry uses the error types above)
+        from app.infrastructure.ai.retry import call_with_retries
+
+        return await call_with_retries(self, request)
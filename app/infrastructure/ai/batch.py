@@ -0,0 +1,350 @@
+"""
+Batch-mode AI generation.
+
+Responsibilities:
+- Write generation requests to JSONL batch files (OpenAI Batch API format).
+- Submit batch files through a BatchProvider and poll their status (all
+  submitted batches together).
+- Parse batch output files back into validated GenerationResults.
+
+Providers:
+- OpenAIBatchProvider: uploads the file and uses the OpenAI Batch API.
+- LocalBatchProvider: offline stand-in that processes the file with any
+  AIProvider (e.g. FakeAIProvider) and writes output / error files in the same format.
+"""
+
+import json
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import anyio
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.domain.schemas.ai_content import validate_payload
+from app.infrastructure.ai import runtime as ai_runtime
+from app.infrastructure.ai.base import (
+    AIPayloadValidationError,
+    AIProvider,
+    AIProviderError,
+    GenerationRequest,
+    GenerationResult,
+)
+from app.infrastructure.ai.factory import get_ai_provider
+from app.infrastructure.ai.openai_provider import OpenAIProvider
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+
+@dataclass
+class BatchStatus:
+    """Provider-side state of a submitted batch."""
+    batch_id: str
+    status: str  # validating / in_progress / completed / failed / expired / cancelled
+    output_location: Optional[str] = None
+    # Failed requests are reported in a separate error file (same line format)
+    error_location: Optional[str] = None
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in {"completed", "failed", "expired", "cancelled"}
+
+
+def make_custom_id(request: GenerationRequest) -> str:
+    """Encode product/channel/content_type so results can be matched back."""
+    return f"{request.product_id}:{request.channel}:{request.content_type}"
+
+
+def parse_custom_id(custom_id: str) -> Tuple[int, str, str]:
+    """Inverse of make_custom_id."""
+    product_id, channel, content_type = custom_id.split(":", 2)
+    return int(product_id), channel, content_type
+
+
+def write_batch_file(path: str, requests: Iterable[GenerationRequest]) -> int:
+    """
+    Write requests to `path` as JSONL batch lines. Returns the number of lines written.
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as fh:
+        for request in requests:
+            line = {
+                "custom_id": make_custom_id(request),
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": OpenAIProvider.build_body(request),
+            }
+            fh.write(json.dumps(line, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def read_batch_results(
+    path: str,
+) -> Iterator[Tuple[str, Union[GenerationResult, AIProviderError]]]:
+    """
+    Yield (custom_id, result-or-error) for every line of a batch output file.
+
+    Payloads are validated against their content_type schema; invalid lines
+    yield an AIPayloadValidationError instead of raising.
+    """
+    with open(path, "r", encoding="utf-8") as fh:
+        for raw_line in fh:
+            if not raw_line.strip():
+                continue
+            line = json.loads(raw_line)
+            custom_id = line["custom_id"]
+            _, _, content_type = parse_custom_id(custom_id)
+
+            response = line.get("response") or {}
+            if line.get("error") or response.get("status_code") != 200:
+                yield custom_id, AIProviderError(f"Batch item failed: {line.get('error') or response}")
+                continue
+
+            body = response["body"]
+            try:
+                result = OpenAIProvider.parse_completion(body, body.get("model", ""))
+                result.payload = validate_payload(content_type, result.payload)
+            except AIProviderError as exc:
+                yield custom_id, exc
+                continue
+            except ValidationError as exc:
+                yield custom_id, AIPayloadValidationError(str(exc))
+                continue
+            yield custom_id, result
+
+
+class BatchProvider(ABC):
+    """Interface for providers that accept whole batch files."""
+
+    @abstractmethod
+    def submit(self, input_path: str) -> BatchStatus:
+        """Submit a batch file and return its initial status."""
+
+    @abstractmethod
+    def get_status(self, batch_id: str) -> BatchStatus:
+        """Return the current status of a submitted batch."""
+
+    @abstractmethod
+    def download_results(self, status: BatchStatus, output_path: str) -> str:
+        """Store the batch output file locally and return its path."""
+
+    @abstractmethod
+    def download_errors(self, status: BatchStatus, error_path: str) -> Optional[str]:
+        """Store the batch error file locally; None when the batch has none."""
+
+    def wait_all(
+        self,
+        batch_ids: List[str],
+        poll_interval: float,
+        timeout: Optional[float] = None,
+    ) -> Iterator[BatchStatus]:
+        """
+        Poll all batches together and yield each one as soon as it finishes.
+
+        Raises TimeoutError for the batches still running after `timeout` seconds.
+        """
+        started = time.monotonic()
+        pending = list(batch_ids)
+        while pending:
+            for batch_id in list(pending):
+                status = self.get_status(batch_id)
+                if status.is_finished:
+                    pending.remove(batch_id)
+                    yield status
+            if not pending:
+                return
+            if timeout is not None and time.monotonic() - started > timeout:
+                raise TimeoutError(f"Batches {', '.join(pending)} did not finish within {timeout}s.")
+            time.sleep(poll_interval)
+
+
+class OpenAIBatchProvider(BatchProvider):
+    """BatchProvider backed by the OpenAI Files + Batches APIs."""
+
+    def __init__(self, api_key: str, base_url: str):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+
+    @property
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    async def _request(self, method: str, path: str, **kwargs):
+        client = ai_runtime.get_http_client()
+        response = await client.request(method, f"{self.base_url}{path}", headers=self._headers, **kwargs)
+        if response.status_code >= 400:
+            raise AIProviderError(f"OpenAI batch API returned HTTP {response.status_code}: {response.text[:200]}")
+        return response
+
+    def _status_from(self, data: dict) -> BatchStatus:
+        counts = data.get("request_counts") or {}
+        return BatchStatus(
+            batch_id=data["id"],
+            status=data["status"],
+            output_location=data.get("output_file_id"),
+            error_location=data.get("error_file_id"),
+            total=counts.get("total", 0),
+            completed=counts.get("completed", 0),
+            failed=counts.get("failed", 0),
+        )
+
+    async def _submit(self, input_path: str) -> BatchStatus:
+        with open(input_path, "rb") as fh:
+            upload = await self._request(
+                "POST",
+                "/files",
+                data={"purpose": "batch"},
+                files={"file": (os.path.basename(input_path), fh.read(), "application/jsonl")},
+            )
+        batch = await self._request(
+            "POST",
+            "/batches",
+            json={
+                "input_file_id": upload.json()["id"],
+                "endpoint": BATCH_ENDPOINT,
+                "completion_window": "24h",
+            },
+        )
+        return self._status_from(batch.json())
+
+    async def _get_status(self, batch_id: str) -> BatchStatus:
+        response = await self._request("GET", f"/batches/{batch_id}")
+        return self._status_from(response.json())
+
+    async def _download(self, file_id: str, output_path: str) -> str:
+        response = await self._request("GET", f"/files/{file_id}/content")
+        with open(output_path, "wb") as fh:
+            fh.write(response.content)
+        return output_path
+
+    def submit(self, input_path: str) -> BatchStatus:
+        return ai_runtime.run_sync(self._submit, input_path)
+
+    def get_status(self, batch_id: str) -> BatchStatus:
+        return ai_runtime.run_sync(self._get_status, batch_id)
+
+    def download_results(self, status: BatchStatus, output_path: str) -> str:
+        if not status.output_location:
+            raise AIProviderError(f"Batch {status.batch_id} has no output file.")
+        return ai_runtime.run_sync(self._download, status.output_location, output_path)
+
+    def download_errors(self, status: BatchStatus, error_path: str) -> Optional[str]:
+        if not status.error_location:
+            return None
+        return ai_runtime.run_sync(self._download, status.error_location, error_path)
+
+
+class LocalBatchProvider(BatchProvider):
+    """
+    Offline stand-in for a provider batch API.
+
+    `submit` processes the whole input file with the given AIProvider
+    (bounded concurrency) and writes output and error files in the OpenAI
+    batch format, so the rest of the pipeline is exercised unchanged.
+    """
+
+    def __init__(self, provider: AIProvider, work_dir: str, concurrency: int = 16):
+        self.provider = provider
+        self.work_dir = work_dir
+        self.concurrency = concurrency
+        self._batches: Dict[str, BatchStatus] = {}
+
+    async def _process_line(self, line: dict, limiter: anyio.CapacityLimiter) -> dict:
+        product_id, channel, content_type = parse_custom_id(line["custom_id"])
+        body = line["body"]
+        request = GenerationRequest(
+            prompt=body["messages"][-1]["content"],
+            channel=channel,
+            content_type=content_type,
+            model=body["model"],
+            product_id=product_id,
+        )
+        async with limiter:
+            try:
+                result = await self.provider.generate(request)
+            except AIProviderError as exc:
+                return {"custom_id": line["custom_id"], "response": None, "error": {"message": str(exc)}}
+
+        completion = {
+            "model": result.model,
+            "choices": [{"message": {"role": "assistant", "content": json.dumps(result.payload)}}],
+            "usage": {
+                "prompt_tokens": result.prompt_tokens,
+                "completion_tokens": result.completion_tokens,
+            },
+        }
+        return {
+            "custom_id": line["custom_id"],
+            "response": {"status_code": 200, "body": completion},
+            "error": None,
+        }
+
+    async def _process_file(self, input_path: str, output_path: str, error_path: str) -> Tuple[int, int]:
+        with open(input_path, "r", encoding="utf-8") as fh:
+            lines = [json.loads(raw) for raw in fh if raw.strip()]
+
+        limiter = anyio.CapacityLimiter(self.concurrency)
+        outputs = await ai_runtime.gather(lambda line: self._process_line(line, limiter), lines)
+
+        failed = 0
+        with open(output_path, "w", encoding="utf-8") as out, open(error_path, "w", encoding="utf-8") as err:
+            for output in outputs:
+                failed += bool(output["error"])
+                (err if output["error"] else out).write(json.dumps(output, ensure_ascii=False) + "\n")
+        return len(outputs), failed
+
+    def submit(self, input_path: str) -> BatchStatus:
+        batch_id = f"local_batch_{uuid.uuid4().hex[:12]}"
+        output_path = os.path.join(self.work_dir, f"{batch_id}_output.jsonl")
+        error_path = os.path.join(self.work_dir, f"{batch_id}_errors.jsonl")
+        total, failed = ai_runtime.run_sync(self._process_file, input_path, output_path, error_path)
+
+        status = BatchStatus(
+            batch_id=batch_id,
+            status="completed",
+            output_location=output_path,
+            error_location=error_path if failed else None,
+            total=total,
+            completed=total - failed,
+            failed=failed,
+        )
+        self._batches[batch_id] = status
+        return status
+
+    def get_status(self, batch_id: str) -> BatchStatus:
+        return self._batches[batch_id]
+
+    def download_results(self, status: BatchStatus, output_path: str) -> str:
+        if status.output_location != output_path:
+            os.replace(status.output_location, output_path)
+            status.output_location = output_path
+        return output_path
+
+    def download_errors(self, status: BatchStatus, error_path: str) -> Optional[str]:
+        if not status.error_location:
+            return None
+        if status.error_location != error_path:
+            os.replace(status.error_location, error_path)
+            status.error_location = error_path
+        return error_path
+
+
+def get_batch_provider(name: str, work_dir: str) -> BatchProvider:
+    """Create a batch provider by name ('openai' or 'local')."""
+    if name == "openai":
+        return OpenAIBatchProvider(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+    if name == "local":
+        return LocalBatchProvider(
+            provider=get_ai_provider(),
+            work_dir=work_dir,
+            concurrency=settings.AI_BATCH_LOCAL_CONCURRENCY,
+        )
+    raise ValueError(f"Unknown batch provider: {name!r}")
@@ -0,0 +1,107 @@
+"""
+Local product embeddings (no external service).
+
+Responsibilities:
+- Turn a product's name / SKU / price into weighted text features.
+- Hash the features into a fixed-size, L2-normalized float32 vector
+  (hashing vectorizer: there is no vocabulary to fit, store or migrate).
+- Serialize vectors for storage in product_embeddings.
+
+Variants of one product (size / color) share most name words, character
+n-grams and SKU prefixes, so their vectors end up close in cosine distance.
+"""
+
+import hashlib
+import math
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.domain.models.product import Product
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Feature weights (relative; the vector is normalized afterwards)
+_WORD_WEIGHT = 1.0
+_BIGRAM_WEIGHT = 0.5
+_CHAR_NGRAM_WEIGHT = 0.25
+_SKU_PREFIX_WEIGHT = 1.0
+_PRICE_WEIGHT = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens (letters and digits)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def product_features(name: str, sku: Optional[str] = None, price: Optional[float] = None) -> Dict[str, float]:
+    """
+    Weighted features of a product:
+    - name words, word bigrams and character trigrams (typo / plural tolerant),
+    - SKU prefixes (`TS-RED-M` -> `ts`, `ts-red`, `ts-red-m`),
+    - a coarse price bucket (powers of two).
+    """
+    features: Dict[str, float] = defaultdict(float)
+
+    words = tokenize(name)
+    for word in words:
+        features[f"w:{word}"] += _WORD_WEIGHT
+        padded = f" {word} "
+        for start in range(len(padded) - 2):
+            features[f"c:{padded[start:start + 3]}"] += _CHAR_NGRAM_WEIGHT
+    for first, second in zip(words, words[1:]):
+        features[f"b:{first} {second}"] += _BIGRAM_WEIGHT
+
+    parts = tokenize(sku or "")
+    for end in range(1, len(parts) + 1):
+        features[f"s:{'-'.join(parts[:end])}"] += _SKU_PREFIX_WEIGHT
+
+    if price is not None and price > 0:
+        features[f"p:{round(math.log2(price))}"] += _PRICE_WEIGHT
+
+    return features
+
+
+def embed_features(features: Dict[str, float], dims: int) -> np.ndarray:
+    """
+    Hash features into a `dims`-sized vector (signed hashing trick) and L2-normalize it.
+    """
+    vector = np.zeros(dims, dtype=np.float32)
+    for feature, weight in features.items():
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        # Low bits pick the slot, the top bit the sign (collisions cancel out on average)
+        vector[value % dims] += weight if value >> 63 else -weight
+
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+def embedding_text(product: Product) -> str:
+    """The product fields an embedding is computed from, as one string."""
+    price = "" if product.price is None else str(product.price)
+    return "\x1f".join((product.name or "", product.sku or "", price))
+
+
+def text_hash(product: Product) -> str:
+    """SHA-256 of `embedding_text`; an unchanged hash means the embedding is current."""
+    return hashlib.sha256(embedding_text(product).encode("utf-8")).hexdigest()
+
+
+def embed_product(product: Product, dims: int) -> np.ndarray:
+    """Embedding of one product."""
+    price = None if product.price is None else float(product.price)
+    return embed_features(product_features(product.name or "", product.sku, price), dims)
+
+
+def to_bytes(vector: np.ndarray) -> bytes:
+    """Serialize a vector as little-endian float32."""
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def from_bytes(data: bytes, dims: int) -> np.ndarray:
+    """Deserialize a vector written by `to_bytes`."""
+    return np.frombuffer(data, dtype="<f4", count=dims).astype(np.float32)
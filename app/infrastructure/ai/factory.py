@@ -0,0 +1,45 @@
+"""
+AI provider factory.
+
+Responsibilities:
+- Build the configured AIProvider once per process (settings.AI_PROVIDER).
+- Allow tests / benchmarks to swap in another provider.
+"""
+
+from typing import Optional
+
+from app.core.config import settings
+from app.infrastructure.ai.base import AIProvider
+from app.infrastructure.ai.fake_provider import FakeAIProvider
+from app.infrastructure.ai.openai_provider import OpenAIProvider
+
+_provider: Optional[AIProvider] = None
+
+
+def build_provider(name: str) -> AIProvider:
+    """Create a provider by name ('openai' or 'fake')."""
+    if name == "openai":
+        return OpenAIProvider(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+    if name == "fake":
+        return FakeAIProvider(
+            latency_ms=settings.FAKE_AI_LATENCY_MS,
+            jitter_ms=settings.FAKE_AI_JITTER_MS,
+            error_rate=settings.FAKE_AI_ERROR_RATE,
+            timeout_rate=settings.FAKE_AI_TIMEOUT_RATE,
+            seed=settings.FAKE_AI_SEED,
+        )
+    raise ValueError(f"Unknown AI provider: {name!r}")
+
+
+def get_ai_provider() -> AIProvider:
+    """Return the process-wide AI provider."""
+    global _provider
+    if _provider is None:
+        _provider = build_provider(settings.AI_PROVIDER)
+    return _provider
+
+
+def set_ai_provider(provider: Optional[AIProvider]) -> None:
+    """Override the process-wide provider (None resets to settings)."""
+    global _provider
+    _provider = provider
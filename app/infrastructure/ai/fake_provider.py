@@ -0,0 +1,100 @@
+"""
+Deterministic local AI provider.
+
+Responsibilities:
+- Produce schema-valid payloads without any network access.
+- Simulate provider latency, transient errors and timeouts so the
+  generation pipeline can be tested and load-tested offline.
+
+The same request always yields the same payload; latency and error
+injection are driven by a seeded RNG.
+"""
+
+import hashlib
+import random
+import re
+from typing import Any, Dict, Optional
+
+import anyio
+
+from app.infrastructure.ai.base import (
+    AIProvider,
+    AIProviderError,
+    GenerationRequest,
+    GenerationResult,
+)
+
+
+def _digest(request: GenerationRequest) -> str:
+    key = f"{request.model}|{request.channel}|{request.content_type}|{request.prompt}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:8]
+
+
+def _product_name(prompt: str) -> str:
+    match = re.search(r"^Product name: (.+)$", prompt, flags=re.MULTILINE)
+    return match.group(1).strip() if match else "Product"
+
+
+def fake_payload(request: GenerationRequest) -> Dict[str, Any]:
+    """Build a deterministic payload that satisfies the content_type schema."""
+    name = _product_name(request.prompt)
+    tag = _digest(request)
+    channel = request.channel
+
+    if request.content_type == "title":
+        return {"title": f"{name} | {channel} #{tag}"}
+    if request.content_type == "description":
+        return {"description_html": f"<p>{name} for {channel} ({tag}).</p>"}
+    if request.content_type == "caption":
+        return {
+            "caption": f"Meet {name} ✨ ({tag})",
+            "hashtags": [f"#{channel}", "#new", f"#{tag}"],
+        }
+    return {
+        "title": f"{name} | {channel} #{tag}",
+        "subtitle": f"Generated for {channel}.",
+        "description_html": f"<p>{name} for {channel} ({tag}).</p>",
+        "seo_keywords": [name.lower(), channel, tag],
+    }
+
+
+class FakeAIProvider(AIProvider):
+    """AIProvider returning deterministic payloads with configurable latency / faults."""
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        seed: Optional[int] = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self._rng = random.Random(seed)
+
+    async def generate_once(self, request: GenerationRequest) -> GenerationResult:
+        roll = self._rng.random()
+        delay_ms = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+
+        if roll < self.timeout_rate:
+            # Sleep "forever"; the caller's per-call timeout cuts us off
+            await anyio.sleep_forever()
+
+        await anyio.sleep(delay_ms / 1000)
+
+        if roll < self.timeout_rate + self.error_rate:
+            raise AIProviderError("Injected fake provider error.", retryable=True)
+
+        payload = fake_payload(request)
+        return GenerationResult(
+            payload=payload,
+            model=request.model,
+            prompt_tokens=len(request.prompt.split()),
+            completion_tokens=sum(len(str(v).split()) for v in payload.values()),
+            latency_ms=delay_ms,
+        )
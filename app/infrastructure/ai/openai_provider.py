@@ -0,0 +1,110 @@
+"""
+OpenAI provider.
+
+Responsibilities:
+- Call the OpenAI Chat Completions API through the shared pooled client.
+- Translate transport / HTTP failures into AIProviderError types.
+- Extract the JSON payload and token usage from the response.
+"""
+
+import json
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.infrastructure.ai.base import (
+    AIPayloadValidationError,
+    AIProvider,
+    AIProviderError,
+    AIProviderTimeoutError,
+    GenerationRequest,
+    GenerationResult,
+)
+from app.infrastructure.ai.runtime import get_http_client
+
+SYSTEM_PROMPT = (
+    "You are an e-commerce copywriter. "
+    "Always answer with a single JSON object and nothing else."
+)
+
+# Rate limiting and server-side errors are worth another attempt
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class OpenAIProvider(AIProvider):
+    """AIProvider backed by the OpenAI HTTP API."""
+
+    name = "openai"
+
+    def __init__(self, api_key: str, base_url: str):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+
+    @staticmethod
+    def build_body(request: GenerationRequest) -> dict:
+        """Request body for one chat completion (also reused by batch files)."""
+        return {
+            "model": request.model,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": request.prompt},
+            ],
+        }
+
+    @staticmethod
+    def parse_completion(data: dict, model: str) -> GenerationResult:
+        """Turn a chat completion response into a GenerationResult."""
+        try:
+            content = data["choices"][0]["message"]["content"]
+            payload = json.loads(content)
+        except (KeyError, IndexError, TypeError, json.JSONDecodeError) as exc:
+            raise AIPayloadValidationError(f"Malformed completion from OpenAI: {exc}") from exc
+
+        if not isinstance(payload, dict):
+            raise AIPayloadValidationError("OpenAI completion is not a JSON object.")
+
+        usage = data.get("usage") or {}
+        return GenerationResult(
+            payload=payload,
+            model=data.get("model", model),
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            raw=data,
+        )
+
+    async def generate_once(self, request: GenerationRequest) -> GenerationResult:
+        client = get_http_client()
+        timeout = request.timeout_seconds or settings.AI_REQUEST_TIMEOUT_SECONDS
+        started = time.perf_counter()
+
+        try:
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                json=OpenAIProvider.build_body(request),
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=httpx.Timeout(timeout, connect=settings.AI_CONNECT_TIMEOUT_SECONDS),
+            )
+        except httpx.TimeoutException as exc:
+            raise AIProviderTimeoutError() from exc
+        except httpx.TransportError as exc:
+            raise AIProviderError(f"OpenAI transport error: {exc}", retryable=True) from exc
+
+        if response.status_code >= 400:
+            raise AIProviderError(
+                f"OpenAI returned HTTP {response.status_code}: {response.text[:200]}",
+                retryable=response.status_code in RETRYABLE_STATUS_CODES,
+            )
+
+        try:
+            data = response.json()
+        except ValueError as exc:
+            # e.g. an HTML error page from a proxy served with status 200
+            raise AIProviderError(
+                f"OpenAI returned a non-JSON body: {response.text[:200]}", retryable=True
+            ) from exc
+
+        result = OpenAIProvider.parse_completion(data, request.model)
+        result.latency_ms = (time.perf_counter() - started) * 1000
+        return result
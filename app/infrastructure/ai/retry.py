@@ -0,0 +1,76 @@
+"""
+Timeout / retry / validation policy for AI provider calls.
+
+Responsibilities:
+- Bound every attempt with a per-call timeout.
+- Retry retryable failures with exponential backoff and full jitter.
+- Validate the returned payload against the content_type schema.
+"""
+
+import random
+import time
+
+import anyio
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.domain.schemas.ai_content import validate_payload
+from app.infrastructure.ai.base import (
+    AIPayloadValidationError,
+    AIProvider,
+    AIProviderError,
+    AIProviderTimeoutError,
+    GenerationRequest,
+    GenerationResult,
+)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff delay (seconds) for the given retry attempt."""
+    ceiling = min(
+        settings.AI_RETRY_MAX_DELAY_SECONDS,
+        settings.AI_RETRY_BASE_DELAY_SECONDS * (2 ** attempt),
+    )
+    return random.uniform(0, ceiling)
+
+
+async def call_with_retries(
+    provider: AIProvider,
+    request: GenerationRequest,
+) -> GenerationResult:
+    """
+    Call `provider.generate_once` until it succeeds or retries are exhausted.
+
+    Raises the last AIProviderError if every attempt fails.
+    """
+    timeout = request.timeout_seconds or settings.AI_REQUEST_TIMEOUT_SECONDS
+    attempt = 0
+    started = time.perf_counter()
+
+    while True:
+        try:
+            with anyio.fail_after(timeout):
+                result = await provider.generate_once(request)
+
+            try:
+                result.payload = validate_payload(request.content_type, result.payload)
+            except ValidationError as exc:
+                raise AIPayloadValidationError(
+                    f"Invalid '{request.content_type}' payload from {provider.name}: {exc}"
+                ) from exc
+
+            result.retries = attempt
+            result.wall_time_ms = (time.perf_counter() - started) * 1000
+            return result
+
+        except TimeoutError as exc:
+            error: AIProviderError = AIProviderTimeoutError()
+            error.__cause__ = exc
+        except AIProviderError as exc:
+            error = exc
+
+        if not error.retryable or attempt >= settings.AI_MAX_RETRIES:
+            raise error
+
+        await anyio.sleep(backoff_delay(attempt))
+        attempt += 1
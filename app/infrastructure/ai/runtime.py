@@ -0,0 +1,112 @@
+"""
+Shared async runtime for AI provider calls.
+
+Responsibilities:
+- Run a single background event loop (anyio blocking portal) so the sync
+  service layer can await async provider calls.
+- Own one pooled httpx.AsyncClient bound to that loop, so keep-alive
+  connections (and their TLS sessions) are reused across requests.
+- Close both cleanly on application shutdown.
+"""
+
+import threading
+from typing import Any, Awaitable, Callable, List, Optional, TypeVar
+
+import anyio
+import httpx
+from anyio.from_thread import BlockingPortal, start_blocking_portal
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_portal_cm: Optional[Any] = None
+_portal: Optional[BlockingPortal] = None
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_portal() -> BlockingPortal:
+    global _portal_cm, _portal
+    with _lock:
+        if _portal is None:
+            _portal_cm = start_blocking_portal()
+            _portal = _portal_cm.__enter__()
+        return _portal
+
+
+def run_sync(func: Callable[..., Awaitable[T]], *args: Any) -> T:
+    """
+    Run an async function on the shared AI event loop and wait for its result.
+
+    Safe to call from sync code (service layer, FastAPI threadpool, jobs).
+    """
+    return _get_portal().call(func, *args)
+
+
+async def gather(func: Callable[[Any], Awaitable[T]], items: List[Any]) -> List[T]:
+    """
+    Await `func(item)` for every item concurrently and return results in input order.
+
+    If any call fails, the remaining calls are cancelled and the first error
+    is re-raised as is (not wrapped in an ExceptionGroup), so callers can
+    catch AIProviderError directly.
+    """
+    results: List[Optional[T]] = [None] * len(items)
+    errors: List[Exception] = []
+
+    async def _run(index: int, item: Any) -> None:
+        try:
+            results[index] = await func(item)
+        except Exception as exc:
+            errors.append(exc)
+            tg.cancel_scope.cancel()
+
+    async with anyio.create_task_group() as tg:
+        for index, item in enumerate(items):
+            tg.start_soon(_run, index, item)
+
+    if errors:
+        raise errors[0]
+    return results  # type: ignore[return-value]
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared pooled AsyncClient.
+
+    Must be called from coroutines running on the shared loop (via `run_sync`).
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.AI_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(
+                settings.AI_REQUEST_TIMEOUT_SECONDS,
+                connect=settings.AI_CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
+    return _http_client
+
+
+async def _close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def shutdown() -> None:
+    """Close the shared HTTP client and stop the background event loop."""
+    global _portal_cm, _portal
+    with _lock:
+        if _portal is None:
+            return
+        _portal.call(_close_http_client)
+        _portal_cm.__exit__(None, None, None)
+        _portal_cm = None
+        _portal = None
@@ -0,0 +1,148 @@
+"""
+In-memory nearest-neighbour index for product embeddings.
+
+Responsibilities:
+- Hold L2-normalized vectors in one contiguous NumPy matrix and answer
+  cosine top-k queries (one matrix-vector product + argpartition).
+- Support incremental updates (upsert / remove) without a rebuild.
+- Provide the process-wide product index, refreshed from product_embeddings
+  by the service layer.
+
+Exact search is fine at catalog scale (100k x 512 float32 = 200 MB worst
+case, a few ms per query); swap in an ANN library if that stops holding.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+
+class VectorIndex:
+    """
+    Exact cosine-similarity index keyed by integer IDs.
+
+    Upserts and removals are O(1) amortized: the matrix grows by doubling,
+    and a removed row is filled with the last row. Thread-safe.
+    """
+
+    def __init__(self, dims: int, initial_capacity: int = 1024):
+        self.dims = dims
+        self._vectors = np.zeros((initial_capacity, dims), dtype=np.float32)
+        self._keys = np.zeros(initial_capacity, dtype=np.int64)
+        self._rows: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        # Set by the loader: newest product_embeddings.updated_at seen so far
+        self.synced_until: Optional[datetime] = None
+        self.synced_at: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._rows
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._keys)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        vectors = np.zeros((capacity, self.dims), dtype=np.float32)
+        vectors[: len(self._rows)] = self._vectors[: len(self._rows)]
+        keys = np.zeros(capacity, dtype=np.int64)
+        keys[: len(self._rows)] = self._keys[: len(self._rows)]
+        self._vectors, self._keys = vectors, keys
+
+    def upsert(self, key: int, vector: np.ndarray) -> None:
+        """Insert or replace the vector of `key`."""
+        self.upsert_many([(key, vector)])
+
+    def upsert_many(self, items: Iterable[Tuple[int, np.ndarray]]) -> None:
+        """Insert or replace several vectors under one lock."""
+        with self._lock:
+            for key, vector in items:
+                if vector.shape != (self.dims,):
+                    raise ValueError(f"Expected a vector of {self.dims} dims, got {vector.shape}.")
+                row = self._rows.get(key)
+                if row is None:
+                    row = len(self._rows)
+                    self._grow(row + 1)
+                    self._rows[key] = row
+                    self._keys[row] = key
+                self._vectors[row] = vector
+
+    def remove(self, key: int) -> bool:
+        """Remove `key`; returns False if it was not indexed."""
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return False
+            last = len(self._rows)
+            if row != last:
+                moved = int(self._keys[last])
+                self._vectors[row] = self._vectors[last]
+                self._keys[row] = moved
+                self._rows[moved] = row
+            self._vectors[last] = 0.0
+            return True
+
+    def search(
+        self,
+        vector: np.ndarray,
+        k: int = 5,
+        min_score: float = 0.0,
+        exclude: Iterable[int] = (),
+    ) -> List[Tuple[int, float]]:
+        """
+        Return up to `k` (key, cosine similarity) pairs, most similar first,
+        with similarity >= min_score. Keys in `exclude` are skipped.
+        """
+        excluded = set(exclude)
+        with self._lock:
+            count = len(self._rows)
+            if count == 0 or k <= 0:
+                return []
+            scores = self._vectors[:count] @ np.asarray(vector, dtype=np.float32)
+            keys = self._keys[:count].copy()
+
+        # Over-fetch by the number of exclusions so they cannot crowd out results
+        top = min(count, k + len(excluded))
+        candidates = np.argpartition(-scores, top - 1)[:top]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        results: List[Tuple[int, float]] = []
+        for row in candidates:
+            score = float(scores[row])
+            if score < min_score:
+                break
+            key = int(keys[row])
+            if key in excluded:
+                continue
+            results.append((key, score))
+            if len(results) >= k:
+                break
+        return results
+
+
+_product_index: Optional[VectorIndex] = None
+_product_index_lock = threading.Lock()
+
+
+def get_product_index() -> VectorIndex:
+    """Return the process-wide product embedding index (empty until synced)."""
+    global _product_index
+    with _product_index_lock:
+        if _product_index is None:
+            _product_index = VectorIndex(dims=settings.EMBEDDING_DIMS)
+        return _product_index
+
+
+def set_product_index(index: Optional[VectorIndex]) -> None:
+    """Override the process-wide index (None resets it; the next sync reloads everything)."""
+    global _product_index
+    with _product_index_lock:
+        _product_index = index
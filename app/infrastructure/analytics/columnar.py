@@ -0,0 +1,69 @@
+"""
+Compressed columnar files for analytics snapshots.
+
+Responsibilities:
+- Write a table (dict of equally long NumPy columns) as Parquet (zstd) when
+  pyarrow is installed, otherwise as a compressed NumPy archive (.npz).
+- Read selected columns back as NumPy arrays, whichever format was used.
+
+Column types are limited to what both formats store natively: int64,
+float64, bool, datetime64[us] (UTC) and unicode strings. No pickling.
+"""
+
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:  # optional dependency
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on environment
+    pa = None
+    pq = None
+
+Columns = Dict[str, np.ndarray]
+
+FILE_SUFFIXES = {"parquet": ".parquet", "npz": ".npz"}
+
+
+def default_format() -> str:
+    """'parquet' when pyarrow is installed, else 'npz'."""
+    return "parquet" if pa is not None else "npz"
+
+
+def write_columns(path_without_suffix: str, columns: Columns, fmt: Optional[str] = None) -> str:
+    """
+    Write columns to `<path_without_suffix>.<parquet|npz>` atomically.
+
+    Returns the path written.
+    """
+    fmt = fmt or default_format()
+    if fmt == "parquet" and pa is None:
+        raise RuntimeError("Parquet snapshots need the optional 'pyarrow' package.")
+    if fmt not in FILE_SUFFIXES:
+        raise ValueError(f"Unknown snapshot format: {fmt!r}")
+
+    path = path_without_suffix + FILE_SUFFIXES[fmt]
+    tmp_path = path + ".tmp"
+    if fmt == "parquet":
+        table = pa.table({name: pa.array(values) for name, values in columns.items()})
+        pq.write_table(table, tmp_path, compression="zstd")
+    else:
+        with open(tmp_path, "wb") as fh:
+            np.savez_compressed(fh, **columns)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_columns(path: str, columns: Optional[List[str]] = None) -> Columns:
+    """Read (a subset of) the columns of a file written by `write_columns`."""
+    if path.endswith(FILE_SUFFIXES["parquet"]):
+        if pq is None:
+            raise RuntimeError("Reading Parquet snapshots needs the optional 'pyarrow' package.")
+        table = pq.read_table(path, columns=columns)
+        return {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+
+    with np.load(path, allow_pickle=False) as archive:
+        names = columns if columns is not None else list(archive.files)
+        return {name: archive[name] for name in names}
@@ -0,0 +1,177 @@
+"""
+Analytics snapshot directory: manifest and local query helpers.
+
+Layout:
+    <dir>/manifest.json                  format, ai_contents watermark, part list
+    <dir>/products.<ext>                 full snapshot, rewritten by every export
+    <dir>/ai_contents/part-00000.<ext>   append-only parts, one or more per export
+
+Responsibilities:
+- Load / save the manifest atomically.
+- Read a table back as NumPy columns, skipping ai_contents parts outside a
+  created_at range (the manifest keeps each part's min / max created_at).
+- Filter and group columns in memory (counts, sums, means) for quick local
+  analysis without touching the primary database.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.infrastructure.analytics.columnar import Columns, read_columns
+
+MANIFEST_FILE = "manifest.json"
+PARTITIONED_TABLES = ("ai_contents",)
+
+
+def load_manifest(snapshot_dir: str) -> Optional[Dict[str, Any]]:
+    """Return the manifest of a snapshot directory, or None if there is none yet."""
+    path = os.path.join(snapshot_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_manifest(snapshot_dir: str, manifest: Dict[str, Any]) -> None:
+    """Write the manifest atomically (readers never see a half-written file)."""
+    path = os.path.join(snapshot_dir, MANIFEST_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Aware datetimes -> naive UTC (naive ones are already UTC)."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _as_datetime64(value: datetime) -> np.datetime64:
+    return np.datetime64(utc_naive(value), "us")
+
+
+def _concat(tables: List[Columns]) -> Columns:
+    if not tables:
+        return {}
+    return {name: np.concatenate([table[name] for table in tables]) for name in tables[0]}
+
+
+def read_table(
+    snapshot_dir: str,
+    table: str,
+    columns: Optional[List[str]] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> Columns:
+    """
+    Read a snapshot table as {column: array}.
+
+    For ai_contents, parts entirely outside [created_from, created_to) are not
+    opened; the remaining rows are filtered exactly. Stored datetimes are
+    naive UTC; aware bounds are converted to match.
+    """
+    created_from, created_to = utc_naive(created_from), utc_naive(created_to)
+    manifest = load_manifest(snapshot_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No analytics snapshot in {snapshot_dir!r}.")
+    if table not in manifest["tables"]:
+        raise KeyError(f"Unknown snapshot table: {table!r}")
+
+    wanted = None if columns is None else list(dict.fromkeys(columns + ["created_at"]))
+    entry = manifest["tables"][table]
+    if table not in PARTITIONED_TABLES:
+        data = read_columns(os.path.join(snapshot_dir, entry["file"]), wanted)
+    else:
+        parts = []
+        for part in entry["parts"]:
+            if created_from is not None and utc_naive(datetime.fromisoformat(part["max_created_at"])) < created_from:
+                continue
+            if created_to is not None and utc_naive(datetime.fromisoformat(part["min_created_at"])) >= created_to:
+                continue
+            parts.append(read_columns(os.path.join(snapshot_dir, part["file"]), wanted))
+        data = _concat(parts)
+
+    if data and (created_from is not None or created_to is not None):
+        mask = np.ones(len(data["created_at"]), dtype=bool)
+        if created_from is not None:
+            mask &= data["created_at"] >= _as_datetime64(created_from)
+        if created_to is not None:
+            mask &= data["created_at"] < _as_datetime64(created_to)
+        data = select_rows(data, mask)
+
+    if columns is not None:
+        data = {name: data[name] for name in columns if name in data}
+    return data
+
+
+def select_rows(data: Columns, mask: np.ndarray) -> Columns:
+    """Keep the rows where `mask` is True."""
+    return {name: values[mask] for name, values in data.items()}
+
+
+def where_equal(data: Columns, **conditions: Any) -> Columns:
+    """Keep the rows where every given column equals the given value."""
+    if not data:
+        return data
+    mask = np.ones(len(next(iter(data.values()))), dtype=bool)
+    for name, value in conditions.items():
+        mask &= data[name] == value
+    return select_rows(data, mask)
+
+
+def group_by(
+    data: Columns,
+    keys: List[str],
+    value: Optional[str] = None,
+    agg: str = "count",
+) -> List[Dict[str, Any]]:
+    """
+    Aggregate rows per distinct combination of `keys`.
+
+    agg is 'count', or 'sum' / 'mean' of the numeric column `value`.
+    Returns one dict per group, largest aggregate first.
+    """
+    if agg not in ("count", "sum", "mean"):
+        raise ValueError(f"Unknown aggregate: {agg!r}")
+    if agg != "count" and value is None:
+        raise ValueError(f"'{agg}' needs a value column.")
+    if not keys:
+        raise ValueError("group_by needs at least one key column.")
+    if not data or len(next(iter(data.values()))) == 0:
+        return []
+
+    # Encode each key column, combine the codes, then number the groups that occur
+    uniques, codes = [], []
+    for key in keys:
+        unique, inverse = np.unique(data[key], return_inverse=True)
+        uniques.append(unique)
+        codes.append(inverse.ravel())
+    shape = tuple(len(unique) for unique in uniques)
+    combined, group = np.unique(np.ravel_multi_index(codes, shape), return_inverse=True)
+    group = group.ravel()
+
+    counts = np.bincount(group, minlength=len(combined))
+    if agg != "count":
+        totals = np.bincount(group, weights=np.nan_to_num(data[value].astype(np.float64)), minlength=len(combined))
+        result = totals if agg == "sum" else totals / counts
+
+    rows = []
+    for index, code in enumerate(combined):
+        positions = np.unravel_index(code, shape)
+        row = {key: _python(unique[position]) for key, unique, position in zip(keys, uniques, positions)}
+        row["rows"] = int(counts[index])
+        if agg != "count":
+            row[f"{agg}_{value}"] = float(result[index])
+        rows.append(row)
+    sort_key = "rows" if agg == "count" else f"{agg}_{value}"
+    return sorted(rows, key=lambda row: row[sort_key], reverse=True)
+
+
+def _python(value: Any) -> Any:
+    """NumPy scalar -> plain Python value."""
+    return value.item() if isinstance(value, np.generic) else value
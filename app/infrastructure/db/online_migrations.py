@@ -0,0 +1,377 @@
+"""
+Lock-safe helpers for Alembic migrations on a live database.
+
+Responsibilities:
+- Run DDL with a short lock_timeout and retry it when the lock is not
+  granted, instead of queueing behind long transactions (and blocking
+  every query that arrives after it).
+- Build indexes CONCURRENTLY outside the migration transaction, including
+  on partitioned tables (per partition, then attached to the parent).
+- Backfill columns in throttled keyset batches with progress reporting
+  (plain SQL or a Python function per batch); progress is stored, so an
+  interrupted backfill resumes where it stopped.
+
+Call these from migration upgrade()/downgrade(). On non-PostgreSQL
+databases they fall back to the plain `op` operations.
+"""
+
+import hashlib
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# SQLSTATE raised when lock_timeout expires
+LOCK_NOT_AVAILABLE = "55P03"
+
+PROGRESS_TABLE = "alembic_backfill_progress"
+
+
+def is_lock_timeout(exc: BaseException) -> bool:
+    """True if `exc` is PostgreSQL's lock_not_available error (psycopg2 or psycopg 3)."""
+    orig = getattr(exc, "orig", exc)
+    return LOCK_NOT_AVAILABLE in (getattr(orig, "pgcode", None), getattr(orig, "sqlstate", None))
+
+
+def _is_postgresql(conn: Connection) -> bool:
+    return conn.dialect.name == "postgresql"
+
+
+def _retry_delay(attempt: int) -> float:
+    return min(settings.MIGRATION_LOCK_RETRY_DELAY_SECONDS * (2 ** (attempt - 1)), 60.0)
+
+
+def run_with_lock_retries(
+    func: Callable[[], T],
+    lock_timeout_ms: Optional[int] = None,
+    attempts: Optional[int] = None,
+) -> T:
+    """
+    Run `func` (one or a few DDL operations) inside a SAVEPOINT with a short
+    lock_timeout; on lock timeout roll back to the savepoint, wait and retry.
+
+    For use inside the migration transaction. SET LOCAL would otherwise last
+    until that transaction ends (rolling back to the savepoint only undoes it
+    on failure), so the previous lock_timeout is restored after `func`.
+    """
+    conn = op.get_bind()
+    if not _is_postgresql(conn):
+        return func()
+
+    lock_timeout_ms = lock_timeout_ms or settings.MIGRATION_LOCK_TIMEOUT_MS
+    attempts = attempts or settings.MIGRATION_LOCK_RETRIES
+    previous = conn.execute(text("SHOW lock_timeout")).scalar()
+    for attempt in range(1, attempts + 1):
+        savepoint = conn.begin_nested()
+        try:
+            conn.execute(text(f"SET LOCAL lock_timeout = '{int(lock_timeout_ms)}ms'"))
+            result = func()
+            conn.execute(text("SELECT set_config('lock_timeout', :previous, true)"), {"previous": previous})
+            savepoint.commit()
+            return result
+        except DBAPIError as exc:
+            savepoint.rollback()
+            if not is_lock_timeout(exc) or attempt == attempts:
+                raise
+            delay = _retry_delay(attempt)
+            logger.warning("Lock not granted within %dms (attempt %d/%d), retrying in %.1fs",
+                           lock_timeout_ms, attempt, attempts, delay)
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def _autocommit_with_lock_retries(conn: Connection, statements: List[str], cleanup: Optional[Callable[[], None]] = None) -> None:
+    """Run statements in autocommit mode with a session lock_timeout, retrying on lock timeout."""
+    previous = conn.execute(text("SHOW lock_timeout")).scalar()
+    conn.execute(text(f"SET lock_timeout = '{int(settings.MIGRATION_LOCK_TIMEOUT_MS)}ms'"))
+    try:
+        attempts = settings.MIGRATION_LOCK_RETRIES
+        for attempt in range(1, attempts + 1):
+            try:
+                for statement in statements:
+                    conn.execute(text(statement))
+                return
+            except DBAPIError as exc:
+                if not is_lock_timeout(exc) or attempt == attempts:
+                    raise
+                if cleanup is not None:
+                    cleanup()
+                delay = _retry_delay(attempt)
+                logger.warning("Lock not granted (attempt %d/%d), retrying in %.1fs", attempt, attempts, delay)
+                time.sleep(delay)
+    finally:
+        conn.execute(text("SELECT set_config('lock_timeout', :previous, false)"), {"previous": previous})
+
+
+def _index_sql(index_name: str, table_name: str, columns: List[str], unique: bool, where: Optional[str], concurrently: bool, only: bool = False) -> str:
+    return "CREATE {unique}INDEX {concurrently}IF NOT EXISTS {name} ON {only}{table} ({columns}){where}".format(
+        unique="UNIQUE " if unique else "",
+        concurrently="CONCURRENTLY " if concurrently else "",
+        name=index_name,
+        only="ONLY " if only else "",
+        table=table_name,
+        columns=", ".join(columns),
+        where=f" WHERE {where}" if where else "",
+    )
+
+
+def _drop_if_invalid(conn: Connection, index_name: str) -> None:
+    """Drop an INVALID index left behind by an interrupted CONCURRENTLY build."""
+    invalid = conn.execute(
+        text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid AND c.relkind = 'i'"
+        ),
+        {"name": index_name},
+    ).first()
+    if invalid:
+        logger.info("Dropping invalid index %s from an earlier attempt", index_name)
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+
+
+def create_index_concurrently(
+    index_name: str,
+    table_name: str,
+    columns: List[str],
+    unique: bool = False,
+    where: Optional[str] = None,
+) -> None:
+    """
+    CREATE INDEX CONCURRENTLY outside the migration transaction.
+
+    Re-runnable: an invalid index from a failed attempt is dropped and rebuilt,
+    a valid existing one is kept.
+    """
+    conn = op.get_bind()
+    if not _is_postgresql(conn):
+        op.create_index(index_name, table_name, columns, unique=unique, sqlite_where=text(where) if where else None)
+        return
+
+    with op.get_context().autocommit_block():
+        _drop_if_invalid(conn, index_name)
+        logger.info("Building index %s on %s concurrently", index_name, table_name)
+        _autocommit_with_lock_retries(
+            conn,
+            [_index_sql(index_name, table_name, columns, unique, where, concurrently=True)],
+            cleanup=lambda: _drop_if_invalid(conn, index_name),
+        )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    """DROP INDEX CONCURRENTLY outside the migration transaction."""
+    conn = op.get_bind()
+    if not _is_postgresql(conn):
+        op.drop_index(index_name, table_name=table_name)
+        return
+
+    with op.get_context().autocommit_block():
+        _autocommit_with_lock_retries(conn, [f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"])
+
+
+def _partition_index_name(partition: str, index_name: str) -> str:
+    name = f"{partition}_{index_name}"
+    if len(name) <= 63:
+        return name
+    return f"{name[:54]}_{hashlib.sha1(name.encode()).hexdigest()[:8]}"
+
+
+def create_partitioned_index_concurrently(
+    index_name: str,
+    table_name: str,
+    columns: List[str],
+    unique: bool = False,
+    where: Optional[str] = None,
+) -> None:
+    """
+    Index a partitioned table without blocking writes.
+
+    PostgreSQL cannot build an index CONCURRENTLY on a partitioned table, so:
+    create it ON ONLY the parent (instant, invalid), build each partition's
+    index concurrently, then attach them; the parent index turns valid once
+    every partition is attached. Partitions created later inherit it.
+    Re-runnable at every step.
+    """
+    conn = op.get_bind()
+    if not _is_postgresql(conn):
+        create_index_concurrently(index_name, table_name, columns, unique=unique, where=where)
+        return
+
+    with op.get_context().autocommit_block():
+        _autocommit_with_lock_retries(
+            conn, [_index_sql(index_name, table_name, columns, unique, where, concurrently=False, only=True)]
+        )
+
+        partitions = conn.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"
+            ),
+            {"table": table_name},
+        ).scalars().all()
+
+        for number, partition in enumerate(partitions, start=1):
+            child = _partition_index_name(partition, index_name)
+            attached = conn.execute(
+                text(
+                    "SELECT 1 FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE c.relname = :child AND i.inhparent = CAST(:parent AS regclass)"
+                ),
+                {"child": child, "parent": index_name},
+            ).first()
+            if attached:
+                continue
+
+            _drop_if_invalid(conn, child)
+            logger.info("Building index %s (%d/%d)", child, number, len(partitions))
+            _autocommit_with_lock_retries(
+                conn,
+                [
+                    _index_sql(child, partition, columns, unique, where, concurrently=True),
+                    f"ALTER INDEX {index_name} ATTACH PARTITION {child}",
+                ],
+                cleanup=lambda: _drop_if_invalid(conn, child),
+            )
+
+
+def _load_progress(conn: Connection, name: str) -> Dict[str, Any]:
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} ("
+            "name VARCHAR(200) PRIMARY KEY, last_key BIGINT NOT NULL, "
+            "rows_done BIGINT NOT NULL, updated_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+        )
+    )
+    row = conn.execute(
+        text(f"SELECT last_key, rows_done FROM {PROGRESS_TABLE} WHERE name = :name"), {"name": name}
+    ).first()
+    return {"last_key": row.last_key, "rows_done": row.rows_done} if row else {"last_key": 0, "rows_done": 0}
+
+
+def _save_progress(conn: Connection, name: str, last_key: int, rows_done: int) -> None:
+    conn.execute(
+        text(
+            f"INSERT INTO {PROGRESS_TABLE} (name, last_key, rows_done, updated_at) "
+            "VALUES (:name, :last_key, :rows_done, now()) "
+            "ON CONFLICT (name) DO UPDATE SET last_key = EXCLUDED.last_key, "
+            "rows_done = EXCLUDED.rows_done, updated_at = EXCLUDED.updated_at"
+        ),
+        {"name": name, "last_key": last_key, "rows_done": rows_done},
+    )
+
+
+def _estimate_rows(conn: Connection, table_name: str) -> int:
+    """Planner row estimate of a table (summed over partitions)."""
+    estimate = conn.execute(
+        text(
+            "SELECT COALESCE(sum(GREATEST(c.reltuples, 0)), 0) FROM pg_class c "
+            "WHERE c.oid = CAST(:table AS regclass) "
+            "OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = CAST(:table AS regclass))"
+        ),
+        {"table": table_name},
+    ).scalar()
+    return int(estimate or 0)
+
+
+def process_in_batches(
+    name: str,
+    table_name: str,
+    process: Callable[[Connection, int, int], List[int]],
+    key: str = "id",
+    batch_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None,
+) -> int:
+    """
+    Call `process(conn, last_key, batch_size)` until it returns no keys, one
+    autocommitted batch at a time, for backfills that need Python per row.
+
+    `process` handles the next rows of `table_name` with `key` > last_key
+    (in `key` order, at most batch_size) and returns the keys it handled.
+
+    - Each batch is short, so row locks are held briefly and autovacuum keeps up.
+    - `pause_seconds` between batches throttles the write rate (replicas, I/O).
+    - Progress (last key, rows done) is stored under `name` after every batch
+      and logged with an estimate; re-running resumes after the last batch.
+      `process` must be idempotent (a batch may run twice after a crash).
+
+    Returns the number of rows handled by this run.
+    """
+    conn = op.get_bind()
+    batch_size = batch_size or settings.MIGRATION_BACKFILL_BATCH_SIZE
+    pause_seconds = settings.MIGRATION_BACKFILL_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+
+    with op.get_context().autocommit_block():
+        progress = _load_progress(conn, name) if _is_postgresql(conn) else {"last_key": 0, "rows_done": 0}
+        last_key, rows_done = progress["last_key"], progress["rows_done"]
+        if last_key:
+            logger.info("Backfill %s: resuming after %s=%s (%d rows done)", name, key, last_key, rows_done)
+        estimate = _estimate_rows(conn, table_name) if _is_postgresql(conn) else 0
+
+        updated = 0
+        started = time.monotonic()
+        while True:
+            keys = process(conn, last_key, batch_size)
+            if not keys:
+                break
+
+            last_key = max(keys)
+            updated += len(keys)
+            rows_done += len(keys)
+            if _is_postgresql(conn):
+                _save_progress(conn, name, last_key, rows_done)
+
+            rate = updated / max(time.monotonic() - started, 1e-6)
+            logger.info(
+                "Backfill %s: %d rows (%s), %s=%s, %.0f rows/s",
+                name,
+                rows_done,
+                f"~{min(100.0, 100.0 * rows_done / estimate):.0f}% of table" if estimate else "n/a",
+                key,
+                last_key,
+                rate,
+            )
+            time.sleep(pause_seconds)
+
+        if _is_postgresql(conn):
+            conn.execute(text(f"DELETE FROM {PROGRESS_TABLE} WHERE name = :name"), {"name": name})
+        logger.info("Backfill %s: done, %d rows in %.1fs", name, rows_done, time.monotonic() - started)
+    return updated
+
+
+def backfill_in_batches(
+    name: str,
+    table_name: str,
+    set_sql: str,
+    where_sql: str = "TRUE",
+    key: str = "id",
+    batch_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> int:
+    """
+    UPDATE `table_name` SET `set_sql` for rows matching `where_sql`, in keyset
+    batches on `key` (an integer column); see process_in_batches.
+
+    The update must be idempotent. Returns the number of rows updated by this run.
+    """
+    statement = text(
+        f"UPDATE {table_name} SET {set_sql} WHERE {key} IN ("
+        f"SELECT {key} FROM {table_name} WHERE {key} > :last_key AND ({where_sql}) "
+        f"ORDER BY {key} LIMIT :batch_size) RETURNING {key}"
+    )
+
+    def update_batch(conn: Connection, last_key: int, size: int) -> List[int]:
+        return conn.execute(statement, {**(params or {}), "last_key": last_key, "batch_size": size}).scalars().all()
+
+    return process_in_batches(
+        name, table_name, update_batch, key=key, batch_size=batch_size, pause_seconds=pause_seconds
+    )
@@ -0,0 +1,81 @@
+"""
+Partition maintenance for ai_contents.
+
+Responsibilities:
+- Create upcoming monthly partitions ahead of time (ensure_ai_contents_partitions).
+- Drop monthly partitions that are older than the retention window and empty.
+
+ai_contents is range-partitioned by created_at (see migration 8a8efb5b19c4).
+A DEFAULT partition catches rows for months that were not created in time;
+creating the month later moves those rows into the proper partition.
+"""
+
+from datetime import date, datetime, timezone
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def _month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.month - 1 + months
+    return value.replace(year=value.year + month_index // 12, month=month_index % 12 + 1, day=1)
+
+
+def ensure_ai_contents_partitions(db: Session, months_ahead: int = 3) -> int:
+    """
+    Make sure partitions exist from the current month up to `months_ahead` months ahead.
+
+    Returns the number of partitions created.
+    """
+    start = _month_start(datetime.now(timezone.utc).date())
+    end = _add_months(start, months_ahead + 1)
+    created = db.execute(
+        text("SELECT ensure_ai_contents_partitions(:start, :end)"),
+        {"start": start, "end": end},
+    ).scalar_one()
+    db.commit()
+    return created
+
+
+def drop_empty_ai_contents_partitions(db: Session, older_than: datetime) -> List[str]:
+    """
+    Drop monthly partitions whose whole range ends before `older_than` and that hold no rows.
+
+    Returns the names of the dropped partitions.
+    """
+    rows = db.execute(
+        text(
+            """
+            SELECT child.relname AS name
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = 'ai_contents'
+              AND child.relname ~ '^ai_contents_[0-9]{4}_[0-9]{2}$'
+            ORDER BY child.relname
+            """
+        )
+    ).all()
+
+    cutoff = _month_start(older_than.date())
+    dropped: List[str] = []
+    for row in rows:
+        year, month = int(row.name[-7:-3]), int(row.name[-2:])
+        if _add_months(date(year, month, 1), 1) > cutoff:
+            continue
+
+        has_rows = db.execute(text(f'SELECT EXISTS (SELECT 1 FROM "{row.name}")')).scalar_one()
+        if has_rows:
+            continue
+
+        db.execute(text(f'ALTER TABLE ai_contents DETACH PARTITION "{row.name}"'))
+        db.execute(text(f'DROP TABLE "{row.name}"'))
+        dropped.append(row.name)
+
+    db.commit()
+    return dropped
@@ -0,0 +1,296 @@
+"""
+Shard rebalancing.
+
+Responsibilities:
+- Find products whose owner changes between two shard maps.
+- Copy a product with its AI contents (live and archived), payloads,
+  counters and embedding to its new shard, idempotently.
+- Remove products from shards that no longer own them, once the copy is
+  confirmed on the new owner.
+- Seed the ID allocator above the IDs already in use.
+
+Works on plain Core connections, so it runs against PostgreSQL and SQLite
+shards alike.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import MetaData, Table, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.domain.models.ai_content import AIContent
+from app.domain.models.ai_content_stat import AIContentStat
+from app.domain.models.ai_content_stat_total import AIContentStatTotal
+from app.domain.models.ai_generation_metric import AIGenerationMetric
+from app.domain.models.ai_payload import AIPayload
+from app.domain.models.outbox_event import OutboxEvent
+from app.domain.models.product import Product
+from app.domain.models.product_embedding import ProductEmbedding
+from app.infrastructure.db.sharding import HashRing, IdAllocator
+
+logger = logging.getLogger(__name__)
+
+products = Product.__table__
+ai_contents = AIContent.__table__
+ai_payloads = AIPayload.__table__
+ai_content_stats = AIContentStat.__table__
+ai_content_stat_totals = AIContentStatTotal.__table__
+ai_generation_metrics = AIGenerationMetric.__table__
+product_embeddings = ProductEmbedding.__table__
+
+
+@dataclass
+class MoveSummary:
+    """Counters of one copy / cleanup run."""
+
+    products: int = 0
+    ai_contents: int = 0
+    archived: int = 0
+    skipped: int = 0
+    conflicts: List[int] = field(default_factory=list)
+
+    def add(self, other: "MoveSummary") -> None:
+        self.products += other.products
+        self.ai_contents += other.ai_contents
+        self.archived += other.archived
+        self.skipped += other.skipped
+        self.conflicts.extend(other.conflicts)
+
+
+def _insert(conn: Connection, table: Table):
+    """Dialect insert construct supporting ON CONFLICT."""
+    if conn.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    if conn.dialect.name == "sqlite":
+        return sqlite.insert(table)
+    raise ValueError(f"Unsupported shard dialect: {conn.dialect.name}")
+
+
+def _archive_table(conn: Connection) -> Optional[Table]:
+    """ai_contents_archive (created by migrations only), if this shard has it."""
+    if not inspect(conn).has_table("ai_contents_archive"):
+        return None
+    return Table("ai_contents_archive", MetaData(), autoload_with=conn)
+
+
+def iter_misplaced_product_ids(
+    conn: Connection,
+    shard_id: str,
+    ring: HashRing,
+    batch_size: int = 1000,
+) -> Iterator[List[int]]:
+    """Yield batches of product IDs stored on `shard_id` that `ring` assigns elsewhere."""
+    last_id = 0
+    while True:
+        ids = conn.execute(
+            select(products.c.id)
+            .where(products.c.id > last_id)
+            .order_by(products.c.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            return
+        misplaced = [product_id for product_id in ids if ring.shard_for(product_id) != shard_id]
+        if misplaced:
+            yield misplaced
+        last_id = ids[-1]
+
+
+def _versions(conn: Connection, product_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+    rows = conn.execute(
+        select(products.c.id, products.c.version, products.c.ai_contents_version)
+        .where(products.c.id.in_(product_ids))
+    ).all()
+    return {row.id: (row.version, row.ai_contents_version) for row in rows}
+
+
+def _copy_rows(source: Connection, target: Connection, table: Table, product_ids: List[int], update: List[str]) -> int:
+    rows = [dict(row._mapping) for row in source.execute(select(table).where(table.c.product_id.in_(product_ids)))]
+    if not rows:
+        return 0
+    statement = _insert(target, table).values(rows)
+    keys = [column.name for column in table.primary_key.columns]
+    if update:
+        statement = statement.on_conflict_do_update(
+            index_elements=keys,
+            set_={name: statement.excluded[name] for name in update},
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=keys)
+    target.execute(statement)
+    return len(rows)
+
+
+def _shift_stat_totals(conn: Connection, product_ids: List[int], sign: int) -> None:
+    """Add (sign=1) or subtract (sign=-1) the products' counters to / from the shard's rollup."""
+    stats = ai_content_stats.c
+    slot = (stats.product_id % settings.AI_CONTENT_STAT_TOTAL_SLOTS).label("slot")
+    key = [stats.channel, stats.content_type, stats.last_model_used, slot]
+    rows = conn.execute(
+        select(
+            *key,
+            func.sum(stats.generated_count).label("generated_count"),
+            func.sum(stats.approved_count).label("approved_count"),
+        )
+        .where(stats.product_id.in_(product_ids))
+        .group_by(*key)
+    ).all()
+    if not rows:
+        return
+    now = datetime.utcnow()
+    statement = _insert(conn, ai_content_stat_totals).values(
+        [
+            {
+                "channel": row.channel,
+                "content_type": row.content_type,
+                "last_model_used": row.last_model_used,
+                "slot": row.slot,
+                "generated_count": sign * row.generated_count,
+                "approved_count": sign * row.approved_count,
+                "updated_at": now,
+            }
+            for row in sorted(rows)
+        ]
+    )
+    totals = ai_content_stat_totals.c
+    conn.execute(
+        statement.on_conflict_do_update(
+            index_elements=[totals.channel, totals.content_type, totals.last_model_used, totals.slot],
+            set_={
+                "generated_count": totals.generated_count + statement.excluded.generated_count,
+                "approved_count": totals.approved_count + statement.excluded.approved_count,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+    )
+
+
+def copy_products(source: Engine, target: Engine, product_ids: List[int]) -> MoveSummary:
+    """
+    Copy products (and everything keyed by them) from `source` to `target`.
+
+    Idempotent and safe to re-run: a product is copied only when the source
+    is ahead of the target (both version counters >= target's). Products
+    changed on both sides since the last copy are reported as conflicts and
+    left alone. Everything for one batch is written in one target transaction.
+    """
+    summary = MoveSummary()
+    with source.connect() as src, target.begin() as dst:
+        source_versions = _versions(src, product_ids)
+        target_versions = _versions(dst, product_ids)
+
+        to_copy = []
+        for product_id, versions in source_versions.items():
+            current = target_versions.get(product_id)
+            if current == versions:
+                summary.skipped += 1
+            elif current is None or (versions[0] >= current[0] and versions[1] >= current[1]):
+                to_copy.append(product_id)
+            else:
+                summary.conflicts.append(product_id)
+        if not to_copy:
+            return summary
+
+        product_rows = [dict(row._mapping) for row in src.execute(select(products).where(products.c.id.in_(to_copy)))]
+        statement = _insert(dst, products).values(product_rows)
+        dst.execute(
+            statement.on_conflict_do_update(
+                index_elements=[products.c.id],
+                set_={column.name: statement.excluded[column.name] for column in products.columns if column.name != "id"},
+            )
+        )
+        summary.products = len(product_rows)
+
+        # Payloads first (ai_contents reference them)
+        source_archive, target_archive = _archive_table(src), _archive_table(dst)
+        hash_query = select(ai_contents.c.payload_hash).where(ai_contents.c.product_id.in_(to_copy))
+        if source_archive is not None:
+            hash_query = hash_query.union(
+                select(source_archive.c.payload_hash).where(source_archive.c.product_id.in_(to_copy))
+            )
+        hashes = src.execute(hash_query).scalars().all()
+        if hashes:
+            # Fresh last_referenced_at, and ON CONFLICT DO UPDATE row-locks existing
+            # payloads, so the target's purge job cannot remove them under the copy
+            now = datetime.utcnow()
+            payload_rows = [
+                dict(row._mapping, last_referenced_at=now)
+                for row in src.execute(select(ai_payloads).where(ai_payloads.c.hash.in_(hashes)))
+            ]
+            statement = _insert(dst, ai_payloads).values(payload_rows)
+            dst.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[ai_payloads.c.hash],
+                    set_={"last_referenced_at": statement.excluded.last_referenced_at},
+                )
+            )
+
+        summary.ai_contents = _copy_rows(src, dst, ai_contents, to_copy, update=["approved"])
+        if source_archive is not None and target_archive is not None:
+            summary.archived = _copy_rows(src, dst, target_archive, to_copy, update=[])
+        # Replace the target's earlier copy of these counters in its rollup too
+        _shift_stat_totals(dst, to_copy, sign=-1)
+        _copy_rows(src, dst, ai_content_stats, to_copy, update=["generated_count", "approved_count", "updated_at"])
+        _shift_stat_totals(dst, to_copy, sign=1)
+        _copy_rows(src, dst, product_embeddings, to_copy, update=["dims", "vector", "text_hash", "updated_at"])
+        _copy_rows(src, dst, ai_generation_metrics, to_copy, update=[])
+    return summary
+
+
+def delete_products(engine: Engine, product_ids: List[int]) -> int:
+    """Delete products and their dependent rows from one shard (children first)."""
+    with engine.begin() as conn:
+        archive = _archive_table(conn)
+        _shift_stat_totals(conn, product_ids, sign=-1)
+        for table in (ai_content_stats, ai_generation_metrics, product_embeddings, archive, ai_contents):
+            if table is not None:
+                conn.execute(table.delete().where(table.c.product_id.in_(product_ids)))
+        return conn.execute(products.delete().where(products.c.id.in_(product_ids))).rowcount
+
+
+def cleanup_moved_products(source: Engine, target: Engine, product_ids: List[int]) -> MoveSummary:
+    """
+    Delete products from `source` that `target` now owns, but only those the
+    target already holds at the same or a newer version.
+    """
+    summary = MoveSummary()
+    with source.connect() as src, target.connect() as dst:
+        source_versions = _versions(src, product_ids)
+        target_versions = _versions(dst, product_ids)
+
+    confirmed = []
+    for product_id, versions in source_versions.items():
+        current = target_versions.get(product_id)
+        if current is not None and current[0] >= versions[0] and current[1] >= versions[1]:
+            confirmed.append(product_id)
+        else:
+            summary.conflicts.append(product_id)
+
+    if confirmed:
+        summary.products = delete_products(source, confirmed)
+    return summary
+
+
+def seed_id_floors(engines: List[Engine], allocator: IdAllocator) -> Dict[str, int]:
+    """Move the allocator past every ID already used on any shard."""
+    floors: Dict[str, int] = {}
+    for name, table in (
+        ("products", products),
+        ("ai_contents", ai_contents),
+        ("outbox_events", OutboxEvent.__table__),
+    ):
+        highest = 0
+        for engine in engines:
+            with engine.connect() as conn:
+                highest = max(highest, conn.execute(select(func.max(table.c.id))).scalar() or 0)
+                archive = _archive_table(conn) if name == "ai_contents" else None
+                if archive is not None:
+                    highest = max(highest, conn.execute(select(func.max(archive.c.id))).scalar() or 0)
+        allocator.ensure_floor(name, highest + 1)
+        floors[name] = highest + 1
+    return floors
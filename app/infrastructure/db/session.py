@@ -3,7 +3,8 @@ Database session and Base configuration.
 
 Responsibilities:
 - Create SQLAlchemy engine using settings.database_url.
-- Provide SessionLocal factory.
+- Provide SessionLocal factory (a product_id-sharded session factory when
+  SHARD_MAP_PATH is set, see sharding.py).
 - Expose Base for SQLAlchemy models.
 - Provide get_db dependency for FastAPI routes.
 """
@@ -11,6 +12,7 @@ Responsibilities:
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.infrastructure.db.sharding import ShardRouter, load_shard_map
 
 # SQLAlchemy base class for all models
 Base = declarative_base()
@@ -22,11 +24,17 @@ engine = create_engine(
 )
 
 # Session factory
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
-)
+if settings.SHARD_MAP_PATH:
+    SessionLocal = ShardRouter(
+        load_shard_map(settings.SHARD_MAP_PATH),
+        id_block_size=settings.SHARD_ID_BLOCK_SIZE,
+    ).session_factory()
+else:
+    SessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
+    )
 
 
 def get_db():
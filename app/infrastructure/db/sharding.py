@@ -0,0 +1,357 @@
+"""
+Horizontal sharding by product_id.
+
+Responsibilities:
+- Load the shard map (shard name -> database URL) and build a consistent-hash
+  ring over it, so adding a shard only moves the products it takes over.
+- Allocate globally unique IDs (hi/lo blocks from a directory database).
+- Provide a SQLAlchemy ShardedSession that routes every statement to the
+  shard(s) owning the product_ids it touches.
+- Helpers the repositories use: pin a unit of work to one shard, split
+  work by shard, scatter-gather ordered listings.
+
+All helpers are no-ops on a plain Session, so the repositories behave the
+same with sharding switched off (SHARD_MAP_PATH unset).
+
+Shard map file (JSON):
+    {
+        "directory": "postgresql://.../maxcopy_directory",   # optional, defaults to the first shard
+        "vnodes": 64,                                        # optional
+        "shards": {"shard0": "postgresql://.../maxcopy_0", "shard1": "sqlite:///shard1.db"}
+    }
+"""
+
+import bisect
+import hashlib
+import heapq
+import json
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from sqlalchemy import BigInteger, Column, MetaData, String, Table, create_engine, insert, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, BooleanClauseList, ColumnClause
+
+T = TypeVar("T")
+
+
+class ShardRoutingError(RuntimeError):
+    """A statement could not be routed to a shard."""
+
+
+@dataclass
+class ShardMap:
+    """Shard names and URLs, plus consistent-hashing parameters."""
+
+    shards: Dict[str, str]
+    vnodes: int = 64
+    directory: Optional[str] = None
+
+    @property
+    def directory_url(self) -> str:
+        return self.directory or next(iter(self.shards.values()))
+
+
+def load_shard_map(path: str) -> ShardMap:
+    """Read a shard map JSON file."""
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    if not data.get("shards"):
+        raise ValueError(f"Shard map {path} defines no shards.")
+    return ShardMap(
+        shards=dict(data["shards"]),
+        vnodes=int(data.get("vnodes", 64)),
+        directory=data.get("directory"),
+    )
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring with `vnodes` points per shard."""
+
+    def __init__(self, shard_ids: List[str], vnodes: int = 64):
+        points = sorted((_hash(f"{shard_id}#{i}"), shard_id) for shard_id in shard_ids for i in range(vnodes))
+        self._points = [point for point, _ in points]
+        self._owners = [shard_id for _, shard_id in points]
+
+    def shard_for(self, key: int) -> str:
+        """Shard owning `key` (the first ring point clockwise from its hash)."""
+        index = bisect.bisect(self._points, _hash(str(key))) % len(self._points)
+        return self._owners[index]
+
+
+# Hi/lo ID blocks, kept in the directory database
+_id_metadata = MetaData()
+id_blocks = Table(
+    "id_blocks",
+    _id_metadata,
+    Column("name", String(64), primary_key=True),
+    Column("next_value", BigInteger, nullable=False),
+)
+
+
+class IdAllocator:
+    """
+    Globally unique IDs for sharded tables.
+
+    Each process reserves blocks of `block_size` IDs per name with one
+    UPDATE ... RETURNING on the directory database and hands them out
+    from memory, so allocation costs one round trip per block.
+    """
+
+    def __init__(self, engine: Engine, block_size: int = 1000):
+        self.engine = engine
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._blocks: Dict[str, Tuple[int, int]] = {}  # name -> (next, end)
+        self._known: Set[str] = set()
+
+    def _ensure_row(self, name: str) -> None:
+        if name in self._known:
+            return
+        if not self._known:
+            id_blocks.create(self.engine, checkfirst=True)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(id_blocks).values(name=name, next_value=1))
+        except IntegrityError:
+            pass  # created by another process
+        self._known.add(name)
+
+    def _reserve(self, name: str, size: int) -> Tuple[int, int]:
+        self._ensure_row(name)
+        with self.engine.begin() as conn:
+            end = conn.execute(
+                update(id_blocks)
+                .where(id_blocks.c.name == name)
+                .values(next_value=id_blocks.c.next_value + size)
+                .returning(id_blocks.c.next_value)
+            ).scalar_one()
+        return end - size, end
+
+    def allocate(self, name: str, count: int = 1) -> List[int]:
+        """Return `count` new IDs for `name`."""
+        ids: List[int] = []
+        with self._lock:
+            while len(ids) < count:
+                next_id, end = self._blocks.get(name, (0, 0))
+                if next_id >= end:
+                    next_id, end = self._reserve(name, max(self.block_size, count - len(ids)))
+                take = min(end - next_id, count - len(ids))
+                ids.extend(range(next_id, next_id + take))
+                self._blocks[name] = (next_id + take, end)
+        return ids
+
+    def ensure_floor(self, name: str, floor: int) -> None:
+        """Make sure future IDs for `name` are >= floor (used when enabling sharding)."""
+        self._ensure_row(name)
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(id_blocks)
+                .where(id_blocks.c.name == name, id_blocks.c.next_value < floor)
+                .values(next_value=floor)
+            )
+        with self._lock:
+            self._blocks.pop(name, None)
+
+
+class ShardRouter:
+    """Engines, ring and ID allocator for one shard map."""
+
+    def __init__(self, shard_map: ShardMap, id_block_size: int = 1000):
+        self.shard_map = shard_map
+        self.engines: Dict[str, Engine] = {
+            shard_id: create_engine(url, future=True) for shard_id, url in shard_map.shards.items()
+        }
+        self.shard_ids = list(self.engines)
+        self.ring = HashRing(self.shard_ids, vnodes=shard_map.vnodes)
+        self.ids = IdAllocator(create_engine(shard_map.directory_url, future=True), block_size=id_block_size)
+
+    def shard_for(self, product_id: int) -> str:
+        return self.ring.shard_for(product_id)
+
+    def session_factory(self) -> sessionmaker:
+        return sessionmaker(class_=ProductShardedSession, router=self, autoflush=False)
+
+
+def _is_product_key(column: Any) -> bool:
+    if not isinstance(column, ColumnClause) or column.table is None:
+        return False
+    return column.name == "product_id" or (column.table.name == "products" and column.name == "id")
+
+
+def _product_ids_in(statement: Any) -> Optional[Set[int]]:
+    """
+    product_ids a statement is restricted to (`col == value` / `col IN (...)`),
+    or None when it is not restricted (or uses OR, which we do not analyse).
+    """
+    where = getattr(statement, "whereclause", None)
+    if where is None:
+        return None
+
+    ids: Set[int] = set()
+    for element in visitors.iterate(where):
+        if isinstance(element, BooleanClauseList) and element.operator is operators.or_:
+            return None
+        if not isinstance(element, BinaryExpression) or not _is_product_key(element.left):
+            continue
+        if not isinstance(element.right, BindParameter):
+            continue
+        if element.operator is operators.eq:
+            ids.add(element.right.effective_value)
+        elif element.operator is operators.in_op:
+            ids.update(element.right.effective_value or [])
+    return ids or None
+
+
+class ProductShardedSession(ShardedSession):
+    """
+    ShardedSession routing by product_id.
+
+    - Products live on the shard of their id; AI contents, stats and
+      payload references on the shard of their product_id.
+    - Queries restricted to product_ids go to the owning shards only;
+      other queries fan out to every shard (results concatenated).
+    - Inside `pinned(...)` everything goes to the pinned shard, which is how
+      Core and text() statements are routed; outside of it they raise
+      ShardRoutingError (their results cannot be merged across shards).
+    """
+
+    def __init__(self, router: ShardRouter, **kwargs: Any):
+        self.router = router
+        self.pinned_shard: Optional[str] = None
+        super().__init__(
+            shard_chooser=self._choose_shard,
+            identity_chooser=self._choose_identity_shards,
+            execute_chooser=self._choose_execute_shards,
+            shards=router.engines,
+            **kwargs,
+        )
+
+    def _choose_shard(self, mapper: Any, instance: Any, clause: Any = None, **kw: Any) -> str:
+        if instance is not None:
+            if mapper.local_table.name == "products" and instance.id is not None:
+                return self.router.shard_for(instance.id)
+            product_id = getattr(instance, "product_id", None)
+            if product_id is not None:
+                return self.router.shard_for(product_id)
+        if self.pinned_shard is not None:
+            return self.pinned_shard
+        raise ShardRoutingError(f"Cannot route {mapper} without a product_id or a pinned shard.")
+
+    def _choose_identity_shards(self, mapper: Any, primary_key: Any, *, lazy_loaded_from: Any, **kw: Any) -> List[str]:
+        if lazy_loaded_from is not None:
+            return [lazy_loaded_from.identity_token]
+        if self.pinned_shard is not None:
+            return [self.pinned_shard]
+        if mapper.local_table.name == "products":
+            return [self.router.shard_for(primary_key[0])]
+        return self.router.shard_ids
+
+    def _choose_execute_shards(self, orm_context: ORMExecuteState) -> List[str]:
+        if orm_context.is_select and orm_context.lazy_loaded_from is not None:
+            return [orm_context.lazy_loaded_from.identity_token]
+        if self.pinned_shard is not None:
+            return [self.pinned_shard]
+        if orm_context.is_insert:
+            raise ShardRoutingError("Bulk INSERT outside of a pinned shard.")
+        if not orm_context.all_mappers:
+            raise ShardRoutingError("Core / text() statement outside of a pinned shard.")
+
+        product_ids = _product_ids_in(orm_context.statement)
+        if product_ids:
+            return sorted({self.router.shard_for(product_id) for product_id in product_ids})
+        return self.router.shard_ids
+
+    def get_bind(self, mapper: Any = None, *, shard_id: Any = None, instance: Any = None, clause: Any = None, **kw: Any):
+        # Statements arrive with the shard_id chosen by _choose_execute_shards;
+        # only db.connection() / get_bind() without one end up here
+        if shard_id is None and mapper is None and instance is None:
+            if self.pinned_shard is None:
+                raise ShardRoutingError("Connection requested outside of a pinned shard.")
+            shard_id = self.pinned_shard
+        return super().get_bind(mapper, shard_id=shard_id, instance=instance, clause=clause, **kw)
+
+
+def is_sharded(db: Session) -> bool:
+    return isinstance(db, ProductShardedSession)
+
+
+def shard_ids(db: Session, product_ids: Optional[List[int]] = None) -> List[Optional[str]]:
+    """Shards to visit (those owning `product_ids`, or all); [None] when not sharded."""
+    if not is_sharded(db):
+        return [None]
+    if product_ids:
+        return sorted({db.router.shard_for(product_id) for product_id in product_ids})
+    return list(db.router.shard_ids)
+
+
+@contextmanager
+def pinned(db: Session, product_id: Optional[int] = None, shard_id: Optional[str] = None) -> Iterator[None]:
+    """
+    Route every statement inside the block to one shard (the shard of
+    `product_id`, or `shard_id`). No-op on a plain Session.
+    """
+    if not is_sharded(db) or (product_id is None and shard_id is None):
+        yield
+        return
+
+    previous = db.pinned_shard
+    db.pinned_shard = shard_id if shard_id is not None else db.router.shard_for(product_id)
+    try:
+        yield
+    finally:
+        db.pinned_shard = previous
+
+
+def split_by_shard(db: Session, items: List[T], product_id: Callable[[T], int]) -> List[List[T]]:
+    """Group items by the shard of their product (one group when not sharded)."""
+    if not is_sharded(db):
+        return [items] if items else []
+    groups: Dict[str, List[T]] = {}
+    for item in items:
+        groups.setdefault(db.router.shard_for(product_id(item)), []).append(item)
+    return list(groups.values())
+
+
+def allocate_id(db: Session, name: str) -> Optional[int]:
+    """A globally unique ID for a new row, or None (database default) when not sharded."""
+    return db.router.ids.allocate(name)[0] if is_sharded(db) else None
+
+
+def allocate_ids(db: Session, name: str, count: int) -> Optional[List[int]]:
+    """`count` globally unique IDs, or None (database default) when not sharded."""
+    return db.router.ids.allocate(name, count) if is_sharded(db) else None
+
+
+def scatter_gather(
+    db: Session,
+    query: Any,
+    key: Callable[[Any], Any],
+    limit: int,
+    offset: int = 0,
+    reverse: bool = False,
+) -> List[Any]:
+    """
+    Run an ordered, paginated query across shards.
+
+    Each shard returns its first offset+limit rows (already ordered by the
+    query); the sorted streams are merged on `key` and sliced. Without
+    sharding this is just query.offset(offset).limit(limit).all().
+    """
+    if not is_sharded(db):
+        return query.offset(offset).limit(limit).all()
+
+    per_shard = [query.limit(offset + limit).set_shard(shard_id).all() for shard_id in db.router.shard_ids]
+    merged = heapq.merge(*per_shard, key=key, reverse=reverse)
+    return list(islice(merged, offset, offset + limit))
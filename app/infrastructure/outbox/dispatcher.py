@@ -0,0 +1,156 @@
+"""
+Outbox dispatcher.
+
+Responsibilities:
+- Drain pending outbox events in batches (FOR UPDATE SKIP LOCKED, so
+  several dispatchers can run side by side).
+- Deliver each batch to every configured sink, tracking per event which
+  sinks already accepted it (a failing sink causes no redelivery to the others).
+- Mark events delivered, or record the failure and back off; dead-letter
+  events that fail `max_attempts` times.
+
+Fresh events go to a sink as one batch. Events that failed before are
+retried one by one, so a poison event only fails itself; the first one that
+fails again ends that sink's turn, so a sink that is down costs one call per
+run instead of one per event.
+
+Delivery is at-least-once: an event is only marked delivered after every
+sink accepted it, so a crash leads to redelivery.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.domain.models.outbox_event import OutboxEvent
+from app.infrastructure.outbox.sinks import Event, Sink, SinkError
+from app.infrastructure.repositories import outbox_repository
+
+logger = logging.getLogger(__name__)
+
+
+def to_event(row: OutboxEvent) -> Event:
+    """Serialize an outbox row for sinks."""
+    return {
+        "id": row.id,
+        "aggregate_type": row.aggregate_type,
+        "aggregate_id": row.aggregate_id,
+        "event_type": row.event_type,
+        "payload": row.payload,
+        "created_at": row.created_at.isoformat(),
+    }
+
+
+class OutboxDispatcher:
+    """Moves events from the outbox table to sinks."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        sinks: List[Sink],
+        batch_size: int = 500,
+        retry_base_seconds: float = 1.0,
+        retry_max_seconds: float = 300.0,
+        max_attempts: int = 20,
+    ):
+        self.session_factory = session_factory
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+
+    def _retry_delay(self, attempts: int) -> timedelta:
+        seconds = min(self.retry_max_seconds, self.retry_base_seconds * (2 ** attempts))
+        return timedelta(seconds=seconds)
+
+    def _deliver_to(self, sink: Sink, rows: List[OutboxEvent], errors: Dict[int, str]) -> None:
+        """Deliver the rows `sink` has not accepted yet; failures go to `errors` (id -> message)."""
+        pending = [row for row in rows if sink.key not in row.delivered_sinks]
+        fresh = [row for row in pending if row.attempts == 0]
+        groups = ([fresh] if fresh else []) + [[row] for row in pending if row.attempts > 0]
+
+        for group in groups:
+            try:
+                sink.deliver([to_event(row) for row in group])
+            except SinkError as exc:
+                logger.warning("Outbox delivery of %d events to %s failed: %s", len(group), sink.key, exc)
+                for row in group:
+                    errors[row.id] = f"{sink.key}: {exc}"
+                # Leave the rest for the next run rather than hammering a failing sink
+                return
+            outbox_repository.mark_delivered_to(group, sink.key)
+
+    def run_once(self) -> int:
+        """
+        Claim and deliver one batch. Returns the number of events delivered.
+        """
+        db = self.session_factory()
+        try:
+            rows = outbox_repository.claim_pending(db, batch_size=self.batch_size)
+            if not rows:
+                db.rollback()
+                return 0
+
+            errors: Dict[int, str] = {}
+            for sink in self.sinks:
+                self._deliver_to(sink, rows, errors)
+
+            sink_keys = [sink.key for sink in self.sinks]
+            delivered = sum(1 for row in rows if all(key in row.delivered_sinks for key in sink_keys))
+            dead = outbox_repository.finish_attempt(
+                db,
+                rows,
+                sink_keys=sink_keys,
+                errors=errors,
+                retry_in=self._retry_delay,
+                max_attempts=self.max_attempts,
+            )
+            if dead:
+                logger.error("Dead-lettered %d outbox events after %d attempts", dead, self.max_attempts)
+            return delivered
+        finally:
+            db.close()
+
+    def purge(self, older_than: datetime) -> int:
+        """Delete delivered events older than `older_than`."""
+        db = self.session_factory()
+        try:
+            total = 0
+            while True:
+                removed = outbox_repository.purge_dispatched(db, older_than=older_than)
+                total += removed
+                if removed == 0:
+                    return total
+        finally:
+            db.close()
+
+    def run_forever(
+        self,
+        poll_interval: float = 1.0,
+        retention: timedelta = timedelta(days=7),
+        purge_every: float = 3600.0,
+    ) -> None:
+        """
+        Drain continuously; sleep `poll_interval` when the outbox is empty.
+        """
+        last_purge = 0.0
+        try:
+            while True:
+                delivered = self.run_once()
+                if delivered:
+                    logger.info("Delivered %d outbox events", delivered)
+
+                if time.monotonic() - last_purge > purge_every:
+                    purged = self.purge(datetime.utcnow() - retention)
+                    logger.info("Purged %d delivered outbox events", purged)
+                    last_purge = time.monotonic()
+
+                if delivered < self.batch_size:
+                    time.sleep(poll_interval)
+        finally:
+            for sink in self.sinks:
+                sink.close()
@@ -0,0 +1,117 @@
+"""
+Outbox delivery sinks.
+
+Responsibilities:
+- Define the Sink interface the dispatcher delivers event batches to.
+- Provide webhook, file (JSONL) and in-process subscriber sinks.
+
+A sink must raise on failure; the dispatcher then retries the events that
+this sink has not accepted yet (delivery is tracked per sink `key`), so
+sinks and their consumers must still tolerate duplicates (at-least-once).
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Callable, DefaultDict, Dict, List
+
+import httpx
+
+# Event dicts as delivered to sinks:
+# {"id", "aggregate_type", "aggregate_id", "event_type", "payload", "created_at"}
+Event = Dict[str, Any]
+
+
+class SinkError(Exception):
+    """Raised by a sink when a batch could not be delivered."""
+
+
+class Sink(ABC):
+    """Destination for batches of outbox events."""
+
+    name: str = "sink"
+
+    @property
+    def key(self) -> str:
+        """Stable identifier recorded on events this sink accepted (unique per dispatcher)."""
+        return self.name
+
+    @abstractmethod
+    def deliver(self, events: List[Event]) -> None:
+        """Deliver a batch of events or raise SinkError."""
+
+    def close(self) -> None:
+        """Release resources held by the sink."""
+
+
+class WebhookSink(Sink):
+    """POSTs each batch as JSON ({"events": [...]}) to a URL over a pooled client."""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout_seconds: float = 10.0, headers: Dict[str, str] = None):
+        self.url = url
+        self._client = httpx.Client(timeout=timeout_seconds, headers=headers or {})
+
+    @property
+    def key(self) -> str:
+        return f"webhook:{self.url}"
+
+    def deliver(self, events: List[Event]) -> None:
+        try:
+            response = self._client.post(self.url, json={"events": events})
+        except httpx.HTTPError as exc:
+            raise SinkError(f"Webhook {self.url} unreachable: {exc}") from exc
+        if response.status_code >= 300:
+            raise SinkError(f"Webhook {self.url} returned HTTP {response.status_code}")
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class FileSink(Sink):
+    """Appends events as JSON lines to a file (fsync'ed per batch)."""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @property
+    def key(self) -> str:
+        return f"file:{self.path}"
+
+    def deliver(self, events: List[Event]) -> None:
+        try:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                for event in events:
+                    fh.write(json.dumps(event, ensure_ascii=False) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+        except OSError as exc:
+            raise SinkError(f"Could not write {self.path}: {exc}") from exc
+
+
+class InProcessSink(Sink):
+    """
+    Calls subscribed Python callbacks.
+
+    Subscribe to an event_type (e.g. 'product.updated') or '*' for every event.
+    """
+
+    name = "in_process"
+
+    def __init__(self):
+        self._subscribers: DefaultDict[str, List[Callable[[Event], None]]] = defaultdict(list)
+
+    def subscribe(self, event_type: str, callback: Callable[[Event], None]) -> None:
+        self._subscribers[event_type].append(callback)
+
+    def deliver(self, events: List[Event]) -> None:
+        for event in events:
+            for callback in self._subscribers[event["event_type"]] + self._subscribers["*"]:
+                try:
+                    callback(event)
+                except Exception as exc:
+                    raise SinkError(f"Subscriber {callback!r} failed on event {event['id']}: {exc}") from exc
@@ -0,0 +1,65 @@
+"""
+Local stub webhook receiver for outbox development and tests.
+
+Usage:
+    python -m app.infrastructure.outbox.stub_receiver --port 8081 --fail-rate 0.2
+
+Accepts POST {"events": [...]}, logs a summary line per batch, optionally
+appends events to a file, and can reject a fraction of requests with HTTP 503
+to exercise redelivery.
+"""
+
+import argparse
+import json
+import logging
+import random
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+def make_handler(fail_rate: float, output_path: str = None):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            events = body.get("events", [])
+
+            if random.random() < fail_rate:
+                self.send_response(503)
+                self.end_headers()
+                logger.info("Rejected batch of %d events (injected failure)", len(events))
+                return
+
+            if output_path:
+                with open(output_path, "a", encoding="utf-8") as fh:
+                    for event in events:
+                        fh.write(json.dumps(event) + "\n")
+
+            ids = [event["id"] for event in events]
+            logger.info("Received %d events: %s..%s", len(events), ids[:1], ids[-1:])
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *args):  # noqa: A002 - batch summaries replace access logs
+            pass
+
+    return StubHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stub outbox webhook receiver.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--output", default=None, help="Append received events to this JSONL file.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.fail_rate, args.output))
+    logger.info("Stub receiver listening on http://%s:%d/", args.host, args.port)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
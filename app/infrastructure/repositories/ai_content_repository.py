@@ -6,17 +6,41 @@ Responsibilities:
 - Provide a clean API for the service layer.
 """
 
-from typing import List, Optional
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
+from sqlalchemy import exists, func, select, text, tuple_, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
 from app.domain.models.ai_content import AIContent
-from app.domain.schemas.ai_content import AIContentCreate
+from app.domain.models.ai_payload import AIPayload
+from app.domain.models.product import Product
+from app.domain.schemas.ai_content import AIContentCreate, AIContentFilter, GenerationMetrics
+from app.infrastructure.db import sharding
+from app.infrastructure.repositories import (
+    ai_content_stats_repository,
+    ai_generation_metrics_repository,
+    ai_payload_repository,
+    outbox_repository,
+    product_repository,
+)
+
+# AI contents of soft-deleted products are hidden until the purge job removes them
+_PRODUCT_IS_LIVE = exists().where(
+    Product.id == AIContent.product_id,
+    Product.deleted_at.is_(None),
+)
 
 
 def get_ai_content(db: Session, ai_content_id: int) -> Optional[AIContent]:
     """Return a single AIContent by ID, or None if not found."""
-    return db.query(AIContent).filter(AIContent.id == ai_content_id).first()
+    return (
+        db.query(AIContent)
+        .filter(AIContent.id == ai_content_id, _PRODUCT_IS_LIVE)
+        .first()
+    )
 
 
 def get_ai_contents_by_product(
@@ -28,7 +52,7 @@ def get_ai_contents_by_product(
     """
     Return AI contents for a given product, optionally filtered by channel and content_type.
     """
-    query = db.query(AIContent).filter(AIContent.product_id == product_id)
+    query = db.query(AIContent).filter(AIContent.product_id == product_id, _PRODUCT_IS_LIVE)
 
     if channel:
         query = query.filter(AIContent.channel == channel)
@@ -40,19 +64,503 @@ def get_ai_contents_by_product(
     return query.order_by(AIContent.created_at.desc()).all()
 
 
+def get_review_queue(
+    db: Session,
+    channel: Optional[str] = None,
+    content_type: Optional[str] = None,
+    before: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    limit: int = 50,
+) -> List[AIContent]:
+    """
+    Return unapproved AI contents, newest first (served by the partial review-queue index).
+
+    Paginate with `before` / `before_id` = created_at / id of the last row of the
+    previous page; rows sharing a created_at are ordered by id, so none are
+    skipped. `before` alone returns rows strictly older than it.
+    """
+    query = db.query(AIContent).filter(AIContent.approved.is_(False), _PRODUCT_IS_LIVE)
+
+    if channel:
+        query = query.filter(AIContent.channel == channel)
+
+    if content_type:
+        query = query.filter(AIContent.content_type == content_type)
+
+    if before and before_id is not None:
+        query = query.filter(
+            # Plain range first so the index (and partition pruning) can be used
+            AIContent.created_at <= before,
+            tuple_(AIContent.created_at, AIContent.id) < tuple_(before, before_id),
+        )
+    elif before:
+        query = query.filter(AIContent.created_at < before)
+
+    return sharding.scatter_gather(
+        db,
+        query.order_by(AIContent.created_at.desc(), AIContent.id.desc()),
+        key=lambda ai_content: (ai_content.created_at, ai_content.id),
+        limit=limit,
+        reverse=True,
+    )
+
+
+def get_product_ids_with_content(
+    db: Session,
+    product_ids: Iterable[int],
+    channel: str,
+    content_type: str,
+) -> Set[int]:
+    """
+    Return the subset of product_ids that already have content for channel/content_type.
+    """
+    rows = (
+        db.query(AIContent.product_id)
+        .filter(
+            AIContent.product_id.in_(list(product_ids)),
+            AIContent.channel == channel,
+            AIContent.content_type == content_type,
+        )
+        .distinct()
+        .all()
+    )
+    return {row.product_id for row in rows}
+
+
+def get_latest_approved_contents(
+    db: Session,
+    product_ids: Iterable[int],
+    targets: Iterable[Tuple[str, str]],
+) -> Dict[Tuple[int, str, str], AIContent]:
+    """
+    Return the newest approved AI content per (product_id, channel, content_type)
+    among the given products and (channel, content_type) targets.
+
+    The newest row per group is picked in SQL (row_number), so only those
+    rows and their payloads are loaded, however long the history is.
+    """
+    ids, pairs = list(product_ids), list(targets)
+    if not ids or not pairs:
+        return {}
+
+    ranked = (
+        select(
+            AIContent.id,
+            AIContent.created_at,
+            func.row_number()
+            .over(
+                partition_by=(AIContent.product_id, AIContent.channel, AIContent.content_type),
+                order_by=(AIContent.created_at.desc(), AIContent.id.desc()),
+            )
+            .label("position"),
+        )
+        .where(
+            AIContent.product_id.in_(ids),
+            tuple_(AIContent.channel, AIContent.content_type).in_(pairs),
+            AIContent.approved.is_(True),
+            _PRODUCT_IS_LIVE,
+        )
+        .subquery()
+    )
+    rows = (
+        db.query(AIContent)
+        .join(ranked, (AIContent.id == ranked.c.id) & (AIContent.created_at == ranked.c.created_at))
+        # Repeated outside the subquery so sharded sessions route to the owning shards
+        .filter(ranked.c.position == 1, AIContent.product_id.in_(ids))
+        .all()
+    )
+    return {(row.product_id, row.channel, row.content_type): row for row in rows}
+
+
+def get_ai_contents_for_export(
+    db: Session,
+    created_before: datetime,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = 10000,
+) -> List[Row]:
+    """
+    Return one page of AI contents with their payload, ordered by (created_at, id).
+
+    Only rows created before `created_before` and after the (created_at, id)
+    keyset `after` are returned. Rows of soft-deleted products are included:
+    analytics snapshots record what was generated.
+    """
+    query = (
+        db.query(
+            AIContent.id,
+            AIContent.product_id,
+            AIContent.channel,
+            AIContent.content_type,
+            AIContent.payload_hash,
+            AIContent.approved,
+            AIContent.last_model_used,
+            AIContent.created_at,
+            AIPayload.payload,
+        )
+        .join(AIPayload, AIPayload.hash == AIContent.payload_hash)
+        .filter(AIContent.created_at < created_before)
+    )
+    if after is not None:
+        query = query.filter(
+            # Plain range first so PostgreSQL can prune old partitions
+            AIContent.created_at >= after[0],
+            tuple_(AIContent.created_at, AIContent.id) > tuple_(*after),
+        )
+
+    return sharding.scatter_gather(
+        db,
+        query.order_by(AIContent.created_at, AIContent.id),
+        key=lambda row: (row.created_at, row.id),
+        limit=limit,
+    )
+
+
+def _build_ai_contents(db: Session, items: List[AIContentCreate]) -> List[AIContent]:
+    """
+    Store the (deduplicated) payloads and build AIContent rows referencing them.
+    """
+    hashes = ai_payload_repository.store_payloads(db=db, payloads=[data.payload for data in items])
+    ids = sharding.allocate_ids(db, "ai_contents", len(items)) or [None] * len(items)
+    return [
+        AIContent(
+            id=ai_content_id,  # None (serial) when not sharded
+            product_id=data.product_id,
+            channel=data.channel,
+            content_type=data.content_type,
+            payload_hash=hash_,
+            approved=data.approved,
+            last_model_used=data.last_model_used,
+        )
+        for data, hash_, ai_content_id in zip(items, hashes, ids)
+    ]
+
+
+def _record_created(
+    db: Session,
+    ai_contents: List[AIContent],
+    metrics: Optional[List[Optional[GenerationMetrics]]] = None,
+) -> None:
+    """
+    Update ai_content_stats counters, product versions, generation metrics
+    and the outbox for new (flushed) rows.
+
+    Runs in the caller's transaction.
+    """
+    product_repository.bump_ai_contents_version(db, (a.product_id for a in ai_contents))
+    ai_content_stats_repository.apply_deltas(
+        db=db,
+        generated=ai_content_stats_repository.count_keys(ai_contents),
+        approved=ai_content_stats_repository.count_keys(a for a in ai_contents if a.approved),
+    )
+    if metrics:
+        ai_generation_metrics_repository.add_metrics(db=db, ai_contents=ai_contents, metrics=metrics)
+    outbox_repository.add_events(
+        db,
+        [
+            outbox_repository.build_event(
+                aggregate_type="ai_content",
+                aggregate_id=a.id,
+                event_type="ai_content.created",
+                payload={
+                    "id": a.id,
+                    "product_id": a.product_id,
+                    "channel": a.channel,
+                    "content_type": a.content_type,
+                    "payload_hash": a.payload_hash,
+                    "approved": a.approved,
+                    "last_model_used": a.last_model_used,
+                },
+            )
+            for a in ai_contents
+        ],
+    )
+
+
+def _record_approval_change(db: Session, rows: List[Row], approved: bool) -> None:
+    """
+    Update approved counters, product versions and the outbox for rows whose
+    flag just flipped.
+
+    Runs in the caller's transaction.
+    """
+    product_repository.bump_ai_contents_version(db, (row.product_id for row in rows))
+    counts = ai_content_stats_repository.count_keys(rows)
+    if not approved:
+        counts = Counter({key: -value for key, value in counts.items()})
+    ai_content_stats_repository.apply_deltas(db=db, approved=counts)
+    outbox_repository.add_events(
+        db,
+        [
+            outbox_repository.build_event(
+                aggregate_type="ai_content",
+                aggregate_id=row.id,
+                event_type="ai_content.approved" if approved else "ai_content.rejected",
+                payload={
+                    "id": row.id,
+                    "product_id": row.product_id,
+                    "channel": row.channel,
+                    "content_type": row.content_type,
+                    "approved": approved,
+                },
+            )
+            for row in rows
+        ],
+    )
+
+
 def create_ai_content(db: Session, data: AIContentCreate) -> AIContent:
     """
     Create a new AIContent row from validated data.
     """
-    ai_content = AIContent(
-        product_id=data.product_id,
-        channel=data.channel,
-        content_type=data.content_type,
-        payload=data.payload,
-        approved=data.approved,
-        last_model_used=data.last_model_used,
-    )
-    db.add(ai_content)
-    db.commit()
-    db.refresh(ai_content)
+    with sharding.pinned(db, product_id=data.product_id):
+        ai_content = _build_ai_contents(db=db, items=[data])[0]
+        db.add(ai_content)
+        db.flush()
+        _record_created(db=db, ai_contents=[ai_content], metrics=[data.metrics])
+        db.commit()
+        db.refresh(ai_content)
     return ai_content
+
+
+def create_ai_contents(
+    db: Session,
+    items: List[AIContentCreate],
+    reload: bool = True,
+) -> List[AIContent]:
+    """
+    Create several AIContent rows in a single transaction (one per shard
+    when sharded).
+
+    Rows are flushed together (one multi-row INSERT) and reloaded with one query,
+    instead of a commit + refresh per row. Bulk jobs pass reload=False and get
+    an empty list back.
+    """
+    created: List[AIContent] = []
+    for shard_items in sharding.split_by_shard(db, items, lambda data: data.product_id):
+        with sharding.pinned(db, product_id=shard_items[0].product_id):
+            created.extend(_create_ai_contents(db=db, items=shard_items, reload=reload))
+    return created
+
+
+def _create_ai_contents(
+    db: Session,
+    items: List[AIContentCreate],
+    reload: bool,
+) -> List[AIContent]:
+    ai_contents = _build_ai_contents(db=db, items=items)
+    db.add_all(ai_contents)
+    db.flush()
+    ids = [ai_content.id for ai_content in ai_contents]
+    _record_created(db=db, ai_contents=ai_contents, metrics=[data.metrics for data in items])
+    db.commit()
+
+    if not reload:
+        return []
+
+    rows = db.query(AIContent).filter(AIContent.id.in_(ids)).all()
+    by_id = {row.id: row for row in rows}
+    return [by_id[ai_content_id] for ai_content_id in ids]
+
+
+_APPROVAL_RETURNING = (
+    AIContent.id,
+    AIContent.product_id,
+    AIContent.channel,
+    AIContent.content_type,
+    AIContent.last_model_used,
+)
+
+
+def set_approval_by_ids(
+    db: Session,
+    ids: List[int],
+    approved: bool,
+    chunk_size: int = 1000,
+) -> List[Row]:
+    """
+    Set `approved` on the given AI contents, one UPDATE ... RETURNING per chunk.
+
+    Rows that already have the requested value are not touched. Returns the
+    changed rows (id, product_id, channel, content_type, last_model_used).
+    """
+    changed: List[Row] = []
+    # IDs do not tell the shard: each shard updates the rows it has
+    for shard_id in sharding.shard_ids(db):
+        with sharding.pinned(db, shard_id=shard_id):
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start:start + chunk_size]
+                result = db.execute(
+                    update(AIContent)
+                    .where(
+                        AIContent.id.in_(chunk),
+                        AIContent.approved.is_not(approved),
+                        _PRODUCT_IS_LIVE,
+                    )
+                    .values(approved=approved)
+                    .returning(*_APPROVAL_RETURNING)
+                    .execution_options(synchronize_session=False)
+                )
+                rows = result.all()
+                _record_approval_change(db=db, rows=rows, approved=approved)
+                db.commit()
+                changed.extend(rows)
+    return changed
+
+
+def set_approval_by_filter(
+    db: Session,
+    filters: AIContentFilter,
+    approved: bool,
+    chunk_size: int = 1000,
+) -> List[Row]:
+    """
+    Set `approved` on every AI content matching `filters`, chunk by chunk.
+
+    Each chunk is one UPDATE ... WHERE (id, created_at) IN (SELECT ... LIMIT n)
+    RETURNING, committed on its own so locks stay short.
+    """
+    criteria = [AIContent.approved.is_not(approved), _PRODUCT_IS_LIVE]
+    for field, value in filters.model_dump(exclude_none=True).items():
+        criteria.append(getattr(AIContent, field) == value)
+
+    changed: List[Row] = []
+    product_ids = [filters.product_id] if filters.product_id is not None else None
+    for shard_id in sharding.shard_ids(db, product_ids):
+        with sharding.pinned(db, shard_id=shard_id):
+            while True:
+                chunk = (
+                    select(AIContent.id, AIContent.created_at)
+                    .where(*criteria)
+                    .limit(chunk_size)
+                )
+                result = db.execute(
+                    update(AIContent)
+                    .where(tuple_(AIContent.id, AIContent.created_at).in_(chunk))
+                    .values(approved=approved)
+                    .returning(*_APPROVAL_RETURNING)
+                    .execution_options(synchronize_session=False)
+                )
+                rows = result.all()
+                _record_approval_change(db=db, rows=rows, approved=approved)
+                db.commit()
+                changed.extend(rows)
+                if len(rows) < chunk_size:
+                    break
+    return changed
+
+
+# Unapproved rows older than the cutoff that have a newer row for the same
+# (product, channel, content_type). Approved rows and the latest row per
+# group are never selected.
+_SUPERSEDED_BATCH_SQL = """
+    SELECT old.id, old.created_at
+    FROM ai_contents AS old
+    WHERE old.approved = FALSE
+      AND old.created_at < :cutoff
+      AND EXISTS (
+          SELECT 1 FROM ai_contents AS newer
+          WHERE newer.product_id = old.product_id
+            AND newer.channel = old.channel
+            AND newer.content_type = old.content_type
+            AND newer.created_at > old.created_at
+      )
+    LIMIT :batch_size
+"""
+
+_AI_CONTENT_COLUMNS = (
+    "id, product_id, channel, content_type, payload_hash, approved, last_model_used, created_at"
+)
+
+
+# The history of every product that lost rows changed: invalidate its ETag
+_BUMP_VERSIONS_SQL = """
+    UPDATE products SET ai_contents_version = ai_contents_version + 1
+    WHERE id IN (SELECT DISTINCT product_id FROM moved)
+"""
+
+
+def purge_superseded_ai_contents(
+    db: Session,
+    older_than: datetime,
+    archive: bool = True,
+    batch_size: int = 5000,
+) -> int:
+    """
+    Remove one batch of superseded, unapproved AI contents older than `older_than`.
+
+    With archive=True the rows are moved into ai_contents_archive in the same
+    statement. Returns the number of rows removed (0 when nothing is left).
+    """
+    if archive:
+        statement = f"""
+            WITH doomed AS ({_SUPERSEDED_BATCH_SQL}),
+            moved AS (
+                DELETE FROM ai_contents AS c
+                USING doomed
+                WHERE c.id = doomed.id AND c.created_at = doomed.created_at
+                RETURNING c.*
+            ),
+            archived AS (
+                INSERT INTO ai_contents_archive ({_AI_CONTENT_COLUMNS})
+                SELECT {_AI_CONTENT_COLUMNS} FROM moved
+                RETURNING 1
+            ),
+            bumped AS ({_BUMP_VERSIONS_SQL})
+            SELECT count(*) FROM archived
+        """
+    else:
+        statement = f"""
+            WITH doomed AS ({_SUPERSEDED_BATCH_SQL}),
+            moved AS (
+                DELETE FROM ai_contents AS c
+                USING doomed
+                WHERE c.id = doomed.id AND c.created_at = doomed.created_at
+                RETURNING c.product_id
+            ),
+            bumped AS ({_BUMP_VERSIONS_SQL})
+            SELECT count(*) FROM moved
+        """
+
+    removed = db.execute(
+        text(statement),
+        {"cutoff": older_than, "batch_size": batch_size},
+    ).scalar_one()
+    db.commit()
+    return removed
+
+
+def delete_ai_contents_of_products(
+    db: Session,
+    product_ids: List[int],
+    batch_size: int = 5000,
+) -> int:
+    """
+    Delete one batch of AI contents (live and archived) of the given products.
+
+    Used by the purge job for soft-deleted products. Each call removes at most
+    `batch_size` rows per table and commits. Returns the number of rows
+    removed (0 when nothing is left).
+    """
+    removed = 0
+    for table in ("ai_contents", "ai_contents_archive"):
+        removed += db.execute(
+            text(
+                f"""
+                WITH doomed AS (
+                    SELECT id, created_at FROM {table}
+                    WHERE product_id = ANY(:product_ids)
+                    LIMIT :batch_size
+                ),
+                gone AS (
+                    DELETE FROM {table} AS c
+                    USING doomed
+                    WHERE c.id = doomed.id AND c.created_at = doomed.created_at
+                    RETURNING 1
+                )
+                SELECT count(*) FROM gone
+                """
+            ),
+            {"product_ids": list(product_ids), "batch_size": batch_size},
+        ).scalar_one()
+    db.commit()
+    return removed
@@ -0,0 +1,392 @@
+"""
+AIContentStat repository.
+
+Responsibilities:
+- Apply counter deltas to ai_content_stats and its catalog-wide rollup
+  ai_content_stat_totals (upserts, no commit; callers commit together with
+  the AIContent writes). Rollup deltas go to the slot row of their product,
+  so writers for different products do not contend on one row per model.
+- Read aggregated counters for dashboards (the rollup, summed over slots,
+  when not filtered by product).
+- Rebuild counters from ai_contents for drift correction, product batch by
+  product batch.
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.models.ai_content_stat import AIContentStat
+from app.domain.models.ai_content_stat_total import AIContentStatTotal
+from app.domain.models.product import Product
+from app.infrastructure.db import sharding
+
+# (product_id, channel, content_type, last_model_used)
+StatKey = Tuple[int, str, str, str]
+
+# (channel, content_type, last_model_used, slot)
+TotalKey = Tuple[str, str, str, int]
+
+
+def stat_key(product_id: int, channel: str, content_type: str, last_model_used: Optional[str]) -> StatKey:
+    """Build the counter key for one AI content row."""
+    return product_id, channel, content_type, last_model_used or ""
+
+
+def total_slot(product_id: int) -> int:
+    """Rollup slot a product's counters are added to."""
+    return product_id % settings.AI_CONTENT_STAT_TOTAL_SLOTS
+
+
+def apply_deltas(
+    db: Session,
+    generated: Optional[Counter] = None,
+    approved: Optional[Counter] = None,
+) -> None:
+    """
+    Add per-key deltas to the counters with a single INSERT ... ON CONFLICT DO UPDATE,
+    then the deltas summed per slot to the rollup (one more upsert).
+
+    Does not commit.
+    """
+    generated = generated or Counter()
+    approved = approved or Counter()
+    keys = set(generated) | set(approved)
+    if not keys:
+        return
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "product_id": key[0],
+            "channel": key[1],
+            "content_type": key[2],
+            "last_model_used": key[3],
+            "generated_count": generated.get(key, 0),
+            "approved_count": approved.get(key, 0),
+            "updated_at": now,
+        }
+        # Sorted so concurrent writers lock rows in the same order
+        for key in sorted(keys)
+    ]
+    statement = insert(AIContentStat).values(rows)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[
+                AIContentStat.product_id,
+                AIContentStat.channel,
+                AIContentStat.content_type,
+                AIContentStat.last_model_used,
+            ],
+            set_={
+                "generated_count": AIContentStat.generated_count + statement.excluded.generated_count,
+                "approved_count": AIContentStat.approved_count + statement.excluded.approved_count,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+    )
+
+    generated_totals: Counter = Counter()
+    approved_totals: Counter = Counter()
+    for key in keys:
+        total_key = (*key[1:], total_slot(key[0]))
+        generated_totals[total_key] += generated.get(key, 0)
+        approved_totals[total_key] += approved.get(key, 0)
+    _apply_total_deltas(db, generated_totals, approved_totals)
+
+
+def _apply_total_deltas(db: Session, generated: Counter, approved: Counter) -> None:
+    """Add TotalKey deltas to ai_content_stat_totals. Does not commit."""
+    keys = {key for key in set(generated) | set(approved) if generated.get(key) or approved.get(key)}
+    if not keys:
+        return
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "channel": key[0],
+            "content_type": key[1],
+            "last_model_used": key[2],
+            "slot": key[3],
+            "generated_count": generated.get(key, 0),
+            "approved_count": approved.get(key, 0),
+            "updated_at": now,
+        }
+        # Sorted so concurrent writers lock rows in the same order
+        for key in sorted(keys)
+    ]
+    statement = insert(AIContentStatTotal).values(rows)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[
+                AIContentStatTotal.channel,
+                AIContentStatTotal.content_type,
+                AIContentStatTotal.last_model_used,
+                AIContentStatTotal.slot,
+            ],
+            set_={
+                "generated_count": AIContentStatTotal.generated_count + statement.excluded.generated_count,
+                "approved_count": AIContentStatTotal.approved_count + statement.excluded.approved_count,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+    )
+
+
+def count_keys(rows: Iterable) -> Counter:
+    """Count rows (objects or Rows with product_id/channel/content_type/last_model_used) per key."""
+    return Counter(
+        stat_key(row.product_id, row.channel, row.content_type, row.last_model_used) for row in rows
+    )
+
+
+def get_stats(
+    db: Session,
+    product_id: Optional[int] = None,
+    channel: Optional[str] = None,
+    content_type: Optional[str] = None,
+    last_model_used: Optional[str] = None,
+) -> List[Row]:
+    """
+    Return counters summed per (channel, content_type, last_model_used).
+
+    Pass product_id for a single product (per-product counters). Otherwise
+    the catalog-wide rollup is read (summing its slots), so the cost does not
+    grow with the number of products.
+    """
+    stat = AIContentStat if product_id is not None else AIContentStatTotal
+    query = db.query(
+        stat.channel,
+        stat.content_type,
+        stat.last_model_used,
+        func.sum(stat.generated_count).label("generated_count"),
+        func.sum(stat.approved_count).label("approved_count"),
+    )
+
+    if product_id is not None:
+        query = query.filter(AIContentStat.product_id == product_id)
+    else:
+        # Rollup rows of deleted products' keys stay behind at zero
+        query = query.having(func.sum(AIContentStatTotal.generated_count) > 0)
+
+    if channel:
+        query = query.filter(stat.channel == channel)
+
+    if content_type:
+        query = query.filter(stat.content_type == content_type)
+
+    if last_model_used is not None:
+        query = query.filter(stat.last_model_used == last_model_used)
+
+    rows = (
+        query.group_by(stat.channel, stat.content_type, stat.last_model_used)
+        .order_by(stat.channel, stat.content_type, stat.last_model_used)
+        .all()
+    )
+    if sharding.is_sharded(db) and product_id is None:
+        return _merge_shard_stats(rows)
+    return rows
+
+
+class _StatRow(NamedTuple):
+    channel: str
+    content_type: str
+    last_model_used: str
+    generated_count: int
+    approved_count: int
+
+
+def _merge_shard_stats(rows: List[Row]) -> List[_StatRow]:
+    """Sum the per-shard partial groups of `get_stats`."""
+    totals: Dict[Tuple[str, str, str], List[int]] = {}
+    for row in rows:
+        key = (row.channel, row.content_type, row.last_model_used)
+        total = totals.setdefault(key, [0, 0])
+        total[0] += row.generated_count
+        total[1] += row.approved_count
+    return [_StatRow(*key, *total) for key, total in sorted(totals.items())]
+
+
+def delete_product_stats(db: Session, product_ids: Iterable[int]) -> None:
+    """Remove all counters of the given products and subtract them from the rollup. Does not commit."""
+    ids = sorted(set(product_ids))
+    if not ids:
+        return
+
+    removed = db.execute(
+        delete(AIContentStat)
+        .where(AIContentStat.product_id.in_(ids))
+        .returning(
+            AIContentStat.product_id,
+            AIContentStat.channel,
+            AIContentStat.content_type,
+            AIContentStat.last_model_used,
+            AIContentStat.generated_count,
+            AIContentStat.approved_count,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    generated: Counter = Counter()
+    approved: Counter = Counter()
+    for row in removed:
+        key = (row.channel, row.content_type, row.last_model_used, total_slot(row.product_id))
+        generated[key] -= row.generated_count
+        approved[key] -= row.approved_count
+    _apply_total_deltas(db, generated, approved)
+
+
+_REBUILD_SQL = """
+    SELECT
+        product_id, channel, content_type, COALESCE(last_model_used, '') AS last_model_used,
+        count(*) AS generated_count, count(*) FILTER (WHERE approved) AS approved_count
+    FROM (
+        SELECT product_id, channel, content_type, last_model_used, approved FROM ai_contents
+        UNION ALL
+        SELECT product_id, channel, content_type, last_model_used, approved FROM ai_contents_archive
+    ) AS all_contents
+    WHERE product_id = ANY(:product_ids)
+    GROUP BY product_id, channel, content_type, COALESCE(last_model_used, '')
+"""
+
+
+def _rebuild_products(db: Session, product_ids: List[int]) -> int:
+    """
+    Recompute the counters of some products and move the rollup by the difference.
+
+    Does not commit. Returns the number of counter rows written.
+    """
+    # Every counter writer bumps products.ai_contents_version in its transaction:
+    # locking the product rows orders this rebuild with those writers, for
+    # these products only
+    live = [
+        row.id
+        for row in db.query(Product.id, Product.deleted_at)
+        .filter(Product.id.in_(product_ids))
+        .order_by(Product.id)
+        .with_for_update(key_share=True)
+        .all()
+        if row.deleted_at is None
+    ]
+    delete_product_stats(db=db, product_ids=product_ids)
+    if not live:
+        return 0
+
+    # Soft-deleted products get no counters (their rows are dropped on delete)
+    rows = db.execute(text(_REBUILD_SQL), {"product_ids": live}).all()
+    generated: Counter = Counter()
+    approved: Counter = Counter()
+    for row in rows:
+        key = stat_key(row.product_id, row.channel, row.content_type, row.last_model_used)
+        generated[key] = row.generated_count
+        approved[key] = row.approved_count
+    apply_deltas(db, generated=generated, approved=approved)
+    return len(rows)
+
+
+def _rebuild_total_slot(db: Session, slot: int) -> None:
+    """
+    Reset one rollup slot to the sum of its products' counters. Does not commit.
+
+    The slot's rows are locked first: writers add their delta after this
+    transaction (and the new sums do not include it yet) or before it (and
+    the sums, read after the lock is granted, do).
+    """
+    key = (AIContentStatTotal.channel, AIContentStatTotal.content_type, AIContentStatTotal.last_model_used)
+    existing = (
+        db.query(*key)
+        .filter(AIContentStatTotal.slot == slot)
+        .order_by(*key)
+        .with_for_update()
+        .all()
+    )
+    sums = (
+        db.query(
+            AIContentStat.channel,
+            AIContentStat.content_type,
+            AIContentStat.last_model_used,
+            func.sum(AIContentStat.generated_count),
+            func.sum(AIContentStat.approved_count),
+        )
+        .filter(AIContentStat.product_id % settings.AI_CONTENT_STAT_TOTAL_SLOTS == slot)
+        .group_by(AIContentStat.channel, AIContentStat.content_type, AIContentStat.last_model_used)
+        .all()
+    )
+    totals = {tuple(row): (0, 0) for row in existing}
+    totals.update({tuple(row[:3]): tuple(row[3:]) for row in sums})
+    if not totals:
+        return
+
+    now = datetime.utcnow()
+    statement = insert(AIContentStatTotal).values(
+        [
+            {
+                "channel": channel,
+                "content_type": content_type,
+                "last_model_used": last_model_used,
+                "slot": slot,
+                "generated_count": generated_count,
+                "approved_count": approved_count,
+                "updated_at": now,
+            }
+            for (channel, content_type, last_model_used), (generated_count, approved_count) in sorted(totals.items())
+        ]
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[*key, AIContentStatTotal.slot],
+            set_={
+                "generated_count": statement.excluded.generated_count,
+                "approved_count": statement.excluded.approved_count,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+    )
+
+
+def rebuild_stats(db: Session, product_id: Optional[int] = None, batch_size: int = 1000) -> int:
+    """
+    Recompute counters from ai_contents (+ archive), one product or all
+    products in batches of `batch_size` (one transaction each). Commits.
+
+    Only the batch's product rows are locked, so writers for other products
+    carry on. A single product moves the rollup by its difference; a full
+    rebuild then recomputes the rollup slot by slot, so drift between the
+    two tables is corrected as well. Returns the number of (per-product)
+    counter rows written.
+    """
+    if product_id is not None:
+        written = _rebuild_products(db, [product_id])
+        db.commit()
+        return written
+
+    written = 0
+    last_id = 0
+    while True:
+        # Soft-deleted products too, so leftover counters of theirs are removed
+        ids = [
+            row.id
+            for row in db.query(Product.id)
+            .filter(Product.id > last_id)
+            .order_by(Product.id)
+            .limit(batch_size)
+            .all()
+        ]
+        if not ids:
+            break
+        written += _rebuild_products(db, ids)
+        db.commit()
+        last_id = ids[-1]
+
+    # Slots beyond AI_CONTENT_STAT_TOTAL_SLOTS remain after lowering it; they are zeroed
+    slots = {row.slot for row in db.query(AIContentStatTotal.slot).distinct().all()}
+    for slot in sorted(slots | set(range(settings.AI_CONTENT_STAT_TOTAL_SLOTS))):
+        _rebuild_total_slot(db, slot)
+        db.commit()
+    return written
@@ -0,0 +1,205 @@
+"""
+AIGenerationMetric repository.
+
+Responsibilities:
+- Store one metrics row per new AIContent (no commit; callers commit
+  together with the AIContent writes).
+- Summarize tokens, retries and p50 / p95 latencies per (model, channel)
+  over a time window.
+- Purge old metrics in bounded batches.
+"""
+
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Integer, cast, func, insert
+from sqlalchemy.orm import Session
+
+from app.domain.models.ai_content import AIContent
+from app.domain.models.ai_generation_metric import AIGenerationMetric
+from app.domain.schemas.ai_content import GenerationMetrics
+from app.infrastructure.db import sharding
+
+
+def add_metrics(
+    db: Session,
+    ai_contents: List[AIContent],
+    metrics: Sequence[Optional[GenerationMetrics]],
+) -> None:
+    """
+    Insert the metrics of new (flushed) rows with one multi-row INSERT.
+
+    Rows without metrics (manual content) are skipped. Does not commit.
+    """
+    rows = [
+        {
+            "ai_content_id": ai_content.id,
+            "product_id": ai_content.product_id,
+            "channel": ai_content.channel,
+            "content_type": ai_content.content_type,
+            "model": ai_content.last_model_used or "",
+            "prompt_tokens": m.prompt_tokens,
+            "completion_tokens": m.completion_tokens,
+            "wall_time_ms": m.wall_time_ms,
+            "provider_latency_ms": m.provider_latency_ms,
+            "retries": m.retries,
+            "cached": m.cached,
+            "created_at": ai_content.created_at,
+        }
+        for ai_content, m in zip(ai_contents, metrics)
+        if m is not None
+    ]
+    if rows:
+        db.execute(insert(AIGenerationMetric.__table__), rows)
+
+
+class MetricsSummaryRow(NamedTuple):
+    model: str
+    channel: str
+    generations: int
+    cached: int
+    prompt_tokens: int
+    completion_tokens: int
+    retries: int
+    wall_time_p50_ms: Optional[float]
+    wall_time_p95_ms: Optional[float]
+    provider_latency_p50_ms: Optional[float]
+    provider_latency_p95_ms: Optional[float]
+
+
+def _window_query(
+    db: Session,
+    columns: List,
+    since: datetime,
+    until: datetime,
+    product_id: Optional[int],
+    model: Optional[str],
+    channel: Optional[str],
+):
+    query = db.query(*columns).filter(
+        AIGenerationMetric.created_at >= since,
+        AIGenerationMetric.created_at < until,
+    )
+    if product_id is not None:
+        query = query.filter(AIGenerationMetric.product_id == product_id)
+    if model is not None:
+        query = query.filter(AIGenerationMetric.model == model)
+    if channel:
+        query = query.filter(AIGenerationMetric.channel == channel)
+    return query
+
+
+def get_summary(
+    db: Session,
+    since: datetime,
+    until: datetime,
+    product_id: Optional[int] = None,
+    model: Optional[str] = None,
+    channel: Optional[str] = None,
+) -> List[MetricsSummaryRow]:
+    """
+    Return totals and latency percentiles per (model, channel) for rows
+    created in [since, until).
+
+    On a single PostgreSQL database the aggregation runs in SQL
+    (percentile_cont). Percentiles cannot be merged across shards, so with
+    sharding (or another dialect) the window's rows are fetched and
+    aggregated here. NULL latencies are ignored.
+    """
+    if sharding.is_sharded(db) or db.get_bind().dialect.name != "postgresql":
+        return _summarize_rows(db, since, until, product_id, model, channel)
+
+    m = AIGenerationMetric
+    columns = [
+        m.model,
+        m.channel,
+        func.count().label("generations"),
+        func.sum(cast(m.cached, Integer)).label("cached"),
+        func.sum(m.prompt_tokens).label("prompt_tokens"),
+        func.sum(m.completion_tokens).label("completion_tokens"),
+        func.sum(m.retries).label("retries"),
+    ]
+    for column in (m.wall_time_ms, m.provider_latency_ms):
+        for fraction in (0.5, 0.95):
+            label = f"{column.key[:-3]}_p{int(fraction * 100)}_ms"
+            columns.append(func.percentile_cont(fraction).within_group(column).label(label))
+
+    rows = (
+        _window_query(db, columns, since, until, product_id, model, channel)
+        .group_by(m.model, m.channel)
+        .order_by(m.model, m.channel)
+        .all()
+    )
+    return [MetricsSummaryRow(*row) for row in rows]
+
+
+def _percentiles(values: List[Optional[float]]) -> Tuple[Optional[float], Optional[float]]:
+    """(p50, p95) of the non-NULL values, linear interpolation like percentile_cont."""
+    known = np.array([v for v in values if v is not None], dtype=np.float64)
+    if known.size == 0:
+        return None, None
+    p50, p95 = np.percentile(known, [50, 95])
+    return float(p50), float(p95)
+
+
+def _summarize_rows(
+    db: Session,
+    since: datetime,
+    until: datetime,
+    product_id: Optional[int],
+    model: Optional[str],
+    channel: Optional[str],
+) -> List[MetricsSummaryRow]:
+    m = AIGenerationMetric
+    columns = [
+        m.model,
+        m.channel,
+        m.cached,
+        m.prompt_tokens,
+        m.completion_tokens,
+        m.retries,
+        m.wall_time_ms,
+        m.provider_latency_ms,
+    ]
+    query = _window_query(db, columns, since, until, product_id, model, channel)
+    with sharding.pinned(db, product_id=product_id):
+        rows = query.all()
+
+    groups: Dict[Tuple[str, str], List] = {}
+    for row in rows:
+        groups.setdefault((row.model, row.channel), []).append(row)
+
+    summary = []
+    for (model_name, channel_name), group in sorted(groups.items()):
+        summary.append(
+            MetricsSummaryRow(
+                model_name,
+                channel_name,
+                len(group),
+                sum(1 for row in group if row.cached),
+                sum(row.prompt_tokens for row in group),
+                sum(row.completion_tokens for row in group),
+                sum(row.retries for row in group),
+                *_percentiles([row.wall_time_ms for row in group]),
+                *_percentiles([row.provider_latency_ms for row in group]),
+            )
+        )
+    return summary
+
+
+def purge_metrics(db: Session, older_than: datetime, batch_size: int = 5000) -> int:
+    """Delete one batch of metrics created before `older_than`. Returns rows deleted."""
+    ids = [
+        row.ai_content_id
+        for row in db.query(AIGenerationMetric.ai_content_id)
+        .filter(AIGenerationMetric.created_at < older_than)
+        .limit(batch_size)
+        .all()
+    ]
+    if ids:
+        db.query(AIGenerationMetric).filter(AIGenerationMetric.ai_content_id.in_(ids)).delete(
+            synchronize_session=False
+        )
+    db.commit()
+    return len(ids)
@@ -0,0 +1,103 @@
+"""
+AIPayload repository.
+
+Responsibilities:
+- Compute the canonical hash of AI payloads.
+- Store payloads once (content-addressed) and return their hashes.
+- Remove payloads that are no longer referenced.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.domain.models.ai_payload import AIPayload
+
+# An existing payload's last_referenced_at is rewritten at most this often
+# (the conflicting row is locked either way). Must stay well below the purge
+# grace period of the retention job.
+_REFERENCE_REFRESH_INTERVAL = timedelta(minutes=10)
+
+
+def canonical_json(payload: Dict[str, Any]) -> str:
+    """Serialize a payload deterministically (sorted keys, compact separators)."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def payload_hash(payload: Dict[str, Any]) -> str:
+    """SHA-256 hex digest of the canonical JSON of a payload."""
+    return hashlib.sha256(canonical_json(payload).encode("utf-8")).hexdigest()
+
+
+def get_payload(db: Session, hash_: str) -> Optional[AIPayload]:
+    """Return a stored payload by hash, or None if not found."""
+    return db.query(AIPayload).filter(AIPayload.hash == hash_).first()
+
+
+def store_payloads(db: Session, payloads: List[Dict[str, Any]]) -> List[str]:
+    """
+    Make sure every payload is stored and return their hashes (same order).
+
+    Uses INSERT ... ON CONFLICT DO UPDATE of last_referenced_at: existing
+    payloads stay row-locked until the caller commits, so the purge job
+    cannot delete one between this call and the INSERT referencing it.
+    Does not commit; callers commit together with the rows referencing the hashes.
+    """
+    hashes = [payload_hash(payload) for payload in payloads]
+    unique = {h: p for h, p in zip(hashes, payloads)}
+    if unique:
+        now = datetime.utcnow()
+        statement = insert(AIPayload).values(
+            [
+                {"hash": h, "payload": p, "created_at": now, "last_referenced_at": now}
+                # Sorted so concurrent writers lock rows in the same order
+                for h, p in sorted(unique.items())
+            ]
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[AIPayload.hash],
+                set_={"last_referenced_at": statement.excluded.last_referenced_at},
+                # Rows are locked even when this is false; it only skips the rewrite
+                where=AIPayload.last_referenced_at < now - _REFERENCE_REFRESH_INTERVAL,
+            )
+        )
+    return hashes
+
+
+def purge_unreferenced_payloads(db: Session, referenced_before: datetime, batch_size: int = 5000) -> int:
+    """
+    Delete one batch of payloads no AI content (live or archived) references.
+
+    Only payloads last referenced before `referenced_before` are considered.
+    The check is repeated in the DELETE itself: a payload that `store_payloads`
+    refreshed meanwhile (it waits for that transaction's row lock, then sees
+    the new last_referenced_at) is kept.
+    """
+    removed = db.execute(
+        text(
+            """
+            WITH orphans AS (
+                SELECT p.hash FROM ai_payloads AS p
+                WHERE p.last_referenced_at < :referenced_before
+                  AND NOT EXISTS (SELECT 1 FROM ai_contents AS c WHERE c.payload_hash = p.hash)
+                  AND NOT EXISTS (SELECT 1 FROM ai_contents_archive AS a WHERE a.payload_hash = p.hash)
+                LIMIT :batch_size
+            ),
+            removed AS (
+                DELETE FROM ai_payloads AS p USING orphans
+                WHERE p.hash = orphans.hash AND p.last_referenced_at < :referenced_before
+                RETURNING 1
+            )
+            SELECT count(*) FROM removed
+            """
+        ),
+        {"referenced_before": referenced_before, "batch_size": batch_size},
+    ).scalar_one()
+    db.commit()
+    return removed
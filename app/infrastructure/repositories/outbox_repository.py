@@ -0,0 +1,156 @@
+"""
+Outbox repository.
+
+Responsibilities:
+- Record change events in the caller's transaction (no commit).
+- Claim pending events for delivery (FOR UPDATE SKIP LOCKED).
+- Record per-sink delivery, failures (backoff, then dead-letter) and purge
+  old delivered events.
+- Requeue dead-lettered events.
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session
+
+from app.domain.models.outbox_event import OutboxEvent
+from app.infrastructure.db import sharding
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def build_event(
+    aggregate_type: str,
+    aggregate_id: int,
+    event_type: str,
+    payload: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Build one outbox row (as a dict) with a JSON-safe payload."""
+    return {
+        "aggregate_type": aggregate_type,
+        "aggregate_id": aggregate_id,
+        "event_type": event_type,
+        "payload": {key: _jsonable(value) for key, value in payload.items()},
+        "created_at": datetime.utcnow(),
+    }
+
+
+def add_events(db: Session, events: List[Dict[str, Any]]) -> None:
+    """
+    Insert outbox rows built with `build_event` (one multi-row INSERT).
+
+    Does not commit; the events become visible with the caller's transaction.
+    With sharding, events get globally unique IDs (consumers de-duplicate on id).
+    """
+    if events:
+        ids = sharding.allocate_ids(db, "outbox_events", len(events))
+        if ids is not None:
+            events = [dict(event, id=event_id) for event, event_id in zip(events, ids)]
+        db.execute(insert(OutboxEvent.__table__), events)
+
+
+def claim_pending(db: Session, batch_size: int) -> List[OutboxEvent]:
+    """
+    Lock and return up to batch_size pending events, oldest first.
+
+    Rows locked by another dispatcher are skipped (FOR UPDATE SKIP LOCKED),
+    so several dispatchers can drain the outbox in parallel. Dead-lettered
+    events are never claimed.
+    """
+    now = datetime.utcnow()
+    return (
+        db.query(OutboxEvent)
+        .filter(
+            OutboxEvent.dispatched_at.is_(None),
+            OutboxEvent.dead_lettered_at.is_(None),
+            or_(OutboxEvent.next_attempt_at.is_(None), OutboxEvent.next_attempt_at <= now),
+        )
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+
+def mark_delivered_to(events: List[OutboxEvent], sink_key: str) -> None:
+    """Record (in memory) that a sink accepted these events; saved by `finish_attempt`."""
+    for event in events:
+        if sink_key not in event.delivered_sinks:
+            event.delivered_sinks = event.delivered_sinks + [sink_key]
+
+
+def finish_attempt(
+    db: Session,
+    events: List[OutboxEvent],
+    sink_keys: List[str],
+    errors: Dict[int, str],
+    retry_in: Callable[[int], timedelta],
+    max_attempts: int,
+) -> int:
+    """
+    Settle one delivery attempt and commit (releases the row locks).
+
+    Events every sink accepted are marked dispatched. Events in `errors`
+    (id -> message) count a failed attempt: they are retried after
+    `retry_in(attempts)`, or dead-lettered once they reach `max_attempts`.
+    Other events were not attempted and stay pending untouched.
+    Returns the number of events dead-lettered.
+    """
+    now = datetime.utcnow()
+    dead = 0
+    for event in events:
+        if all(key in event.delivered_sinks for key in sink_keys):
+            event.dispatched_at = now
+            event.attempts += 1
+            event.last_error = None
+        elif event.id in errors:
+            event.attempts += 1
+            event.last_error = errors[event.id][:1000]
+            if event.attempts >= max_attempts:
+                event.dead_lettered_at = now
+                dead += 1
+            else:
+                event.next_attempt_at = now + retry_in(event.attempts)
+    db.commit()
+    return dead
+
+
+def requeue_dead_letters(db: Session, ids: Optional[List[int]] = None) -> int:
+    """Make dead-lettered events (all, or `ids`) pending again with fresh attempts. Commits."""
+    query = db.query(OutboxEvent).filter(OutboxEvent.dead_lettered_at.is_not(None))
+    if ids:
+        query = query.filter(OutboxEvent.id.in_(ids))
+    requeued = query.update(
+        {
+            OutboxEvent.dead_lettered_at: None,
+            OutboxEvent.attempts: 0,
+            OutboxEvent.next_attempt_at: None,
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+    return requeued
+
+
+def purge_dispatched(db: Session, older_than: datetime, batch_size: int = 5000) -> int:
+    """Delete one batch of events delivered before `older_than`. Returns rows deleted."""
+    ids = [
+        row.id
+        for row in db.query(OutboxEvent.id)
+        .filter(OutboxEvent.dispatched_at.is_not(None), OutboxEvent.dispatched_at < older_than)
+        .limit(batch_size)
+        .all()
+    ]
+    if ids:
+        db.query(OutboxEvent).filter(OutboxEvent.id.in_(ids)).delete(synchronize_session=False)
+    db.commit()
+    return len(ids)
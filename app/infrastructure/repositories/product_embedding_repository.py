@@ -0,0 +1,99 @@
+"""
+ProductEmbedding repository.
+
+Responsibilities:
+- Store product embeddings (upsert, no commit; callers commit together with
+  the product write).
+- Re-embed products in bulk (backfill job, change of EMBEDDING_DIMS).
+- Read embeddings changed since a watermark for the in-memory index.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.models.product import Product
+from app.domain.models.product_embedding import ProductEmbedding
+from app.infrastructure.ai import embeddings
+from app.infrastructure.db import sharding
+
+
+def upsert_embeddings(db: Session, products: List[Product]) -> None:
+    """
+    Embed products and store the vectors with one INSERT ... ON CONFLICT DO UPDATE.
+
+    Rows whose embedded fields (and dims) did not change are left alone, so
+    their updated_at does not move. Does not commit.
+    """
+    if not products:
+        return
+
+    dims = settings.EMBEDDING_DIMS
+    now = datetime.utcnow()
+    rows = [
+        {
+            "product_id": product.id,
+            "dims": dims,
+            "vector": embeddings.to_bytes(embeddings.embed_product(product, dims)),
+            "text_hash": embeddings.text_hash(product),
+            "updated_at": now,
+        }
+        # Sorted so concurrent writers lock rows in the same order
+        for product in sorted(products, key=lambda p: p.id)
+    ]
+    statement = insert(ProductEmbedding).values(rows)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ProductEmbedding.product_id],
+            set_={
+                "dims": statement.excluded.dims,
+                "vector": statement.excluded.vector,
+                "text_hash": statement.excluded.text_hash,
+                "updated_at": statement.excluded.updated_at,
+            },
+            where=(ProductEmbedding.text_hash.is_distinct_from(statement.excluded.text_hash))
+            | (ProductEmbedding.dims != statement.excluded.dims),
+        )
+    )
+
+
+def rebuild_embeddings(db: Session, products: List[Product]) -> int:
+    """
+    Upsert embeddings of products from any shard, one transaction per shard. Commits.
+    """
+    for shard_products in sharding.split_by_shard(db, products, lambda product: product.id):
+        with sharding.pinned(db, product_id=shard_products[0].id):
+            upsert_embeddings(db=db, products=shard_products)
+            db.commit()
+    return len(products)
+
+
+def get_embeddings_updated_since(
+    db: Session,
+    since: Optional[datetime],
+    dims: int,
+    after_product_id: int = 0,
+    limit: int = 10000,
+) -> List[ProductEmbedding]:
+    """
+    Return embeddings of `dims` size changed at or after `since` (all when None),
+    ordered by (updated_at, product_id).
+
+    Page with `since` / `after_product_id` = the last row of the previous page.
+    """
+    query = db.query(ProductEmbedding).filter(ProductEmbedding.dims == dims)
+    if since is not None:
+        query = query.filter(
+            (ProductEmbedding.updated_at > since)
+            | ((ProductEmbedding.updated_at == since) & (ProductEmbedding.product_id > after_product_id))
+        )
+
+    return sharding.scatter_gather(
+        db,
+        query.order_by(ProductEmbedding.updated_at, ProductEmbedding.product_id),
+        key=lambda row: (row.updated_at, row.product_id),
+        limit=limit,
+    )
@@ -4,42 +4,150 @@ Product repository.
 Responsibilities:
 - Encapsulate all database operations related to Product.
 - Provide a clean API for the service / API layers.
+
+Deleting is soft (deleted_at is set); every read here skips deleted rows.
+The purge job removes deleted products and their AI contents later.
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
 
+from sqlalchemy import delete, func, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
 from app.domain.models.product import Product
 from app.domain.schemas.product import ProductCreate, ProductUpdate
+from app.infrastructure.db import sharding
+from app.infrastructure.repositories import (
+    ai_content_stats_repository,
+    outbox_repository,
+    product_embedding_repository,
+)
+
+
+def _product_event(product: Product, event_type: str) -> dict:
+    """Outbox event carrying the current state of a product."""
+    return outbox_repository.build_event(
+        aggregate_type="product",
+        aggregate_id=product.id,
+        event_type=event_type,
+        payload={
+            "id": product.id,
+            "name": product.name,
+            "sku": product.sku,
+            "price": product.price,
+            "is_active": product.is_active,
+        },
+    )
 
 
 def get_product(db: Session, product_id: int) -> Optional[Product]:
     """Return a single product by ID, or None if not found."""
-    return db.query(Product).filter(Product.id == product_id).first()
+    return (
+        db.query(Product)
+        .filter(Product.id == product_id, Product.deleted_at.is_(None))
+        .first()
+    )
 
 
-def get_products(db: Session, skip: int = 0, limit: int = 50) -> List[Product]:
-    """Return a list of products with pagination."""
+def get_products_by_ids(db: Session, product_ids: Iterable[int]) -> List[Product]:
+    """Return the live products among `product_ids` (any order)."""
+    ids = list(set(product_ids))
+    if not ids:
+        return []
     return (
         db.query(Product)
-        .order_by(Product.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+        .filter(Product.id.in_(ids), Product.deleted_at.is_(None))
         .all()
     )
 
 
+def get_product_versions(db: Session, product_id: int) -> Optional[Row]:
+    """
+    Return (version, ai_contents_version) of a product without loading the row.
+
+    Used for cheap ETag checks before full loading / serialization.
+    """
+    return (
+        db.query(Product.version, Product.ai_contents_version)
+        .filter(Product.id == product_id, Product.deleted_at.is_(None))
+        .first()
+    )
+
+
+def bump_ai_contents_version(db: Session, product_ids: Iterable[int]) -> None:
+    """
+    Increment ai_contents_version of the given products. Does not commit.
+
+    Does not touch `version`: the product itself did not change.
+    """
+    ids = sorted(set(product_ids))  # stable lock order across concurrent writers
+    if ids:
+        db.execute(
+            update(Product)
+            .where(Product.id.in_(ids))
+            .values(ai_contents_version=Product.ai_contents_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def get_products(db: Session, skip: int = 0, limit: int = 50) -> List[Product]:
+    """Return a list of products with pagination (merged across shards, newest first)."""
+    query = (
+        db.query(Product)
+        .filter(Product.deleted_at.is_(None))
+        .order_by(Product.created_at.desc(), Product.id.desc())
+    )
+    return sharding.scatter_gather(
+        db,
+        query,
+        key=lambda product: (product.created_at, product.id),
+        limit=limit,
+        offset=skip,
+        reverse=True,
+    )
+
+
+def iter_products(
+    db: Session, batch_size: int = 1000, only_active: bool = True
+) -> Iterator[List[Product]]:
+    """
+    Yield all products in batches, ordered by ID.
+
+    Uses keyset pagination (id > last_id) so late batches stay as cheap as early ones.
+    """
+    last_id = 0
+    while True:
+        query = db.query(Product).filter(Product.id > last_id, Product.deleted_at.is_(None))
+        if only_active:
+            query = query.filter(Product.is_active.is_(True))
+
+        batch = sharding.scatter_gather(
+            db, query.order_by(Product.id), key=lambda product: product.id, limit=batch_size
+        )
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id
+
+
 def create_product(db: Session, data: ProductCreate) -> Product:
     """Create and persist a new product."""
     product = Product(
+        id=sharding.allocate_id(db, "products"),  # None (serial) when not sharded
         name=data.name,
         sku=data.sku,
         price=data.price,
     )
-    db.add(product)
-    db.commit()
-    db.refresh(product)
+    with sharding.pinned(db, product_id=product.id):
+        db.add(product)
+        db.flush()
+        db.refresh(product)  # load server defaults (is_active, created_at) for the event
+        product_embedding_repository.upsert_embeddings(db=db, products=[product])
+        outbox_repository.add_events(db, [_product_event(product, "product.created")])
+        db.commit()
+        db.refresh(product)
     return product
 
 
@@ -52,13 +160,61 @@ def update_product(
     for field, value in update_data.items():
         setattr(product, field, value)
 
-    db.add(product)
-    db.commit()
-    db.refresh(product)
+    with sharding.pinned(db, product_id=product.id):
+        db.add(product)
+        # No-op unless name / SKU / price changed
+        product_embedding_repository.upsert_embeddings(db=db, products=[product])
+        outbox_repository.add_events(db, [_product_event(product, "product.updated")])
+        db.commit()
+        db.refresh(product)
     return product
 
 
 def delete_product(db: Session, product: Product) -> None:
-    """Delete an existing product."""
-    db.delete(product)
+    """
+    Soft-delete an existing product.
+
+    Only the product row is touched, so the request does not depend on how
+    many AI contents it has. Its counters are dropped right away.
+    """
+    product.deleted_at = func.now()
+    with sharding.pinned(db, product_id=product.id):
+        db.add(product)
+        ai_content_stats_repository.delete_product_stats(db=db, product_ids=[product.id])
+        outbox_repository.add_events(db, [_product_event(product, "product.deleted")])
+        db.commit()
+
+
+def get_deleted_product_ids(
+    db: Session, deleted_before: datetime, limit: int = 100
+) -> List[int]:
+    """Return IDs of products soft-deleted before `deleted_before`."""
+    rows = (
+        db.query(Product.id)
+        .filter(Product.deleted_at < deleted_before)
+        .order_by(Product.id)
+        .limit(limit)
+        .all()
+    )
+    return [row.id for row in rows]
+
+
+def purge_products(db: Session, product_ids: List[int]) -> int:
+    """
+    Hard-delete soft-deleted products. Commits.
+
+    Call after their AI contents were removed in batches: the ON DELETE
+    CASCADE then only has stragglers left to remove.
+    """
+    ids = sorted(set(product_ids))
+    if not ids:
+        return 0
+
+    ai_content_stats_repository.delete_product_stats(db=db, product_ids=ids)
+    result = db.execute(
+        delete(Product)
+        .where(Product.id.in_(ids), Product.deleted_at.is_not(None))
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
+    return result.rowcount
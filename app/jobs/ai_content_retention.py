@@ -0,0 +1,108 @@
+"""
+ai_contents partition maintenance and retention job.
+
+Usage:
+    python -m app.jobs.ai_content_retention
+    python -m app.jobs.ai_content_retention --days 30 --drop
+
+Run periodically (e.g. daily from cron). Each run:
+- creates upcoming monthly partitions,
+- archives (or drops with --drop) superseded unapproved generations older
+  than N days, in bounded batches, keeping approved and latest rows,
+- drops old monthly partitions that ended up empty,
+- removes deduplicated payloads no row references any more,
+- deletes generation metrics older than AI_METRICS_RETENTION_DAYS.
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.infrastructure.db.partitions import (
+    drop_empty_ai_contents_partitions,
+    ensure_ai_contents_partitions,
+)
+from app.infrastructure.db import sharding
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.repositories import (
+    ai_content_repository,
+    ai_generation_metrics_repository,
+    ai_payload_repository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ai_contents partition maintenance and retention.")
+    parser.add_argument("--days", type=int, default=settings.AI_CONTENT_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.AI_CONTENT_RETENTION_BATCH_SIZE)
+    parser.add_argument("--months-ahead", type=int, default=settings.AI_CONTENT_PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--metrics-days", type=int, default=settings.AI_METRICS_RETENTION_DAYS)
+    parser.add_argument("--drop", action="store_true", help="Delete instead of archiving.")
+    parser.add_argument("--pause", type=float, default=0.1, help="Seconds to sleep between batches.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
+
+    db = SessionLocal()
+    try:
+        # Partitions, archives, payloads and metrics are per database: visit every shard
+        for shard_id in sharding.shard_ids(db):
+            with sharding.pinned(db, shard_id=shard_id):
+                created = ensure_ai_contents_partitions(db, months_ahead=args.months_ahead)
+                logger.info("Created %d partitions", created)
+
+                total = 0
+                while True:
+                    removed = ai_content_repository.purge_superseded_ai_contents(
+                        db=db,
+                        older_than=cutoff,
+                        archive=not args.drop,
+                        batch_size=args.batch_size,
+                    )
+                    total += removed
+                    if removed < args.batch_size:
+                        break
+                    time.sleep(args.pause)
+                logger.info("%s %d superseded AI contents", "Dropped" if args.drop else "Archived", total)
+
+                dropped = drop_empty_ai_contents_partitions(db, older_than=cutoff)
+                logger.info("Dropped empty partitions: %s", ", ".join(dropped) or "none")
+
+                orphans = 0
+                payload_cutoff = datetime.now(timezone.utc) - timedelta(days=1)
+                while True:
+                    removed = ai_payload_repository.purge_unreferenced_payloads(
+                        db=db,
+                        referenced_before=payload_cutoff,
+                        batch_size=args.batch_size,
+                    )
+                    orphans += removed
+                    if removed < args.batch_size:
+                        break
+                    time.sleep(args.pause)
+                logger.info("Removed %d unreferenced payloads", orphans)
+
+                metrics = 0
+                metrics_cutoff = datetime.now(timezone.utc) - timedelta(days=args.metrics_days)
+                while True:
+                    removed = ai_generation_metrics_repository.purge_metrics(
+                        db=db,
+                        older_than=metrics_cutoff,
+                        batch_size=args.batch_size,
+                    )
+                    metrics += removed
+                    if removed < args.batch_size:
+                        break
+                    time.sleep(args.pause)
+                logger.info("Removed %d generation metrics", metrics)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Analytics snapshots of products and AI contents.
+
+Usage:
+    python -m app.jobs.analytics_snapshot export
+    python -m app.jobs.analytics_snapshot export --dir /data/snapshots --format npz
+    python -m app.jobs.analytics_snapshot query --table ai_contents --group-by channel,content_type
+    python -m app.jobs.analytics_snapshot query --table ai_contents --where channel=ebay \\
+        --from 2026-01-01 --group-by last_model_used --agg mean --value description_length
+
+`export` is incremental: each run rewrites the products snapshot and appends
+AI contents created since the last run as new part files. Point
+ANALYTICS_DATABASE_URL at a read replica to keep the export off the primary.
+`query` runs locally on the snapshot files only.
+"""
+
+import argparse
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.domain.services.analytics_snapshot_service import AnalyticsSnapshotService
+from app.infrastructure.analytics import snapshots
+from app.infrastructure.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _session():
+    if settings.ANALYTICS_DATABASE_URL:
+        return sessionmaker(bind=create_engine(settings.ANALYTICS_DATABASE_URL, future=True))()
+    return SessionLocal()
+
+
+def _parse_where(value: str):
+    name, _, expected = value.partition("=")
+    if not name or not _:
+        raise argparse.ArgumentTypeError("Condition must look like 'column=value'.")
+    return name, expected
+
+
+def _export(args: argparse.Namespace) -> None:
+    db = _session()
+    try:
+        summary = AnalyticsSnapshotService.export(
+            db=db,
+            snapshot_dir=args.dir,
+            fmt=args.format,
+            batch_size=settings.ANALYTICS_EXPORT_BATCH_SIZE,
+            rows_per_part=settings.ANALYTICS_EXPORT_ROWS_PER_PART,
+            lag_seconds=settings.ANALYTICS_EXPORT_LAG_SECONDS,
+        )
+    finally:
+        db.close()
+    logger.info(
+        "Done: %d products, %d new AI contents in %d parts",
+        summary.products,
+        summary.ai_contents,
+        summary.parts,
+    )
+
+
+def _query(args: argparse.Namespace) -> None:
+    data = snapshots.read_table(
+        args.dir,
+        args.table,
+        created_from=args.created_from,
+        created_to=args.created_to,
+    )
+    for name, expected in args.where:
+        column = data[name]
+        value = expected
+        if column.dtype.kind in "iu":
+            value = int(expected)
+        elif column.dtype.kind == "f":
+            value = float(expected)
+        elif column.dtype.kind == "b":
+            value = expected.lower() in ("1", "true", "yes")
+        data = snapshots.where_equal(data, **{name: value})
+
+    if not args.group_by:
+        print(json.dumps({"rows": len(data.get("id", []))}))
+        return
+
+    groups = snapshots.group_by(data, args.group_by.split(","), value=args.value, agg=args.agg)
+    for group in groups[: args.limit]:
+        print(json.dumps(group, default=str))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Columnar analytics snapshots.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="Export products and new AI contents.")
+    export.add_argument("--dir", default=settings.ANALYTICS_SNAPSHOT_DIR)
+    export.add_argument("--format", choices=["parquet", "npz"], default=None, help="Default: parquet if pyarrow is installed.")
+
+    query = sub.add_parser("query", help="Count / aggregate rows of a snapshot locally.")
+    query.add_argument("--dir", default=settings.ANALYTICS_SNAPSHOT_DIR)
+    query.add_argument("--table", choices=["products", "ai_contents"], default="ai_contents")
+    query.add_argument("--from", dest="created_from", type=datetime.fromisoformat, default=None)
+    query.add_argument("--to", dest="created_to", type=datetime.fromisoformat, default=None)
+    query.add_argument("--where", type=_parse_where, action="append", default=[])
+    query.add_argument("--group-by", default=None, help="Comma-separated columns.")
+    query.add_argument("--agg", choices=["count", "sum", "mean"], default="count")
+    query.add_argument("--value", default=None, help="Numeric column for sum / mean.")
+    query.add_argument("--limit", type=int, default=50)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "export":
+        _export(args)
+    else:
+        _query(args)
+
+
+if __name__ == "__main__":
+    main()
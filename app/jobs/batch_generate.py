@@ -0,0 +1,78 @@
+"""
+Batch AI generation job.
+
+Usage:
+    python -m app.jobs.batch_generate --target ebay:full_listing --target instagram:caption
+    python -m app.jobs.batch_generate --target ebay:title --provider local --work-dir /tmp/batches
+    python -m app.jobs.batch_generate --target ebay:full_listing --reuse-similar
+
+Collects pending (product, target) requests into JSONL batch files, submits them
+through the configured batch provider, waits for completion and bulk-writes the
+results into ai_contents.
+"""
+
+import argparse
+import logging
+
+from app.core.config import settings
+from app.domain.schemas.ai_content import GenerationTarget
+from app.domain.services.batch_generation_service import BatchGenerationService
+from app.infrastructure.ai import runtime as ai_runtime
+from app.infrastructure.ai.batch import get_batch_provider
+from app.infrastructure.db.session import SessionLocal
+
+
+def parse_target(value: str) -> GenerationTarget:
+    channel, _, content_type = value.partition(":")
+    if not channel or not content_type:
+        raise argparse.ArgumentTypeError("Target must look like 'channel:content_type'.")
+    return GenerationTarget(channel=channel, content_type=content_type)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Catalog-wide batch AI generation.")
+    parser.add_argument("--target", type=parse_target, action="append", required=True)
+    parser.add_argument("--model", default=settings.AI_DEFAULT_MODEL)
+    parser.add_argument("--provider", default=settings.AI_BATCH_PROVIDER, choices=["openai", "local"])
+    parser.add_argument("--work-dir", default="batch_work")
+    parser.add_argument("--max-requests", type=int, default=settings.AI_BATCH_MAX_REQUESTS)
+    parser.add_argument("--poll-interval", type=float, default=settings.AI_BATCH_POLL_INTERVAL_SECONDS)
+    parser.add_argument("--include-existing", action="store_true", help="Regenerate products that already have content.")
+    parser.add_argument(
+        "--reuse-similar",
+        action="store_true",
+        help="Adapt approved content of similar products first; only the rest is sent to the model.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    db = SessionLocal()
+    try:
+        summary = BatchGenerationService.run(
+            db=db,
+            provider=get_batch_provider(args.provider, work_dir=args.work_dir),
+            targets=args.target,
+            model_name=args.model,
+            work_dir=args.work_dir,
+            max_requests_per_file=args.max_requests,
+            poll_interval=args.poll_interval,
+            only_missing=not args.include_existing,
+            reuse_similar=args.reuse_similar,
+        )
+    finally:
+        db.close()
+        ai_runtime.shutdown()
+
+    logging.info(
+        "Done: %d reused, %d batches, %d results, %d inserted, %d failed",
+        summary.reused,
+        len(summary.batch_ids),
+        summary.requested,
+        summary.inserted,
+        summary.failed,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Build / refresh product embeddings (used for similar-product content reuse).
+
+Usage:
+    python -m app.jobs.build_product_embeddings
+    python -m app.jobs.build_product_embeddings --batch-size 2000
+
+Embeddings are maintained on every product write; run this once after the
+migration to backfill existing products, and after changing EMBEDDING_DIMS.
+Products whose embedded fields did not change are not rewritten.
+"""
+
+import argparse
+import logging
+
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.repositories import product_embedding_repository, product_repository
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill product embeddings.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    db = SessionLocal()
+    total = 0
+    try:
+        for products in product_repository.iter_products(db=db, batch_size=args.batch_size, only_active=False):
+            total += product_embedding_repository.rebuild_embeddings(db=db, products=products)
+            logger.info("Embedded %d products", total)
+    finally:
+        db.close()
+
+    logger.info("Done: %d products embedded", total)
+
+
+if __name__ == "__main__":
+    main()
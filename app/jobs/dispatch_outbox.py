@@ -0,0 +1,81 @@
+"""
+Outbox dispatcher job.
+
+Usage:
+    python -m app.jobs.dispatch_outbox --webhook http://127.0.0.1:8081/
+    python -m app.jobs.dispatch_outbox --file events.jsonl --once
+    python -m app.jobs.dispatch_outbox --requeue-dead-letters
+
+Drains outbox_events in batches and pushes them to the configured sinks.
+Several instances may run concurrently (rows are claimed with SKIP LOCKED).
+Events that fail OUTBOX_MAX_ATTEMPTS times are dead-lettered; requeue them
+once the cause is fixed.
+"""
+
+import argparse
+import logging
+from datetime import timedelta
+
+from app.core.config import settings
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.outbox.dispatcher import OutboxDispatcher
+from app.infrastructure.outbox.sinks import FileSink, WebhookSink
+from app.infrastructure.repositories import outbox_repository
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Deliver outbox events to sinks.")
+    parser.add_argument("--webhook", action="append", default=[], help="Webhook URL (repeatable).")
+    parser.add_argument("--file", action="append", default=[], help="JSONL file path (repeatable).")
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    parser.add_argument("--poll-interval", type=float, default=settings.OUTBOX_POLL_INTERVAL_SECONDS)
+    parser.add_argument("--max-attempts", type=int, default=settings.OUTBOX_MAX_ATTEMPTS)
+    parser.add_argument("--once", action="store_true", help="Deliver a single batch and exit.")
+    parser.add_argument(
+        "--requeue-dead-letters",
+        nargs="*",
+        type=int,
+        metavar="ID",
+        help="Make dead-lettered events (all, or the given IDs) pending again and exit.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.requeue_dead_letters is not None:
+        db = SessionLocal()
+        try:
+            requeued = outbox_repository.requeue_dead_letters(db, ids=args.requeue_dead_letters)
+        finally:
+            db.close()
+        logging.info("Requeued %d dead-lettered events", requeued)
+        return
+
+    webhooks = args.webhook or ([settings.OUTBOX_WEBHOOK_URL] if settings.OUTBOX_WEBHOOK_URL else [])
+    sinks = [WebhookSink(url, timeout_seconds=settings.OUTBOX_WEBHOOK_TIMEOUT_SECONDS) for url in webhooks]
+    sinks += [FileSink(path) for path in args.file]
+    if not sinks:
+        parser.error("Configure at least one sink (--webhook, --file or OUTBOX_WEBHOOK_URL).")
+
+    dispatcher = OutboxDispatcher(
+        session_factory=SessionLocal,
+        sinks=sinks,
+        batch_size=args.batch_size,
+        max_attempts=args.max_attempts,
+    )
+    if args.once:
+        try:
+            logging.info("Delivered %d events", dispatcher.run_once())
+        finally:
+            for sink in sinks:
+                sink.close()
+        return
+
+    dispatcher.run_forever(
+        poll_interval=args.poll_interval,
+        retention=timedelta(hours=settings.OUTBOX_RETENTION_HOURS),
+    )
+
+
+if __name__ == "__main__":
+    main()
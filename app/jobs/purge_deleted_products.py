@@ -0,0 +1,71 @@
+"""
+Purge soft-deleted products.
+
+Usage:
+    python -m app.jobs.purge_deleted_products
+    python -m app.jobs.purge_deleted_products --grace-hours 0 --batch-size 1000
+
+Run periodically (e.g. hourly from cron). Products deleted more than the
+grace period ago are removed for good: their AI contents (live and archived)
+go first in bounded batches, then the product rows themselves. Payloads that
+end up unreferenced are collected by the ai_content_retention job.
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.infrastructure.db import sharding
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.repositories import ai_content_repository, product_repository
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Remove soft-deleted products and their AI contents.")
+    parser.add_argument("--grace-hours", type=int, default=settings.PRODUCT_PURGE_GRACE_HOURS)
+    parser.add_argument("--batch-size", type=int, default=settings.PRODUCT_PURGE_BATCH_SIZE)
+    parser.add_argument(
+        "--products-per-batch", type=int, default=settings.PRODUCT_PURGE_PRODUCTS_PER_BATCH
+    )
+    parser.add_argument("--pause", type=float, default=0.1, help="Seconds to sleep between batches.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=args.grace_hours)
+
+    db = SessionLocal()
+    try:
+        products = contents = 0
+        # Each shard purges the products it owns
+        for shard_id in sharding.shard_ids(db):
+            with sharding.pinned(db, shard_id=shard_id):
+                while True:
+                    product_ids = product_repository.get_deleted_product_ids(
+                        db=db, deleted_before=cutoff, limit=args.products_per_batch
+                    )
+                    if not product_ids:
+                        break
+
+                    while True:
+                        removed = ai_content_repository.delete_ai_contents_of_products(
+                            db=db, product_ids=product_ids, batch_size=args.batch_size
+                        )
+                        contents += removed
+                        if removed == 0:
+                            break
+                        time.sleep(args.pause)
+
+                    products += product_repository.purge_products(db=db, product_ids=product_ids)
+                    time.sleep(args.pause)
+    finally:
+        db.close()
+
+    logger.info("Purged %d products and %d AI contents", products, contents)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Shard maintenance and rebalancing tool.
+
+Usage:
+    python -m app.jobs.rebalance_shards create-schema --map shards.json   # local SQLite/Postgres shards
+    python -m app.jobs.rebalance_shards seed-ids --map shards.json
+    python -m app.jobs.rebalance_shards plan --from shards.json --to shards.new.json
+    python -m app.jobs.rebalance_shards copy --from shards.json --to shards.new.json
+    python -m app.jobs.rebalance_shards cleanup --from shards.json --to shards.new.json
+
+Moving to a new shard map:
+1. `copy` while the app still runs on the old map (repeatable, idempotent),
+2. point SHARD_MAP_PATH at the new map and restart the app,
+3. `copy` once more to pick up writes made in between,
+4. `cleanup` to delete moved products from their old shards.
+"""
+
+import argparse
+import logging
+import time
+from typing import Dict
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.infrastructure.db import rebalance
+from app.infrastructure.db.session import Base
+from app.infrastructure.db.sharding import HashRing, IdAllocator, ShardMap, load_shard_map
+
+logger = logging.getLogger(__name__)
+
+_engines: Dict[str, Engine] = {}
+
+
+def _engine(url: str) -> Engine:
+    if url not in _engines:
+        _engines[url] = create_engine(url, future=True)
+    return _engines[url]
+
+
+def _ring(shard_map: ShardMap) -> HashRing:
+    return HashRing(list(shard_map.shards), vnodes=shard_map.vnodes)
+
+
+def _move(old: ShardMap, new: ShardMap, mode: str, batch_size: int, pause: float) -> None:
+    ring = _ring(new)
+    total = rebalance.MoveSummary()
+    for shard_id, url in old.shards.items():
+        source = _engine(url)
+        with source.connect() as conn:
+            batches = list(rebalance.iter_misplaced_product_ids(conn, shard_id, ring, batch_size=batch_size))
+
+        for product_ids in batches:
+            by_target: Dict[str, list] = {}
+            for product_id in product_ids:
+                by_target.setdefault(ring.shard_for(product_id), []).append(product_id)
+
+            for target_id, ids in by_target.items():
+                if mode == "plan":
+                    logger.info("%s -> %s: %d products", shard_id, target_id, len(ids))
+                    total.products += len(ids)
+                    continue
+                target = _engine(new.shards[target_id])
+                if mode == "copy":
+                    summary = rebalance.copy_products(source, target, ids)
+                else:
+                    summary = rebalance.cleanup_moved_products(source, target, ids)
+                total.add(summary)
+                time.sleep(pause)
+
+    logger.info(
+        "%s: %d products, %d AI contents, %d archived, %d unchanged, %d conflicts %s",
+        mode,
+        total.products,
+        total.ai_contents,
+        total.archived,
+        total.skipped,
+        len(total.conflicts),
+        total.conflicts[:20],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shard maintenance and rebalancing.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("create-schema", "seed-ids"):
+        command = sub.add_parser(name)
+        command.add_argument("--map", required=True, help="Shard map JSON file.")
+
+    for name in ("plan", "copy", "cleanup"):
+        command = sub.add_parser(name)
+        command.add_argument("--from", dest="old", required=True, help="Current shard map.")
+        command.add_argument("--to", dest="new", required=True, help="Target shard map.")
+        command.add_argument("--batch-size", type=int, default=500)
+        command.add_argument("--pause", type=float, default=0.05, help="Seconds to sleep between batches.")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "create-schema":
+        # Development / tests only: production shards are migrated with Alembic
+        for shard_id, url in load_shard_map(args.map).shards.items():
+            Base.metadata.create_all(_engine(url))
+            logger.info("Created schema on %s", shard_id)
+        return
+
+    if args.command == "seed-ids":
+        shard_map = load_shard_map(args.map)
+        allocator = IdAllocator(_engine(shard_map.directory_url), block_size=settings.SHARD_ID_BLOCK_SIZE)
+        floors = rebalance.seed_id_floors([_engine(url) for url in shard_map.shards.values()], allocator)
+        logger.info("ID floors: %s", floors)
+        return
+
+    _move(load_shard_map(args.old), load_shard_map(args.new), args.command, args.batch_size, args.pause)
+
+
+if __name__ == "__main__":
+    main()
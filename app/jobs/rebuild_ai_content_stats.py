@@ -0,0 +1,48 @@
+"""
+Rebuild ai_content_stats counters from ai_contents.
+
+Usage:
+    python -m app.jobs.rebuild_ai_content_stats
+    python -m app.jobs.rebuild_ai_content_stats --product-id 42
+
+Counters are maintained incrementally on every write; run this to correct
+drift (e.g. after manual SQL fixes or a restore). Products are rebuilt in
+batches with only their rows locked, so it can run while the API is live.
+"""
+
+import argparse
+import logging
+
+from app.infrastructure.db import sharding
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.repositories import ai_content_stats_repository
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild ai_content_stats from scratch.")
+    parser.add_argument("--product-id", type=int, default=None, help="Only rebuild one product.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Products per transaction.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    db = SessionLocal()
+    try:
+        written = 0
+        product_ids = [args.product_id] if args.product_id is not None else None
+        # Counters live next to their products: rebuild them shard by shard
+        for shard_id in sharding.shard_ids(db, product_ids):
+            with sharding.pinned(db, shard_id=shard_id):
+                written += ai_content_stats_repository.rebuild_stats(
+                    db=db, product_id=args.product_id, batch_size=args.batch_size
+                )
+    finally:
+        db.close()
+
+    logger.info("Rebuilt %d counter rows", written)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,30 @@ MaxCopy Backend entrypoint.
 Responsibilities:
 - Create FastAPI application instance.
 - Include API routers.
+- Install response compression.
 - Provide a basic health check endpoint.
+- Release shared infrastructure (AI HTTP pool) on shutdown.
 """
 
+from contextlib import asynccontextmanager
+
+import anyio
 from fastapi import FastAPI
 
+from app.api.middleware.compression import CompressionMiddleware
+from app.api.v1.ai_contents import router as ai_contents_router
 from app.api.v1.products import router as products_router
+from app.core.config import settings
+from app.infrastructure.ai import runtime as ai_runtime
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: release the shared AI HTTP pool on shutdown.
+    """
+    yield
+    await anyio.to_thread.run_sync(ai_runtime.shutdown)
 
 
 def create_app() -> FastAPI:
@@ -22,10 +40,15 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="MaxCopy Backend",
         version="0.1.0",
+        lifespan=lifespan,
     )
 
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware)
+
     # Register API routers
     app.include_router(products_router, prefix="/api/v1")
+    app.include_router(ai_contents_router, prefix="/api/v1")
 
     @app.get("/health", tags=["system"])
     def health_check():